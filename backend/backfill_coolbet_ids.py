@@ -0,0 +1,31 @@
+"""
+One-off backfill of external_id/source on Coolbet bets imported before
+those fields were stored, parsed from the "Imported from Coolbet (ID: ...)"
+notes. The server runs it for every user once on its first start; this
+script reruns it by hand.
+
+Usage:
+    python backfill_coolbet_ids.py              # every user
+    python backfill_coolbet_ids.py USER_ID ...  # only the given users
+"""
+import asyncio
+import sys
+
+from server import backfill_coolbet_external_ids, client
+
+
+async def main(user_ids):
+    try:
+        if not user_ids:
+            linked = await backfill_coolbet_external_ids()
+            print(f"Linked {linked} Coolbet bets for all users")
+            return
+        for user_id in user_ids:
+            linked = await backfill_coolbet_external_ids(user_id)
+            print(f"Linked {linked} Coolbet bets for {user_id}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
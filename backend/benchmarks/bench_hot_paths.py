@@ -0,0 +1,166 @@
+"""
+Micro-benchmarks for the backend's hot paths, run offline against an
+in-process Mongo stand-in (see conftest.py) with users holding 1k, 10k and
+100k generated bets.
+
+Run from backend/ (pip install -r benchmarks/requirements.txt):
+    pytest benchmarks/
+
+Each run is saved as JSON under .benchmarks/ (named after the commit);
+compare against the previous one, or fail on a slowdown, with e.g.
+    pytest benchmarks/ --benchmark-compare --benchmark-compare-fail=median:20%
+
+BENCH_SIZES=1000,10000 skips the 100k user. A plain `pytest` run doesn't
+collect this file.
+
+Both importers insert the bets in unordered insert_many batches; what
+mongomock makes slow is the daily rollup update that follows, one $inc
+upsert per (date, sport) touched, each of which it answers with a scan
+of daily_rollups (MongoDB uses the unique index). The import timings are
+therefore dominated by the stand-in, and the import benchmarks only run
+for users of up to BENCH_IMPORT_MAX bets (10k by default; set it to
+100000 to opt in to the 100k case). Skipped sizes are listed under
+"skipped" in the saved JSON.
+"""
+import csv
+import io
+import os
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from conftest import create_user, generate_games
+
+# Rounds for the benchmarks that take seconds at 100k bets
+HEAVY_ROUNDS = {1000: 10, 10000: 3}
+BENCH_IMPORT_MAX = int(os.environ.get("BENCH_IMPORT_MAX", "10000"))
+
+ANALYTICS_ENDPOINTS = ["stats", "chart", "bookmakers", "tipsters", "sports",
+                       "odds-range", "summary", "dashboard"]
+
+
+def heavy_rounds(size: int) -> int:
+    return HEAVY_ROUNDS.get(size, 1)
+
+
+def api_client(server, token: str) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=server.app), base_url="http://bench",
+        headers={"Authorization": f"Bearer {token}"}, timeout=None)
+
+
+def api_call(loop, server, token: str, method: str, path: str, **kwargs) -> httpx.Response:
+    async def call():
+        async with api_client(server, token) as client:
+            response = await client.request(method, path, **kwargs)
+        response.raise_for_status()
+        return response
+    return loop.run_until_complete(call())
+
+
+@pytest.mark.benchmark(group="sport detection")
+def test_detect_sport_from_game(benchmark, server):
+    games = generate_games(1000)
+    sports = benchmark(lambda: [server.detect_sport_from_game(game) for game in games])
+    assert len(sports) == len(games)
+
+
+@pytest.mark.benchmark(group="stats")
+def test_stats_streak_loop(benchmark, server, dataset):
+    """The per-bet Python loop behind /analytics/stats without NumPy"""
+    bets = sorted(dataset["bets"], key=lambda bet: (bet["date"], bet["time"]))
+    stats = benchmark(server.compute_stats, bets)
+    assert stats["total_bets"] == dataset["size"]
+
+
+@pytest.mark.benchmark(group="stats")
+def test_snapshot_build(benchmark, server, dataset):
+    snapshot = benchmark.pedantic(
+        server.BetSnapshot, args=(0, dataset["bets"]), rounds=heavy_rounds(dataset["size"]))
+    assert len(snapshot) == dataset["size"]
+
+
+@pytest.mark.benchmark(group="analytics")
+@pytest.mark.parametrize("endpoint", ANALYTICS_ENDPOINTS)
+def test_analytics_endpoint(benchmark, server, loop, dataset, endpoint):
+    path = f"/api/analytics/{endpoint}"
+    params = {"chart_days": 365} if endpoint == "dashboard" else {"days": -1}
+    # The first request builds the user's bet snapshot
+    api_call(loop, server, dataset["token"], "GET", path, params=params)
+
+    response = benchmark(api_call, loop, server, dataset["token"], "GET", path, params=params)
+    assert response.json() is not None
+
+
+@pytest.mark.benchmark(group="export")
+def test_export_bets(benchmark, server, loop, dataset):
+    response = benchmark.pedantic(
+        api_call, args=(loop, server, dataset["token"], "GET", "/api/bets/export"),
+        rounds=heavy_rounds(dataset["size"]))
+    assert response.text.count("\n") == dataset["size"] + 1
+
+
+def skip_large_import(size: int):
+    if size > BENCH_IMPORT_MAX:
+        pytest.skip(f"import of {size} bets is above BENCH_IMPORT_MAX={BENCH_IMPORT_MAX}")
+
+
+def clear_imports(server, loop, user_id: str):
+    async def clear():
+        for collection in (server.db.bets, server.db.imported_bets, server.db.daily_rollups):
+            await collection.delete_many({"user_id": user_id})
+    loop.run_until_complete(clear())
+
+
+@pytest.mark.benchmark(group="import")
+def test_import_csv(benchmark, server, loop, dataset):
+    skip_large_import(dataset["size"])
+    user_id = f"user_csv_import_{dataset['size']}"
+    token = loop.run_until_complete(create_user(server, user_id))
+
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=server.EXPORT_FIELDNAMES, delimiter=";")
+    writer.writeheader()
+    for bet in dataset["bets"]:
+        writer.writerow({
+            "DATE": bet["date"], "TIME": bet["time"], "GAME": bet["game"], "BET": bet["bet"],
+            "ODDS": bet["odds"], "STAKE": bet["stake"], "STATUS": bet["status"],
+            "RESULT": bet["result"], "TIPSTER": bet["tipster"] or "", "SPORT": "",
+            "BOOKIE": bet["bookie"] or ""
+        })
+    payload = {"csv_data": output.getvalue()}
+
+    response = benchmark.pedantic(
+        api_call, args=(loop, server, token, "POST", "/api/bets/import"), kwargs={"json": payload},
+        setup=lambda: clear_imports(server, loop, user_id), rounds=heavy_rounds(dataset["size"]))
+    assert response.json()["imported"] == dataset["size"]
+
+
+@pytest.mark.benchmark(group="import")
+def test_import_coolbet(benchmark, server, loop, dataset):
+    skip_large_import(dataset["size"])
+    user_id = f"user_coolbet_import_{dataset['size']}"
+    token = loop.run_until_complete(create_user(server, user_id))
+
+    placed_at = datetime(2024, 1, 1)
+    payload = {"source": "coolbet", "bets": [
+        {
+            "externalId": f"coolbet-{n}",
+            "event": bet["game"],
+            "stake": bet["stake"],
+            "odds": bet["odds"],
+            # Coolbet has no push status
+            "result": "pending" if bet["status"] == "push" else bet["status"],
+            "placedAt": (placed_at + timedelta(minutes=n)).isoformat() + "Z",
+            "selection": bet["bet"],
+            # The bookmarklet only knows the sport for some bets
+            "sport": bet["sport"] if n % 2 else None,
+        }
+        for n, bet in enumerate(dataset["bets"])
+    ]}
+
+    response = benchmark.pedantic(
+        api_call, args=(loop, server, token, "POST", "/api/bets/import/coolbet"), kwargs={"json": payload},
+        setup=lambda: clear_imports(server, loop, user_id), rounds=heavy_rounds(dataset["size"]))
+    assert response.json()["imported"] == dataset["size"]
@@ -0,0 +1,92 @@
+"""
+Login throughput benchmark.
+
+Registers throwaway users in the configured database (MONGO_URL / DB_NAME,
+point them at a scratch database), fires concurrent logins through the
+ASGI app and reports logins per second together with the longest event
+loop stall seen meanwhile - the latency every other request would have
+picked up. The users and their sessions are deleted afterwards.
+
+Usage:
+    python benchmarks/bench_login.py [--logins 200] [--concurrency 20] [--users 10]
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from server import BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS, app, client, db  # noqa: E402
+
+PASSWORD = "benchmark-password"
+
+
+async def watch_event_loop(stop: asyncio.Event, interval: float = 0.005) -> float:
+    """Longest delay between when a timer was due and when it ran"""
+    worst = 0.0
+    while not stop.is_set():
+        due = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - due)
+    return worst
+
+
+async def main(args):
+    run_id = uuid.uuid4().hex[:8]
+    emails = [f"bench-{run_id}-{n}@example.com" for n in range(args.users)]
+    transport = httpx.ASGITransport(app=app)
+
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+            for email in emails:
+                response = await http.post(
+                    "/api/auth/register", json={"email": email, "password": PASSWORD})
+                response.raise_for_status()
+
+            semaphore = asyncio.Semaphore(args.concurrency)
+            latencies = []
+
+            async def login(n: int):
+                async with semaphore:
+                    started = time.perf_counter()
+                    response = await http.post(
+                        "/api/auth/login",
+                        json={"email": emails[n % len(emails)], "password": PASSWORD})
+                    response.raise_for_status()
+                    latencies.append(time.perf_counter() - started)
+
+            stop = asyncio.Event()
+            watcher = asyncio.create_task(watch_event_loop(stop))
+            started = time.perf_counter()
+            await asyncio.gather(*(login(n) for n in range(args.logins)))
+            elapsed = time.perf_counter() - started
+            stop.set()
+            worst_stall = await watcher
+
+        latencies.sort()
+        print(f"bcrypt rounds:      {BCRYPT_ROUNDS}")
+        print(f"hash workers:       {PASSWORD_HASH_WORKERS}")
+        print(f"logins:             {args.logins} at concurrency {args.concurrency}")
+        print(f"throughput:         {args.logins / elapsed:.1f} logins/s")
+        print(f"latency p50 / p95:  {latencies[len(latencies) // 2] * 1000:.0f} ms / "
+              f"{latencies[int(len(latencies) * 0.95) - 1] * 1000:.0f} ms")
+        print(f"worst loop stall:   {worst_stall * 1000:.1f} ms")
+    finally:
+        users = await db.users.find({"email": {"$in": emails}}, {"user_id": 1}).to_list(None)
+        user_ids = [user["user_id"] for user in users]
+        await db.user_sessions.delete_many({"user_id": {"$in": user_ids}})
+        await db.users.delete_many({"user_id": {"$in": user_ids}})
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--users", type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,99 @@
+"""
+Bet response serialization benchmark.
+
+Times the CPU spent turning a page of bet documents into a response body
+on the two paths get_bets can take: FastAPI's response_model path
+(validate through BetPage, then encode with json) and the opt-in FAST_JSON=1 path
+(orjson straight from the projected documents). No database is needed;
+the documents are generated in the shape Mongo returns them.
+
+Usage:
+    python benchmarks/bench_serialization.py [--sizes 100,1000,10000] [--repeat 20]
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from server import api_router, client, fast_json_response  # noqa: E402
+
+
+def generate_bets(count: int) -> list:
+    rng = random.Random(count)
+    created = datetime(2025, 1, 1)
+    bets = []
+    for n in range(count):
+        stake = round(rng.uniform(1, 100), 2)
+        odds = round(rng.uniform(1.1, 6), 2)
+        status = rng.choice(["won", "lost", "push", "pending"])
+        result = stake * (odds - 1) if status == "won" else (-stake if status == "lost" else 0.0)
+        bets.append({
+            "bet_id": f"bet_{n:012x}",
+            "user_id": "user_benchmark",
+            "date": (created + timedelta(days=n % 365)).strftime("%Y-%m-%d"),
+            "time": f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}",
+            "game": "Manchester United - Liverpool",
+            "bet": "Over 2.5 goals",
+            "stake": stake,
+            "odds": odds,
+            "status": status,
+            "result": result,
+            "bookie": rng.choice(["Coolbet", "Unibet", None]),
+            "tipster": rng.choice(["Tipster A", None]),
+            "sport": "Football",
+            "notes": None,
+            "created_at": created + timedelta(minutes=n),
+        })
+    return bets
+
+
+def cpu_ms(function, repeat: int) -> float:
+    """Best-of-`repeat` CPU time of one call, in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.process_time()
+        function()
+        best = min(best, time.process_time() - started)
+    return best * 1000
+
+
+def main(args):
+    route = next(route for route in api_router.routes
+                 if route.path == "/api/bets" and "GET" in route.methods)
+    loop = asyncio.new_event_loop()
+
+    def response_model_path(page):
+        content = loop.run_until_complete(serialize_response(
+            field=route.response_field, response_content=page,
+            exclude_unset=True, is_coroutine=True))
+        return JSONResponse(content).body
+
+    def fast_path(page):
+        return fast_json_response(page).body
+
+    print(f"{'bets':>8} {'response_model ms':>18} {'orjson ms':>10} {'speedup':>8}")
+    for size in args.sizes:
+        page = {"bets": generate_bets(size), "next_cursor": None, "limit": size}
+        assert len(fast_path(page)) > 0
+        slow = cpu_ms(lambda: response_model_path(page), args.repeat)
+        fast = cpu_ms(lambda: fast_path(page), args.repeat)
+        print(f"{size:>8} {slow:>18.2f} {fast:>10.2f} {slow / fast:>7.1f}x")
+
+    loop.close()
+    client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=lambda value: [int(size) for size in value.split(",")],
+                        default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    main(parser.parse_args())
@@ -0,0 +1,137 @@
+"""
+Setup for the pytest-benchmark suite (bench_hot_paths.py).
+
+The server module runs against mongomock-motor instead of a real MongoDB
+and with TheSportsDB switched off, so the suite is offline and
+self-contained. Each bet count in BENCH_SIZES gets one generated user,
+created once per session.
+"""
+import asyncio
+import os
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# Read by server at import time: nothing shared outside the process, no
+# cached analytics responses (the benchmarks time the computation) and a
+# circuit breaker that stays open once tripped below
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "benchmarks")
+os.environ["CACHE_BACKEND"] = "memory"
+os.environ["ANALYTICS_CACHE_TTL"] = "0"
+os.environ["SPORTSDB_BREAKER_RESET"] = str(10 ** 9)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+BENCH_SIZES = [int(size) for size in os.environ.get("BENCH_SIZES", "1000,10000,100000").split(",")]
+
+STATUSES = ["won", "lost", "push", "pending"]
+BOOKIES = ["Coolbet", "Unibet", "Bet365", "Pinnacle", None]
+TIPSTERS = ["Sharp Tips", "My Analysis", "", None]
+MARKETS = ["Over 2.5 goals", "Home win", "Handicap -1.5", "Both teams to score", "Under 210.5"]
+
+
+def generate_games(count: int, seed: int = 0) -> list:
+    """Game names drawn from the classifier's team lists plus unknown teams"""
+    import server
+
+    rng = random.Random(seed)
+    pools = [server.FOOTBALL_CLUBS, server.BASKETBALL_NBA, server.ICE_HOCKEY_NHL,
+             server.TENNIS_PLAYERS, server.ESPORTS_TEAMS, server.HANDBALL_TEAMS,
+             [f"unknown club {n}" for n in range(200)]]
+    games = []
+    for _ in range(count):
+        pool = rng.choice(pools)
+        home, away = rng.sample(pool, 2)
+        games.append(f"{home.title()} {rng.choice(['-', 'vs', 'v', '@'])} {away.title()}")
+    return games
+
+
+def generate_bets(user_id: str, count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    games = generate_games(min(count, 5000), seed)
+    first_day = datetime(2024, 1, 1)
+    bets = []
+    for _ in range(count):
+        stake = round(rng.uniform(1, 200), 2)
+        odds = round(rng.uniform(1.05, 9), 2)
+        status = rng.choice(STATUSES)
+        result = stake * (odds - 1) if status == "won" else (-stake if status == "lost" else 0)
+        bets.append({
+            "bet_id": f"bet_{uuid.UUID(int=rng.getrandbits(128)).hex[:12]}",
+            "user_id": user_id,
+            "date": (first_day + timedelta(days=rng.randrange(1000))).strftime("%Y-%m-%d"),
+            "time": f"{rng.randrange(24):02d}:{rng.randrange(60):02d}",
+            "game": rng.choice(games),
+            "bet": rng.choice(MARKETS),
+            "stake": stake,
+            "odds": odds,
+            "status": status,
+            "result": result,
+            "bookie": rng.choice(BOOKIES),
+            "tipster": rng.choice(TIPSTERS),
+            "sport": rng.choice(["Football", "Basketball", "Tennis", "Ice Hockey", None]),
+            "notes": None,
+            "created_at": first_day,
+        })
+    return bets
+
+
+# (test, reason) for every benchmark skipped in this run
+SKIPPED_BENCHMARKS = []
+
+
+def pytest_runtest_logreport(report):
+    if report.skipped and isinstance(report.longrepr, tuple):
+        SKIPPED_BENCHMARKS.append({"name": report.nodeid.split("::")[-1],
+                                   "reason": report.longrepr[2].removeprefix("Skipped: ")})
+
+
+def pytest_benchmark_update_json(config, benchmarks, output_json):
+    # So a saved baseline shows which sizes it leaves out
+    output_json["skipped"] = SKIPPED_BENCHMARKS
+
+
+@pytest.fixture(scope="session")
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def server():
+    from mongomock_motor import AsyncMongoMockClient
+
+    import server
+
+    server.db = AsyncMongoMockClient()[os.environ["DB_NAME"]]
+    for _ in range(server.sportsdb_breaker.failure_threshold):
+        server.sportsdb_breaker.record_failure()
+    return server
+
+
+async def create_user(server, user_id: str) -> str:
+    """Insert a user with a session and return its session token"""
+    session_token = f"session_{uuid.uuid4().hex}"
+    await server.db.users.insert_one({
+        "user_id": user_id, "email": f"{user_id}@example.com", "data_version": 0})
+    await server.db.user_sessions.insert_one({
+        "user_id": user_id, "session_token": session_token,
+        "expires_at": datetime.now(timezone.utc) + timedelta(days=1)})
+    return session_token
+
+
+@pytest.fixture(scope="session", params=BENCH_SIZES, ids=lambda size: f"{size}_bets")
+def dataset(request, server, loop) -> dict:
+    """A user holding `size` bets: {"size", "user_id", "token", "bets"}"""
+    size = request.param
+    user_id = f"user_bench_{size}"
+    token = loop.run_until_complete(create_user(server, user_id))
+    bets = generate_bets(user_id, size, seed=size)
+    loop.run_until_complete(server.db.bets.insert_many([dict(bet) for bet in bets]))
+    return {"size": size, "user_id": user_id, "token": token, "bets": bets}
@@ -0,0 +1,31 @@
+"""
+Rebuild the daily_rollups collection from the bets collection.
+
+The server seeds the rollups by itself on its first start (see
+backfill_daily_rollups); this script repairs drift afterwards.
+
+Usage:
+    python rebuild_rollups.py              # every user
+    python rebuild_rollups.py USER_ID ...  # only the given users
+"""
+import asyncio
+import sys
+
+from server import client, rebuild_daily_rollups
+
+
+async def main(user_ids):
+    try:
+        if not user_ids:
+            written = await rebuild_daily_rollups()
+            print(f"Rebuilt {written} daily rollup rows for all users")
+            return
+        for user_id in user_ids:
+            written = await rebuild_daily_rollups(user_id)
+            print(f"Rebuilt {written} daily rollup rows for {user_id}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
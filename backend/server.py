@@ -1,8 +1,25 @@
+import abc
+import asyncio
+import base64
 import csv
+import hashlib
+import hmac
+import importlib.util
 import io
+import json
 import logging
+import math
 import os
+import pickle
+import sqlite3
+import threading
+import time
 import uuid
+import zlib
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import List, Optional
@@ -11,9 +28,23 @@ import bcrypt
 import httpx
 from dotenv import load_dotenv
 from fastapi import APIRouter, FastAPI, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
 from motor.motor_asyncio import AsyncIOMotorClient
 from pydantic import BaseModel, ConfigDict, EmailStr
+from pymongo import DeleteOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import StreamingResponse
+
+try:
+    import orjson
+except ImportError:  # optional - bet responses fall back to the response_model path
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:  # optional - analytics fall back to scanning and aggregating in Mongo
+    np = None
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -22,15 +53,220 @@ mongo_url = os.environ['MONGO_URL']
 client = AsyncIOMotorClient(mongo_url)
 db = client[os.environ['DB_NAME']]
 
-app = FastAPI()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The hooks are defined at the bottom of the module, see Startup
+    await startup_db_client()
+    try:
+        yield
+    finally:
+        await shutdown_db_client()
+
+
+app = FastAPI(lifespan=lifespan)
 api_router = APIRouter(prefix="/api")
 
 # TheSportsDB API configuration
 SPORTSDB_API_KEY = "123"  # Free test key - official from TheSportsDB documentation
 SPORTSDB_BASE_URL = "https://www.thesportsdb.com/api/v1/json"
 
-# Cache for TheSportsDB lookups to minimize API calls
-sportsdb_cache = {}
+# One pooled client for every TheSportsDB call so requests reuse keep-alive
+# connections instead of paying a TCP+TLS handshake each time. Opened in
+# the lifespan startup and closed next to the Mongo client on shutdown.
+SPORTSDB_MAX_CONNECTIONS = int(os.environ.get('SPORTSDB_MAX_CONNECTIONS', '20'))
+SPORTSDB_MAX_KEEPALIVE = int(os.environ.get('SPORTSDB_MAX_KEEPALIVE', '10'))
+SPORTSDB_HTTP2 = os.environ.get('SPORTSDB_HTTP2', '').lower() in ('1', 'true', 'yes')
+sportsdb_http: Optional[httpx.AsyncClient] = None
+
+
+def create_sportsdb_client() -> httpx.AsyncClient:
+    http2 = SPORTSDB_HTTP2
+    if http2 and importlib.util.find_spec("h2") is None:
+        logging.warning("SPORTSDB_HTTP2 is set but h2 is not installed, using HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        base_url=f"{SPORTSDB_BASE_URL}/{SPORTSDB_API_KEY}",
+        # Default only - each call passes its own timeout
+        timeout=10.0,
+        limits=httpx.Limits(
+            max_connections=SPORTSDB_MAX_CONNECTIONS,
+            max_keepalive_connections=SPORTSDB_MAX_KEEPALIVE,
+            keepalive_expiry=30.0
+        ),
+        http2=http2
+    )
+
+
+def get_sportsdb_client() -> httpx.AsyncClient:
+    """The shared client, opened on first use when the lifespan startup hasn't run (scripts)"""
+    global sportsdb_http
+    if sportsdb_http is None or sportsdb_http.is_closed:
+        sportsdb_http = create_sportsdb_client()
+    return sportsdb_http
+
+
+async def close_sportsdb_client():
+    global sportsdb_http
+    if sportsdb_http is not None:
+        await sportsdb_http.aclose()
+        sportsdb_http = None
+
+
+class SportsDBUnavailable(Exception):
+    """TheSportsDB call skipped by the circuit breaker or rate limiter"""
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter: `rate` tokens per second, bursts of up to
+    `capacity`. A caller reserves a token and sleeps until it is due, or is
+    refused straight away when that would take longer than `max_wait`.
+    """
+
+    def __init__(self, rate: float, capacity: float, max_wait: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_wait = max_wait
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.granted = 0
+        self.delayed = 0
+        self.rejected = 0
+
+    async def acquire(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        # Tokens go negative while reserved by sleeping callers
+        wait = (1 - self.tokens) / self.rate if self.tokens < 1 else 0
+        if wait > self.max_wait:
+            self.rejected += 1
+            return False
+
+        self.tokens -= 1
+        self.granted += 1
+        if wait > 0:
+            self.delayed += 1
+            await asyncio.sleep(wait)
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "rate_per_second": self.rate,
+            "burst": self.capacity,
+            "granted": self.granted,
+            "delayed": self.delayed,
+            "rejected": self.rejected
+        }
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing upstream. After `failure_threshold` consecutive
+    failures the breaker opens and calls are refused for `reset_timeout`
+    seconds; then a single probe call is let through (half-open) and its
+    outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.trips = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+        if self.state == "closed":
+            return True
+        if self.state == "half_open" and not self.probing:
+            self.probing = True
+            return True
+
+        self.rejected += 1
+        return False
+
+    def release(self):
+        """Hand back a half-open probe slot that allow() granted but wasn't used"""
+        self.probing = False
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self.probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        self.probing = False
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.trips += 1
+                logging.warning(
+                    f"TheSportsDB circuit breaker opened after {self.failures} failures")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        retry_in = None
+        if self.state == "open":
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "failure_threshold": self.failure_threshold,
+            "reset_timeout_seconds": self.reset_timeout,
+            "retry_in_seconds": retry_in,
+            "trips": self.trips,
+            "rejected": self.rejected
+        }
+
+
+# The free key is throttled upstream; stay under it and stop calling
+# entirely while TheSportsDB is failing, so imports fall back to the
+# local classifier instead of waiting out timeouts row by row
+sportsdb_limiter = TokenBucket(
+    rate=float(os.environ.get('SPORTSDB_RATE_PER_SECOND', '1')),
+    capacity=float(os.environ.get('SPORTSDB_RATE_BURST', '5')),
+    max_wait=float(os.environ.get('SPORTSDB_RATE_MAX_WAIT', '2'))
+)
+sportsdb_breaker = CircuitBreaker(
+    failure_threshold=int(os.environ.get('SPORTSDB_BREAKER_FAILURES', '5')),
+    reset_timeout=float(os.environ.get('SPORTSDB_BREAKER_RESET', '60'))
+)
+
+
+async def sportsdb_get(path: str, params: dict, timeout: float) -> httpx.Response:
+    """
+    GET a TheSportsDB endpoint through the circuit breaker and rate limiter.
+    Raises SportsDBUnavailable without calling out when either refuses.
+    """
+    if not sportsdb_breaker.allow():
+        raise SportsDBUnavailable("circuit breaker open")
+    if not await sportsdb_limiter.acquire():
+        sportsdb_breaker.release()
+        raise SportsDBUnavailable("rate limited")
+
+    try:
+        response = await get_sportsdb_client().get(path, params=params, timeout=timeout)
+    except Exception:
+        sportsdb_breaker.record_failure()
+        raise
+
+    # Throttling and server errors count against the upstream; anything
+    # else (including "not found") means it is answering
+    if response.status_code == 429 or response.status_code >= 500:
+        sportsdb_breaker.record_failure()
+    else:
+        sportsdb_breaker.record_success()
+    return response
 
 
 async def query_sportsdb_team(team_name: str) -> Optional[str]:
@@ -41,59 +277,73 @@ async def query_sportsdb_team(team_name: str) -> Optional[str]:
     if not team_name:
         return None
 
-    # Check cache first
+    # Check cache first (sportsdb_cache is defined with the other caches)
     cache_key = team_name.lower().strip()
-    if cache_key in sportsdb_cache:
-        return sportsdb_cache[cache_key]
+    cached = await sportsdb_cache.get(cache_key, CACHE_MISS)
+    if cached is not CACHE_MISS:
+        return cached
+
+    # Concurrent lookups of the same team share one upstream request
+    return await sportsdb_flights.do(
+        ("team", cache_key),
+        lambda: fetch_sportsdb_team_sport(team_name, cache_key)
+    )
+
 
+async def fetch_sportsdb_team_sport(team_name: str, cache_key: str) -> Optional[str]:
+    """Look a team up on TheSportsDB and cache its sport, or None if unknown"""
     try:
-        async with httpx.AsyncClient(timeout=3.0) as client:
-            # Search for team by name
-            response = await client.get(
-                f"{SPORTSDB_BASE_URL}/{SPORTSDB_API_KEY}/searchteams.php",
-                params={"t": team_name}
-            )
+        # Search for team by name
+        response = await sportsdb_get("searchteams.php", {"t": team_name}, timeout=3.0)
+
+        if response.status_code == 200:
+            data = response.json()
+            teams = data.get("teams")
+
+            if teams and len(teams) > 0:
+                # Get the first match
+                team = teams[0]
+                sport = team.get("strSport", "").strip()
+
+                # Map TheSportsDB sport names to our sport categories
+                sport_mapping = {
+                    "Soccer": "Football",
+                    "Basketball": "Basketball",
+                    "Ice Hockey": "Ice Hockey",
+                    "American Football": "American Football",
+                    "Baseball": "Baseball",
+                    "Tennis": "Tennis",
+                    "Handball": "Handball",
+                    "Volleyball": "Volleyball",
+                    "Esports": "Esports",
+                    "Fighting": "Other",
+                    "Rugby": "Other",
+                    "Cricket": "Other",
+                    "Golf": "Other",
+                    "Motorsport": "Other",
+                    "Cycling": "Other",
+                    "Darts": "Other",
+                    "Snooker": "Other",
+                }
+
+                result = sport_mapping.get(sport, "Other")
+
+                # Cache the result
+                await sportsdb_cache.set(cache_key, result)
+                return result
 
-            if response.status_code == 200:
-                data = response.json()
-                teams = data.get("teams")
-
-                if teams and len(teams) > 0:
-                    # Get the first match
-                    team = teams[0]
-                    sport = team.get("strSport", "").strip()
-
-                    # Map TheSportsDB sport names to our sport categories
-                    sport_mapping = {
-                        "Soccer": "Football",
-                        "Basketball": "Basketball",
-                        "Ice Hockey": "Ice Hockey",
-                        "American Football": "American Football",
-                        "Baseball": "Baseball",
-                        "Tennis": "Tennis",
-                        "Handball": "Handball",
-                        "Volleyball": "Volleyball",
-                        "Esports": "Esports",
-                        "Fighting": "Other",
-                        "Rugby": "Other",
-                        "Cricket": "Other",
-                        "Golf": "Other",
-                        "Motorsport": "Other",
-                        "Cycling": "Other",
-                        "Darts": "Other",
-                        "Snooker": "Other",
-                    }
-
-                    result = sport_mapping.get(sport, "Other")
-
-                    # Cache the result
-                    sportsdb_cache[cache_key] = result
-                    return result
+            # Unknown team - remember that across workers too
+            await sportsdb_cache.set(cache_key, None, ttl=SPORTSDB_NEGATIVE_TTL)
+            return None
+    except SportsDBUnavailable:
+        # Not asked - don't cache anything, the next call may get through
+        return None
     except Exception as e:
         logging.warning(f"TheSportsDB API error for '{team_name}': {e}")
 
-    # Cache negative result to avoid repeated failed lookups
-    sportsdb_cache[cache_key] = None
+    # Cache negative result to avoid repeated failed lookups. Errors may be
+    # transient, so they stay in this process only.
+    await sportsdb_cache.set(cache_key, None, ttl=SPORTSDB_NEGATIVE_TTL, shared=False)
     return None
 
 
@@ -118,7 +368,8 @@ async def detect_sport_from_game_async(game_name: str) -> str:
                 teams = [parts[0].strip(), parts[1].strip()]
                 break
 
-    # Try TheSportsDB API lookup for each team
+    # Try TheSportsDB API lookup for each team. While the circuit breaker
+    # is open only cached lookups answer, so this doesn't wait on the network.
     for team in teams:
         if team:
             sport = await query_sportsdb_team(team)
@@ -129,7 +380,305 @@ async def detect_sport_from_game_async(game_name: str) -> str:
     return detect_sport_from_game(game_name)
 
 
-# Sport detection function
+# Sport detection
+#
+# Keyword and team lists per sport. detect_sport_from_game checks them in the
+# priority order of SPORT_PATTERN_GROUPS; they are compiled once at import
+# into an Aho-Corasick automaton so a game name is scanned a single time.
+
+# Basketball - NBA teams (all 30 teams)
+BASKETBALL_NBA = [
+    # Atlantic Division
+    'celtics', 'nets', '76ers', 'sixers', 'knicks', 'raptors',
+    # Central Division
+    'bulls', 'cavaliers', 'cavs', 'pistons', 'pacers', 'bucks',
+    # Southeast Division
+    'hawks', 'heat', 'hornets', 'magic', 'wizards',
+    # Northwest Division
+    'nuggets', 'timberwolves', 'thunder', 'trail blazers', 'blazers', 'jazz',
+    # Pacific Division
+    'warriors', 'clippers', 'lakers', 'suns', 'kings',
+    # Southwest Division
+    'mavericks', 'mavs', 'rockets', 'grizzlies', 'pelicans', 'spurs'
+]
+
+# Basketball - EuroLeague and international
+BASKETBALL_INTERNATIONAL = [
+    'real madrid', 'barcelona', 'barca', 'olympiacos', 'panathinaikos',
+    'fenerbahce', 'fener', 'cska moscow', 'cska', 'zalgiris', 'kaunas',
+    'maccabi', 'tel aviv', 'efes', 'anadolu efes', 'bayern munich',
+    'olimpia milano', 'armani', 'virtus bologna', 'virtus', 'asvel',
+    'monaco', 'baskonia', 'vitoria', 'partizan', 'red star', 'crvena zvezda'
+]
+
+# Basketball - indicators
+BASKETBALL_KEYWORDS = ['nba', 'euroleague',
+                       'ncaa basketball', 'march madness']
+
+# American Football - NFL teams (all 32 teams)
+AMERICAN_FOOTBALL_NFL = [
+    # AFC East
+    'patriots', 'bills', 'dolphins', 'jets',
+    # AFC North
+    'ravens', 'bengals', 'browns', 'steelers',
+    # AFC South
+    'texans', 'colts', 'jaguars', 'jags', 'titans',
+    # AFC West
+    'broncos', 'chiefs', 'raiders', 'chargers',
+    # NFC East
+    'cowboys', 'giants', 'eagles', 'commanders', 'washington',
+    # NFC North
+    'bears', 'lions', 'packers', 'vikings',
+    # NFC South
+    'falcons', 'panthers', 'saints', 'buccaneers', 'bucs',
+    # NFC West
+    'cardinals', 'rams', '49ers', 'niners', 'seahawks'
+]
+
+# American Football - indicators
+AMERICAN_FOOTBALL_KEYWORDS = [
+    'nfl', 'ncaa football', 'college football', 'super bowl']
+
+# Ice Hockey - NHL teams (all 32 teams)
+ICE_HOCKEY_NHL = [
+    # Atlantic Division
+    'bruins', 'sabres', 'red wings', 'panthers', 'canadiens', 'habs',
+    'senators', 'lightning', 'maple leafs', 'leafs',
+    # Metropolitan Division
+    'hurricanes', 'canes', 'blue jackets', 'devils', 'islanders',
+    'rangers', 'flyers', 'penguins', 'pens', 'capitals', 'caps',
+    # Central Division
+    'blackhawks', 'hawks', 'avalanche', 'avs', 'stars', 'wild',
+    'predators', 'preds', 'blues', 'jets',
+    # Pacific Division
+    'ducks', 'flames', 'oilers', 'kings', 'sharks', 'kraken',
+    'canucks', 'golden knights', 'knights', 'coyotes', 'yotes'
+]
+
+# Ice Hockey - international
+ICE_HOCKEY_INTERNATIONAL = [
+    'jokerit', 'ska', 'cska', 'dynamo', 'spartak', 'lokomotiv',
+    'metallurg', 'avangard', 'frölunda', 'hv71', 'djurgarden',
+    'lulea', 'vaxjo', 'zurich', 'zsc', 'bern', 'davos'
+]
+
+# Ice Hockey - indicators
+ICE_HOCKEY_KEYWORDS = ['nhl', 'khl', 'shl', 'liiga', 'del', 'stanley cup']
+
+# Baseball - MLB teams (all 30 teams)
+BASEBALL_MLB = [
+    # AL East
+    'red sox', 'yankees', 'yanks', 'blue jays', 'jays', 'orioles', 'rays',
+    # AL Central
+    'white sox', 'indians', 'guardians', 'tigers', 'royals', 'twins',
+    # AL West
+    'astros', 'angels', 'athletics', "a's", 'mariners', 'rangers',
+    # NL East
+    'braves', 'marlins', 'mets', 'phillies', 'nationals', 'nats',
+    # NL Central
+    'cubs', 'reds', 'brewers', 'pirates', 'cardinals', 'cards',
+    # NL West
+    'diamondbacks', 'd-backs', 'rockies', 'dodgers', 'padres', 'giants'
+]
+
+# Baseball - indicators
+BASEBALL_KEYWORDS = ['mlb', 'world series', 'baseball']
+
+# Football (Soccer) - Major European clubs
+FOOTBALL_CLUBS = [
+    # England - Premier League
+    'arsenal', 'chelsea', 'liverpool', 'manchester united', 'man united', 'man utd',
+    'manchester city', 'man city', 'tottenham', 'spurs', 'everton', 'leicester',
+    'west ham', 'wolves', 'wolverhampton', 'newcastle', 'aston villa', 'brighton',
+    'crystal palace', 'southampton', 'leeds', 'norwich', 'watford', 'burnley',
+    'fulham', 'brentford', 'bournemouth', 'nottingham forest',
+    # Spain - La Liga
+    'real madrid', 'barcelona', 'atletico madrid', 'atletico', 'sevilla',
+    'valencia', 'villarreal', 'real sociedad', 'athletic bilbao', 'athletic club',
+    'real betis', 'betis', 'celta vigo', 'espanyol', 'getafe', 'osasuna',
+    # Germany - Bundesliga
+    'bayern munich', 'bayern', 'borussia dortmund', 'dortmund', 'bvb',
+    'rb leipzig', 'leipzig', 'bayer leverkusen', 'leverkusen', 'borussia monchengladbach',
+    'gladbach', 'wolfsburg', 'frankfurt', 'eintracht', 'union berlin', 'freiburg',
+    'hoffenheim', 'cologne', 'mainz', 'augsburg', 'hertha',
+    # Italy - Serie A
+    'juventus', 'juve', 'inter milan', 'inter', 'ac milan', 'milan', 'napoli',
+    'roma', 'lazio', 'atalanta', 'fiorentina', 'torino', 'sassuolo', 'hellas verona',
+    'sampdoria', 'genoa', 'bologna', 'udinese', 'cagliari', 'empoli',
+    # France - Ligue 1
+    'psg', 'paris saint-germain', 'marseille', 'lyon', 'monaco', 'lille',
+    'nice', 'rennes', 'montpellier', 'nantes', 'strasbourg', 'lens',
+    # Portugal
+    'benfica', 'porto', 'sporting', 'sporting cp', 'braga',
+    # Netherlands
+    'ajax', 'psv', 'psv eindhoven', 'feyenoord', 'az alkmaar',
+    # Other major clubs
+    'celtic', 'rangers', 'galatasaray', 'besiktas', 'anderlecht'
+]
+
+# Football - common keywords (be careful not to conflict with American football)
+FOOTBALL_KEYWORDS = [
+    'fc ', ' fc', 'united ', 'city ', 'champions league', 'ucl', 'europa league',
+    'premier league', 'la liga', 'bundesliga', 'serie a', 'ligue 1',
+    'championship', 'eredivisie', 'primeira liga', 'copa del rey', 'fa cup'
+]
+
+# Tennis - Professional players (top players for recognition)
+TENNIS_PLAYERS = [
+    'djokovic', 'nadal', 'federer', 'alcaraz', 'medvedev', 'tsitsipas',
+    'zverev', 'rublev', 'sinner', 'ruud', 'auger-aliassime', 'fritz',
+    'swiatek', 'sabalenka', 'gauff', 'rybakina', 'jabeur', 'pegula',
+    'kvitova', 'osaka', 'halep', 'muguruza', 'raducanu', 'kerber'
+]
+
+# Tennis - indicators and patterns
+TENNIS_KEYWORDS = [
+    'atp', 'wta', 'grand slam', 'wimbledon', 'roland garros', 'french open',
+    'us open', 'australian open', 'davis cup', 'masters 1000', 'atp 500'
+]
+
+# Esports - Teams
+ESPORTS_TEAMS = [
+    # CS:GO/CS2
+    'navi', "na'vi", 'natus vincere', 'faze clan', 'faze', 'g2 esports', 'g2',
+    'vitality', 'team vitality', 'astralis', 'heroic', 'cloud9', 'c9',
+    'team liquid', 'liquid', 'fnatic', 'mouz', 'mousesports', 'big clan',
+    # League of Legends
+    't1', 'skt', 'gen.g', 'geng', 'damwon', 'drx', 'jd gaming', 'jdg',
+    'edg', 'edward gaming', 'rng', 'royal never give up', 'tes', 'top esports',
+    'fpx', 'funplus phoenix', 'we', 'team we', 'ig', 'invictus gaming',
+    # Dota 2
+    'og esports', 'og', 'team secret', 'evil geniuses', 'eg', 'psg.lgd',
+    'team spirit', 'tundra esports', 'tundra',
+    # Valorant
+    'sentinels', 'optic gaming', 'loud', 'paper rex', 'prx', 'drx',
+    # Other
+    '100 thieves', '100t', 'tsm', 'team solomid', 'nrg', 'complexity'
+]
+
+# Esports - games and tournaments
+ESPORTS_KEYWORDS = [
+    'lol', 'league of legends', 'dota', 'dota 2', 'csgo', 'cs:go', 'cs2', 'cs:2',
+    'valorant', 'overwatch', 'ow', 'apex legends', 'call of duty', 'cod',
+    'rocket league', 'rl', 'fortnite', 'worlds', 'the international', 'ti',
+    'iem', 'esl', 'blast', 'pgl major', 'vct'
+]
+
+# Handball - Major clubs
+HANDBALL_TEAMS = [
+    'kiel', 'thw kiel', 'barcelona', 'barca', 'fc barcelona', 'montpellier',
+    'veszprem', 'telekom veszprem', 'vardar', 'flensburg', 'sg flensburg',
+    'psg handball', 'paris', 'aalborg', 'aalborg handbold', 'kielce', 'vive kielce',
+    'meshkov brest', 'meshkov', 'celje', 'pick szeged', 'szeged', 'magdeburg',
+    'sc magdeburg', 'nantes', 'lemgo', 'gummersbach', 'porto'
+]
+
+# Handball - indicators
+HANDBALL_KEYWORDS = ['ehf', 'champions league handball',
+                     'handball bundesliga', 'handball']
+
+# Volleyball - Major clubs
+VOLLEYBALL_TEAMS = [
+    'perugia', 'sir perugia', 'trentino', 'itas trentino', 'modena', 'lube civitanova',
+    'lube', 'cucine lube', 'zenit kazan', 'zenit', 'zaksa', 'fenerbahce',
+    'halkbank', 'berlin recycling', 'berlin', 'monza', 'piacenza', 'milano'
+]
+
+# Volleyball - indicators
+VOLLEYBALL_KEYWORDS = [
+    'volleyball', 'cev champions league', 'superliga', 'serie a1 volleyball']
+
+# (sport, patterns) in priority order - the first group with any pattern
+# contained in the lowercased game name decides the sport
+SPORT_PATTERN_GROUPS = [
+    # 1. League/tournament indicators first (most specific)
+    ("Basketball", BASKETBALL_KEYWORDS),
+    ("American Football", AMERICAN_FOOTBALL_KEYWORDS),
+    ("Ice Hockey", ICE_HOCKEY_KEYWORDS),
+    ("Baseball", BASEBALL_KEYWORDS),
+    ("Tennis", TENNIS_KEYWORDS),
+    ("Esports", ESPORTS_KEYWORDS),
+    ("Handball", HANDBALL_KEYWORDS),
+    ("Volleyball", VOLLEYBALL_KEYWORDS),
+    # 2. Team names (most reliable for team sports); American Football is
+    # checked before regular football to avoid conflicts
+    ("Basketball", BASKETBALL_NBA + BASKETBALL_INTERNATIONAL),
+    ("American Football", AMERICAN_FOOTBALL_NFL),
+    ("Ice Hockey", ICE_HOCKEY_NHL + ICE_HOCKEY_INTERNATIONAL),
+    ("Baseball", BASEBALL_MLB),
+    ("Esports", ESPORTS_TEAMS),
+    ("Handball", HANDBALL_TEAMS),
+    ("Volleyball", VOLLEYBALL_TEAMS),
+    ("Tennis", TENNIS_PLAYERS),
+    # 3. Football/Soccer (after other sports to avoid false positives)
+    ("Football", FOOTBALL_CLUBS),
+    ("Football", FOOTBALL_KEYWORDS),
+]
+
+
+class SportClassifier:
+    """
+    Multi-pattern substring matcher over SPORT_PATTERN_GROUPS.
+
+    All patterns go into one Aho-Corasick automaton whose states record the
+    best (lowest) group priority of any pattern ending there, so one pass
+    over the text finds the highest-priority group that matches - the same
+    answer as checking each group's patterns in order.
+    """
+
+    def __init__(self, groups: List[tuple]):
+        self.labels = [label for label, _ in groups]
+        no_match = len(groups)
+
+        # Trie of all patterns
+        goto = [{}]
+        best = [no_match]
+        for priority, (_, patterns) in enumerate(groups):
+            for pattern in patterns:
+                state = 0
+                for char in pattern:
+                    if char not in goto[state]:
+                        goto.append({})
+                        best.append(no_match)
+                        goto[state][char] = len(goto) - 1
+                    state = goto[state][char]
+                best[state] = min(best[state], priority)
+
+        # Breadth-first failure links, folded into a full transition table
+        # so scanning is one dict lookup per character
+        fail = [0] * len(goto)
+        delta = [dict(goto[0])]
+        delta.extend({} for _ in range(len(goto) - 1))
+        queue = list(goto[0].values())
+        for state in queue:
+            best[state] = min(best[state], best[fail[state]])
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            for char, next_state in goto[state].items():
+                fail[next_state] = delta[fail[state]].get(char, 0) if state else 0
+                queue.append(next_state)
+
+        self._delta = delta
+        self._best = best
+        self._no_match = no_match
+
+    def match(self, text: str) -> Optional[str]:
+        """Sport of the highest-priority group with a pattern in `text`"""
+        delta = self._delta
+        best = self._best
+        top = self._no_match
+        state = 0
+        for char in text:
+            state = delta[state].get(char, 0)
+            if best[state] < top:
+                top = best[state]
+                if top == 0:
+                    break
+        return self.labels[top] if top < self._no_match else None
+
+
+sport_classifier = SportClassifier(SPORT_PATTERN_GROUPS)
+
+
 def detect_sport_from_game(game_name: str) -> str:
     """
     Detect the correct sport based on the game name.
@@ -143,293 +692,9 @@ def detect_sport_from_game(game_name: str) -> str:
 
     game_lower = game_name.lower()
 
-    # Basketball - NBA teams (all 30 teams)
-    basketball_nba = [
-        # Atlantic Division
-        'celtics', 'nets', '76ers', 'sixers', 'knicks', 'raptors',
-        # Central Division
-        'bulls', 'cavaliers', 'cavs', 'pistons', 'pacers', 'bucks',
-        # Southeast Division
-        'hawks', 'heat', 'hornets', 'magic', 'wizards',
-        # Northwest Division
-        'nuggets', 'timberwolves', 'thunder', 'trail blazers', 'blazers', 'jazz',
-        # Pacific Division
-        'warriors', 'clippers', 'lakers', 'suns', 'kings',
-        # Southwest Division
-        'mavericks', 'mavs', 'rockets', 'grizzlies', 'pelicans', 'spurs'
-    ]
-
-    # Basketball - EuroLeague and international
-    basketball_international = [
-        'real madrid', 'barcelona', 'barca', 'olympiacos', 'panathinaikos',
-        'fenerbahce', 'fener', 'cska moscow', 'cska', 'zalgiris', 'kaunas',
-        'maccabi', 'tel aviv', 'efes', 'anadolu efes', 'bayern munich',
-        'olimpia milano', 'armani', 'virtus bologna', 'virtus', 'asvel',
-        'monaco', 'baskonia', 'vitoria', 'partizan', 'red star', 'crvena zvezda'
-    ]
-
-    # Basketball - indicators
-    basketball_keywords = ['nba', 'euroleague',
-                           'ncaa basketball', 'march madness']
-
-    # American Football - NFL teams (all 32 teams)
-    american_football_nfl = [
-        # AFC East
-        'patriots', 'bills', 'dolphins', 'jets',
-        # AFC North
-        'ravens', 'bengals', 'browns', 'steelers',
-        # AFC South
-        'texans', 'colts', 'jaguars', 'jags', 'titans',
-        # AFC West
-        'broncos', 'chiefs', 'raiders', 'chargers',
-        # NFC East
-        'cowboys', 'giants', 'eagles', 'commanders', 'washington',
-        # NFC North
-        'bears', 'lions', 'packers', 'vikings',
-        # NFC South
-        'falcons', 'panthers', 'saints', 'buccaneers', 'bucs',
-        # NFC West
-        'cardinals', 'rams', '49ers', 'niners', 'seahawks'
-    ]
-
-    # American Football - indicators
-    american_football_keywords = [
-        'nfl', 'ncaa football', 'college football', 'super bowl']
-
-    # Ice Hockey - NHL teams (all 32 teams)
-    ice_hockey_nhl = [
-        # Atlantic Division
-        'bruins', 'sabres', 'red wings', 'panthers', 'canadiens', 'habs',
-        'senators', 'lightning', 'maple leafs', 'leafs',
-        # Metropolitan Division
-        'hurricanes', 'canes', 'blue jackets', 'devils', 'islanders',
-        'rangers', 'flyers', 'penguins', 'pens', 'capitals', 'caps',
-        # Central Division
-        'blackhawks', 'hawks', 'avalanche', 'avs', 'stars', 'wild',
-        'predators', 'preds', 'blues', 'jets',
-        # Pacific Division
-        'ducks', 'flames', 'oilers', 'kings', 'sharks', 'kraken',
-        'canucks', 'golden knights', 'knights', 'coyotes', 'yotes'
-    ]
-
-    # Ice Hockey - international
-    ice_hockey_international = [
-        'jokerit', 'ska', 'cska', 'dynamo', 'spartak', 'lokomotiv',
-        'metallurg', 'avangard', 'frölunda', 'hv71', 'djurgarden',
-        'lulea', 'vaxjo', 'zurich', 'zsc', 'bern', 'davos'
-    ]
-
-    # Ice Hockey - indicators
-    ice_hockey_keywords = ['nhl', 'khl', 'shl', 'liiga', 'del', 'stanley cup']
-
-    # Baseball - MLB teams (all 30 teams)
-    baseball_mlb = [
-        # AL East
-        'red sox', 'yankees', 'yanks', 'blue jays', 'jays', 'orioles', 'rays',
-        # AL Central
-        'white sox', 'indians', 'guardians', 'tigers', 'royals', 'twins',
-        # AL West
-        'astros', 'angels', 'athletics', "a's", 'mariners', 'rangers',
-        # NL East
-        'braves', 'marlins', 'mets', 'phillies', 'nationals', 'nats',
-        # NL Central
-        'cubs', 'reds', 'brewers', 'pirates', 'cardinals', 'cards',
-        # NL West
-        'diamondbacks', 'd-backs', 'rockies', 'dodgers', 'padres', 'giants'
-    ]
-
-    # Baseball - indicators
-    baseball_keywords = ['mlb', 'world series', 'baseball']
-
-    # Football (Soccer) - Major European clubs
-    football_clubs = [
-        # England - Premier League
-        'arsenal', 'chelsea', 'liverpool', 'manchester united', 'man united', 'man utd',
-        'manchester city', 'man city', 'tottenham', 'spurs', 'everton', 'leicester',
-        'west ham', 'wolves', 'wolverhampton', 'newcastle', 'aston villa', 'brighton',
-        'crystal palace', 'southampton', 'leeds', 'norwich', 'watford', 'burnley',
-        'fulham', 'brentford', 'bournemouth', 'nottingham forest',
-        # Spain - La Liga
-        'real madrid', 'barcelona', 'atletico madrid', 'atletico', 'sevilla',
-        'valencia', 'villarreal', 'real sociedad', 'athletic bilbao', 'athletic club',
-        'real betis', 'betis', 'celta vigo', 'espanyol', 'getafe', 'osasuna',
-        # Germany - Bundesliga
-        'bayern munich', 'bayern', 'borussia dortmund', 'dortmund', 'bvb',
-        'rb leipzig', 'leipzig', 'bayer leverkusen', 'leverkusen', 'borussia monchengladbach',
-        'gladbach', 'wolfsburg', 'frankfurt', 'eintracht', 'union berlin', 'freiburg',
-        'hoffenheim', 'cologne', 'mainz', 'augsburg', 'hertha',
-        # Italy - Serie A
-        'juventus', 'juve', 'inter milan', 'inter', 'ac milan', 'milan', 'napoli',
-        'roma', 'lazio', 'atalanta', 'fiorentina', 'torino', 'sassuolo', 'hellas verona',
-        'sampdoria', 'genoa', 'bologna', 'udinese', 'cagliari', 'empoli',
-        # France - Ligue 1
-        'psg', 'paris saint-germain', 'marseille', 'lyon', 'monaco', 'lille',
-        'nice', 'rennes', 'montpellier', 'nantes', 'strasbourg', 'lens',
-        # Portugal
-        'benfica', 'porto', 'sporting', 'sporting cp', 'braga',
-        # Netherlands
-        'ajax', 'psv', 'psv eindhoven', 'feyenoord', 'az alkmaar',
-        # Other major clubs
-        'celtic', 'rangers', 'galatasaray', 'besiktas', 'anderlecht'
-    ]
-
-    # Football - common keywords (be careful not to conflict with American football)
-    football_keywords = [
-        'fc ', ' fc', 'united ', 'city ', 'champions league', 'ucl', 'europa league',
-        'premier league', 'la liga', 'bundesliga', 'serie a', 'ligue 1',
-        'championship', 'eredivisie', 'primeira liga', 'copa del rey', 'fa cup'
-    ]
-
-    # Tennis - Professional players (top players for recognition)
-    tennis_players = [
-        'djokovic', 'nadal', 'federer', 'alcaraz', 'medvedev', 'tsitsipas',
-        'zverev', 'rublev', 'sinner', 'ruud', 'auger-aliassime', 'fritz',
-        'swiatek', 'sabalenka', 'gauff', 'rybakina', 'jabeur', 'pegula',
-        'kvitova', 'osaka', 'halep', 'muguruza', 'raducanu', 'kerber'
-    ]
-
-    # Tennis - indicators and patterns
-    tennis_keywords = [
-        'atp', 'wta', 'grand slam', 'wimbledon', 'roland garros', 'french open',
-        'us open', 'australian open', 'davis cup', 'masters 1000', 'atp 500'
-    ]
-
-    # Esports - Teams
-    esports_teams = [
-        # CS:GO/CS2
-        'navi', "na'vi", 'natus vincere', 'faze clan', 'faze', 'g2 esports', 'g2',
-        'vitality', 'team vitality', 'astralis', 'heroic', 'cloud9', 'c9',
-        'team liquid', 'liquid', 'fnatic', 'mouz', 'mousesports', 'big clan',
-        # League of Legends
-        't1', 'skt', 'gen.g', 'geng', 'damwon', 'drx', 'jd gaming', 'jdg',
-        'edg', 'edward gaming', 'rng', 'royal never give up', 'tes', 'top esports',
-        'fpx', 'funplus phoenix', 'we', 'team we', 'ig', 'invictus gaming',
-        # Dota 2
-        'og esports', 'og', 'team secret', 'evil geniuses', 'eg', 'psg.lgd',
-        'team spirit', 'tundra esports', 'tundra',
-        # Valorant
-        'sentinels', 'optic gaming', 'loud', 'paper rex', 'prx', 'drx',
-        # Other
-        '100 thieves', '100t', 'tsm', 'team solomid', 'nrg', 'complexity'
-    ]
-
-    # Esports - games and tournaments
-    esports_keywords = [
-        'lol', 'league of legends', 'dota', 'dota 2', 'csgo', 'cs:go', 'cs2', 'cs:2',
-        'valorant', 'overwatch', 'ow', 'apex legends', 'call of duty', 'cod',
-        'rocket league', 'rl', 'fortnite', 'worlds', 'the international', 'ti',
-        'iem', 'esl', 'blast', 'pgl major', 'vct'
-    ]
-
-    # Handball - Major clubs
-    handball_teams = [
-        'kiel', 'thw kiel', 'barcelona', 'barca', 'fc barcelona', 'montpellier',
-        'veszprem', 'telekom veszprem', 'vardar', 'flensburg', 'sg flensburg',
-        'psg handball', 'paris', 'aalborg', 'aalborg handbold', 'kielce', 'vive kielce',
-        'meshkov brest', 'meshkov', 'celje', 'pick szeged', 'szeged', 'magdeburg',
-        'sc magdeburg', 'nantes', 'lemgo', 'gummersbach', 'porto'
-    ]
-
-    # Handball - indicators
-    handball_keywords = ['ehf', 'champions league handball',
-                         'handball bundesliga', 'handball']
-
-    # Volleyball - Major clubs
-    volleyball_teams = [
-        'perugia', 'sir perugia', 'trentino', 'itas trentino', 'modena', 'lube civitanova',
-        'lube', 'cucine lube', 'zenit kazan', 'zenit', 'zaksa', 'fenerbahce',
-        'halkbank', 'berlin recycling', 'berlin', 'monza', 'piacenza', 'milano'
-    ]
-
-    # Volleyball - indicators
-    volleyball_keywords = [
-        'volleyball', 'cev champions league', 'superliga', 'serie a1 volleyball']
-
-    # === Detection Logic (Order matters for accuracy) ===
-
-    # 1. Check league/tournament indicators first (most specific)
-    for keyword in basketball_keywords:
-        if keyword in game_lower:
-            return "Basketball"
-
-    for keyword in american_football_keywords:
-        if keyword in game_lower:
-            return "American Football"
-
-    for keyword in ice_hockey_keywords:
-        if keyword in game_lower:
-            return "Ice Hockey"
-
-    for keyword in baseball_keywords:
-        if keyword in game_lower:
-            return "Baseball"
-
-    for keyword in tennis_keywords:
-        if keyword in game_lower:
-            return "Tennis"
-
-    for keyword in esports_keywords:
-        if keyword in game_lower:
-            return "Esports"
-
-    for keyword in handball_keywords:
-        if keyword in game_lower:
-            return "Handball"
-
-    for keyword in volleyball_keywords:
-        if keyword in game_lower:
-            return "Volleyball"
-
-    # 2. Check team names (most reliable for team sports)
-
-    # Basketball teams
-    for team in basketball_nba + basketball_international:
-        if team in game_lower:
-            return "Basketball"
-
-    # American Football teams (check before regular football to avoid conflicts)
-    for team in american_football_nfl:
-        if team in game_lower:
-            return "American Football"
-
-    # Ice Hockey teams
-    for team in ice_hockey_nhl + ice_hockey_international:
-        if team in game_lower:
-            return "Ice Hockey"
-
-    # Baseball teams
-    for team in baseball_mlb:
-        if team in game_lower:
-            return "Baseball"
-
-    # Esports teams
-    for team in esports_teams:
-        if team in game_lower:
-            return "Esports"
-
-    # Handball teams
-    for team in handball_teams:
-        if team in game_lower:
-            return "Handball"
-
-    # Volleyball teams
-    for team in volleyball_teams:
-        if team in game_lower:
-            return "Volleyball"
-
-    # Tennis players
-    for player in tennis_players:
-        if player in game_lower:
-            return "Tennis"
-
-    # 3. Check Football/Soccer (after other sports to avoid false positives)
-    for club in football_clubs:
-        if club in game_lower:
-            return "Football"
-
-    for keyword in football_keywords:
-        if keyword in game_lower:
-            return "Football"
+    sport = sport_classifier.match(game_lower)
+    if sport:
+        return sport
 
     # 4. Tennis pattern detection (if no other sport matched)
     # Tennis typically has " v ", " vs ", " - " between player names
@@ -444,6 +709,15 @@ def detect_sport_from_game(game_name: str) -> str:
     # 5. Default to Other if no match found
     return "Other"
 
+
+def classify_many(games: List[str]) -> List[str]:
+    """detect_sport_from_game for a batch, classifying each distinct name once"""
+    labels = {}
+    for game in games:
+        if game not in labels:
+            labels[game] = detect_sport_from_game(game)
+    return [labels[game] for game in games]
+
 # Models
 
 
@@ -492,9 +766,39 @@ class Bet(BaseModel):
     tipster: Optional[str] = None
     sport: Optional[str] = None
     notes: Optional[str] = None
+    source: Optional[str] = None  # Import source, e.g. "coolbet"
+    external_id: Optional[str] = None  # Bet ID at the import source
     created_at: datetime
 
 
+class BetListItem(BaseModel):
+    """A bet in a /bets page; only the requested fields are present"""
+    model_config = ConfigDict(extra="ignore")
+    bet_id: Optional[str] = None
+    user_id: Optional[str] = None
+    date: Optional[str] = None
+    time: Optional[str] = None
+    game: Optional[str] = None
+    bet: Optional[str] = None
+    stake: Optional[float] = None
+    odds: Optional[float] = None
+    status: Optional[str] = None
+    result: Optional[float] = None
+    bookie: Optional[str] = None
+    tipster: Optional[str] = None
+    sport: Optional[str] = None
+    notes: Optional[str] = None
+    source: Optional[str] = None
+    external_id: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class BetPage(BaseModel):
+    bets: List[BetListItem]
+    next_cursor: Optional[str] = None  # Pass back as `cursor` for the next page
+    limit: int
+
+
 class BetCreate(BaseModel):
     date: str
     time: Optional[str] = None
@@ -624,8 +928,496 @@ class Fixture(BaseModel):
     sport: str
     venue: Optional[str] = None
 
+# In-process Caches
+
+
+class TTLCache:
+    """
+    Bounded in-process LRU cache whose entries expire after a TTL.
+    Keeps hit/miss/eviction counters for the /api/metrics endpoint.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+
+        value, expires = item
+        if expires <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._data[key] = (value, time.monotonic() + ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key, default=None):
+        item = self._data.pop(key, None)
+        return default if item is None else item[0]
+
+    def values(self) -> List:
+        return [value for value, _ in self._data.values()]
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits / lookups) if lookups > 0 else 0
+        }
+
+
+# Session token -> {"user_id", "expires_at", "version"} so most
+# authenticated requests skip the user_sessions round-trip. Process-local,
+# so every entry records the user's session version when it was cached: a
+# logout on any worker bumps it, and a hit whose version no longer matches
+# (checked through session_versions, i.e. at most SESSION_REVOCATION_TTL
+# old) reloads the session from user_sessions.
+session_cache = TTLCache(
+    maxsize=int(os.environ.get('SESSION_CACHE_SIZE', '10000')),
+    ttl=float(os.environ.get('SESSION_CACHE_TTL', '60'))
+)
+
+
+def cache_session(session_token: str, user_id: str, expires_at: datetime, version: int):
+    remaining = (expires_at - datetime.now(timezone.utc)).total_seconds()
+    if remaining <= 0:
+        return
+    session_cache.set(session_token, {
+        "user_id": user_id,
+        "expires_at": expires_at,
+        "version": version
+    }, ttl=remaining)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key: the first caller starts
+    the work and everyone arriving while it runs awaits the same result.
+    Counts upstream calls made and calls saved for /api/metrics.
+    """
+
+    def __init__(self):
+        self._in_flight = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key, make_call):
+        future = self._in_flight.get(key)
+        if future is None:
+            self.calls += 1
+            future = asyncio.ensure_future(make_call())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.coalesced += 1
+
+        # A cancelled caller must not cancel the call the others await
+        return await asyncio.shield(future)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._in_flight),
+            "upstream_calls": self.calls,
+            "coalesced": self.coalesced
+        }
+
+
+# Marks a cache miss where None is a legitimate cached value
+CACHE_MISS = object()
+
+
+class CacheBackend(abc.ABC):
+    """
+    Shared cache storage behind TieredCache. get() returns
+    (value, seconds left) or None; values must be picklable/BSON-able.
+    """
+
+    name = "none"
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> Optional[tuple]:
+        ...
+
+    @abc.abstractmethod
+    async def set(self, key: str, value, ttl: float):
+        ...
+
+    @abc.abstractmethod
+    async def delete(self, key: str):
+        ...
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": (self.hits / lookups) if lookups > 0 else 0
+        }
+
+
+class MongoCacheBackend(CacheBackend):
+    """
+    A MongoDB collection whose TTL index expires documents, shared by
+    every worker and surviving restarts
+    """
+
+    name = "mongo"
+
+    def __init__(self, collection: str):
+        super().__init__()
+        self.collection = collection
+
+    async def get(self, key: str) -> Optional[tuple]:
+        now = datetime.now(timezone.utc)
+        try:
+            doc = await db[self.collection].find_one(
+                # The TTL monitor only runs once a minute
+                {"key": key, "expires_at": {"$gt": now}},
+                {"_id": 0, "value": 1, "expires_at": 1}
+            )
+        except Exception as e:
+            self.errors += 1
+            logging.warning(f"{self.collection} lookup failed for '{key}': {e}")
+            doc = None
+
+        if doc is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        expires_at = doc["expires_at"]
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        return doc.get("value"), (expires_at - now).total_seconds()
+
+    async def set(self, key: str, value, ttl: float):
+        now = datetime.now(timezone.utc)
+        try:
+            await db[self.collection].update_one(
+                {"key": key},
+                {"$set": {
+                    "value": value,
+                    "cached_at": now,
+                    "expires_at": now + timedelta(seconds=ttl)
+                }},
+                upsert=True
+            )
+        except Exception as e:
+            self.errors += 1
+            logging.warning(f"{self.collection} write failed for '{key}': {e}")
+
+    async def delete(self, key: str):
+        try:
+            await db[self.collection].delete_one({"key": key})
+        except Exception as e:
+            self.errors += 1
+            logging.warning(f"{self.collection} delete failed for '{key}': {e}")
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    A local SQLite file shared by the workers on one host. Queries run in
+    threads; values are pickled, so the file must only be writable by the
+    app.
+    """
+
+    name = "sqlite"
+    # Expired rows are purged every this many writes
+    PURGE_EVERY = 1000
+
+    def __init__(self, path: str, table: str):
+        super().__init__()
+        self.path = path
+        self.table = table
+        self.writes = 0
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} "
+                "(key TEXT PRIMARY KEY, value BLOB, expires_at REAL)")
+            self._local.conn = conn
+        return conn
+
+    def _get(self, key: str) -> Optional[tuple]:
+        row = self._connection().execute(
+            f"SELECT value, expires_at FROM {self.table} WHERE key = ? AND expires_at > ?",
+            (key, time.time())
+        ).fetchone()
+        if row is None:
+            return None
+        return pickle.loads(row[0]), row[1] - time.time()
+
+    def _set(self, key: str, value, ttl: float, purge: bool):
+        conn = self._connection()
+        conn.execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, pickle.dumps(value), time.time() + ttl)
+        )
+        if purge:
+            conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (time.time(),))
+
+    def _delete(self, key: str):
+        self._connection().execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    async def get(self, key: str) -> Optional[tuple]:
+        try:
+            entry = await asyncio.to_thread(self._get, key)
+        except Exception as e:
+            self.errors += 1
+            logging.warning(f"SQLite cache {self.table} lookup failed for '{key}': {e}")
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    async def set(self, key: str, value, ttl: float):
+        self.writes += 1
+        try:
+            await asyncio.to_thread(
+                self._set, key, value, ttl, self.writes % self.PURGE_EVERY == 0)
+        except Exception as e:
+            self.errors += 1
+            logging.warning(f"SQLite cache {self.table} write failed for '{key}': {e}")
+
+    async def delete(self, key: str):
+        try:
+            await asyncio.to_thread(self._delete, key)
+        except Exception as e:
+            self.errors += 1
+            logging.warning(f"SQLite cache {self.table} delete failed for '{key}': {e}")
+
+
+# Where shared caches live: "mongo" (default; shared by every worker on
+# every host), "sqlite" (workers on one host, CACHE_SQLITE_PATH) or
+# "memory" (nothing shared - only the in-process TTLCache tier)
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'mongo').lower()
+CACHE_SQLITE_PATH = os.environ.get('CACHE_SQLITE_PATH', str(ROOT_DIR / 'cache.sqlite3'))
+
+
+def make_cache_backend(name: str) -> Optional[CacheBackend]:
+    """The configured shared backend for the cache called `name`"""
+    if CACHE_BACKEND == "memory":
+        return None
+    if CACHE_BACKEND == "sqlite":
+        return SQLiteCacheBackend(CACHE_SQLITE_PATH, name)
+    return MongoCacheBackend(name)
+
+
+class TieredCache:
+    """
+    A bounded in-process TTLCache in front of the configured shared
+    CacheBackend. The local tier saves the round-trip for hot keys; the
+    shared tier keeps hit rates up across workers and restarts.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.ttl = ttl
+        self.local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.shared = make_cache_backend(name)
+
+    async def get(self, key: str, default=None):
+        value = self.local.get(key, CACHE_MISS)
+        if value is not CACHE_MISS:
+            return value
+        if self.shared is None:
+            return default
+
+        entry = await self.shared.get(key)
+        if entry is None:
+            return default
+
+        value, remaining = entry
+        self.local.set(key, value, ttl=remaining)
+        return value
+
+    async def set(self, key: str, value, ttl: Optional[float] = None, shared: bool = True):
+        """Cache `value` for `ttl` seconds; shared=False keeps it in this process only"""
+        ttl = self.ttl if ttl is None else ttl
+        self.local.set(key, value, ttl=ttl)
+        if shared and self.shared is not None:
+            await self.shared.set(key, value, ttl)
+
+    async def delete(self, key: str):
+        self.local.pop(key)
+        if self.shared is not None:
+            await self.shared.delete(key)
+
+    def stats(self) -> dict:
+        return {
+            "local": self.local.stats(),
+            "shared": self.shared.stats() if self.shared is not None else None
+        }
+
+
+class UserVersions:
+    """
+    Per-user version counters, stored in the users document under `field`.
+    Cache keys for per-user data embed the data version, so bumping it
+    invalidates that user's entries on every worker at once. Reads are
+    cached locally for `ttl` seconds, which bounds how long another worker
+    can serve the previous version; get(fresh=True) always reads the
+    counter, for answers that must reflect every write (ETag validators).
+    """
+
+    def __init__(self, ttl: float, field: str = "data_version"):
+        self.field = field
+        self.local = TTLCache(maxsize=100000, ttl=ttl) if ttl > 0 else None
+
+    def _remember(self, user_id: str, version: int) -> int:
+        if self.local is None:
+            return version
+        # Versions only grow; a slower read must not roll the entry back
+        version = max(version, self.local.get(user_id) or 0)
+        self.local.set(user_id, version)
+        return version
+
+    async def get(self, user_id: str, fresh: bool = False) -> int:
+        if self.local is not None and not fresh:
+            version = self.local.get(user_id)
+            if version is not None:
+                return version
+
+        user = await db.users.find_one({"user_id": user_id}, {"_id": 0, self.field: 1})
+        return self._remember(user_id, (user or {}).get(self.field, 0))
+
+    async def bump(self, user_id: str) -> int:
+        user = await db.users.find_one_and_update(
+            {"user_id": user_id},
+            {"$inc": {self.field: 1}},
+            # user_id keeps the projection non-empty for users created
+            # before the field existed (mongomock drops the update otherwise)
+            {"_id": 0, "user_id": 1, self.field: 1},
+            return_document=ReturnDocument.AFTER
+        )
+        version = (user or {}).get(self.field, 0)
+        self._remember(user_id, version)
+        return version
+
+
+user_versions = UserVersions(ttl=float(os.environ.get('USER_VERSION_TTL', '1')))
+
+# users.session_version, bumped by logout so other workers drop their
+# cached copy of the session (see session_cache). Its own TTL is how long
+# a logged-out token can still be accepted by another worker.
+session_versions = UserVersions(
+    ttl=float(os.environ.get('SESSION_REVOCATION_TTL', '10')), field="session_version")
+
+
+def user_cache_key(user_id: str, version: int, *parts) -> str:
+    return ":".join(str(part) for part in (user_id, version, *parts))
+
+
+# Normalized team name -> our sport category, or None when TheSportsDB
+# doesn't know the team. Misses expire sooner so newly listed teams and
+# fixed typos are picked up.
+SPORTSDB_CACHE_TTL = float(os.environ.get('SPORTSDB_CACHE_TTL', str(30 * 86400)))
+SPORTSDB_NEGATIVE_TTL = float(os.environ.get('SPORTSDB_NEGATIVE_TTL', str(6 * 3600)))
+sportsdb_cache = TieredCache(
+    "sportsdb_cache",
+    maxsize=int(os.environ.get('SPORTSDB_CACHE_SIZE', '50000')),
+    ttl=SPORTSDB_CACHE_TTL
+)
+
+# In-flight TheSportsDB requests keyed by ("team", name) / ("search", key)
+sportsdb_flights = SingleFlight()
+
+# Analytics summary/dashboard responses and /auth/me documents, keyed by
+# user_cache_key so data writes invalidate them through user_versions
+ANALYTICS_CACHE_TTL = float(os.environ.get('ANALYTICS_CACHE_TTL', '300'))
+user_data_cache = TieredCache(
+    "user_data_cache",
+    maxsize=int(os.environ.get('USER_DATA_CACHE_SIZE', '2000')),
+    ttl=ANALYTICS_CACHE_TTL
+)
+
+# Password Hashing
+
+# bcrypt blocks for hundreds of milliseconds per call, so it runs in a
+# small dedicated pool instead of on the event loop. The pool size bounds
+# how many CPU cores logins can take from the rest of the app.
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', '12'))
+PASSWORD_HASH_WORKERS = int(os.environ.get(
+    'PASSWORD_HASH_WORKERS', str(min(4, os.cpu_count() or 1))))
+password_hash_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+
+
+def _hash_password(password: str) -> str:
+    return bcrypt.hashpw(password.encode('utf-8'),
+                         bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode('utf-8')
+
+
+def _verify_password(password: str, password_hash: str) -> bool:
+    return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+
+
+async def hash_password(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_hash_executor, _hash_password, password)
+
+
+async def verify_password(password: str, password_hash: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        password_hash_executor, _verify_password, password, password_hash)
+
+
+def password_needs_rehash(password_hash: str) -> bool:
+    """Whether a stored hash uses a different cost than BCRYPT_ROUNDS"""
+    try:
+        # $2b$<cost>$<salt+hash>
+        return int(password_hash.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
+
+
 # Auth Helper
 
+# The user document as returned by the API
+USER_PROJECTION = {"_id": 0, "password_hash": 0, "data_version": 0, "session_version": 0}
+
 
 def is_production() -> bool:
     """Check if we're running in production (HTTPS environment)"""
@@ -636,31 +1428,93 @@ def is_production() -> bool:
     )
 
 
-async def get_current_user(request: Request) -> str:
+def get_session_token(request: Request) -> Optional[str]:
     session_token = request.cookies.get("session_token")
     if not session_token:
         auth_header = request.headers.get("Authorization")
         if auth_header and auth_header.startswith("Bearer "):
             session_token = auth_header.split(" ")[1]
+    return session_token
+
 
+async def get_current_session(request: Request) -> dict:
+    """Resolve the request's session, from session_cache when possible"""
+    session_token = get_session_token(request)
     if not session_token:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
-    session_doc = await db.user_sessions.find_one({"session_token": session_token}, {"_id": 0})
-    if not session_doc:
-        raise HTTPException(status_code=401, detail="Invalid session")
-
-    expires_at = session_doc["expires_at"]
-    if isinstance(expires_at, str):
-        expires_at = datetime.fromisoformat(expires_at)
-    if expires_at.tzinfo is None:
-        expires_at = expires_at.replace(tzinfo=timezone.utc)
-    if expires_at < datetime.now(timezone.utc):
-        # Clean up expired session
-        await db.user_sessions.delete_one({"session_token": session_token})
+    session = session_cache.get(session_token)
+    if session is not None and session["version"] != await session_versions.get(session["user_id"]):
+        # The user logged out somewhere since this was cached
+        session = None
+    if session is None:
+        session_doc = await db.user_sessions.find_one({"session_token": session_token}, {"_id": 0})
+        if not session_doc:
+            raise HTTPException(status_code=401, detail="Invalid session")
+
+        expires_at = session_doc["expires_at"]
+        if isinstance(expires_at, str):
+            expires_at = datetime.fromisoformat(expires_at)
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+
+        user_id = session_doc["user_id"]
+        version = await session_versions.get(user_id)
+        session = {"user_id": user_id, "expires_at": expires_at, "version": version}
+        cache_session(session_token, user_id, expires_at, version)
+
+    if session["expires_at"] < datetime.now(timezone.utc):
+        # The TTL index on user_sessions.expires_at removes the document
+        session_cache.pop(session_token)
         raise HTTPException(status_code=401, detail="Session expired")
 
-    return session_doc["user_id"]
+    return session
+
+
+async def get_current_user(request: Request) -> str:
+    session = await get_current_session(request)
+    return session["user_id"]
+
+
+# Conditional Requests
+#
+# Read endpoints answer If-None-Match from the user's data version alone, so
+# a client revalidating unchanged data gets a 304 without the bets
+# collection being read. Every bet, bookmaker and tipster write bumps the
+# version (see UserVersions).
+
+
+def data_etag(request: Request, user_id: str, version: int) -> str:
+    """Weak ETag for a read of the user's data at `version`"""
+    # Today's date is part of it because "last N days" ranges roll over
+    params = "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+    fingerprint = ":".join([
+        user_id, str(version), datetime.now(timezone.utc).strftime("%Y-%m-%d"),
+        request.url.path, params
+    ])
+    return f'W/"{hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()[:24]}"'
+
+
+async def check_data_etag(request: Request, response: Response, user_id: str) -> Optional[Response]:
+    """
+    Tag `response` with the ETag of the user's current data. Returns a 304
+    response to send instead when the client's If-None-Match already has it.
+
+    The version is read from users rather than the local cache so no worker
+    validates a stale copy after a write elsewhere; the read also refreshes
+    the local entry that the handler's snapshot and cache keys use next.
+    """
+    etag = data_etag(request, user_id, await user_versions.get(user_id, fresh=True))
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match", "")
+    client_etags = {tag.strip() for tag in if_none_match.split(",")}
+    # Weak comparison: W/"x" matches "x"
+    if "*" in client_etags or etag in client_etags or etag[2:] in client_etags:
+        return Response(status_code=304, headers=headers)
+    return None
+
 
 # Auth Routes
 
@@ -678,8 +1532,7 @@ async def register(request: Request, response: Response, user_data: UserRegister
             status_code=400, detail="Password must be at least 8 characters long")
 
     # Hash password
-    password_hash = bcrypt.hashpw(user_data.password.encode(
-        'utf-8'), bcrypt.gensalt()).decode('utf-8')
+    password_hash = await hash_password(user_data.password)
 
     # Create user
     user_id = f"user_{uuid.uuid4().hex[:12]}"
@@ -693,6 +1546,7 @@ async def register(request: Request, response: Response, user_data: UserRegister
         "password_hash": password_hash,
         "picture": None,
         "currency": "USD",
+        "data_version": 0,
         "created_at": datetime.now(timezone.utc)
     })
 
@@ -717,7 +1571,9 @@ async def register(request: Request, response: Response, user_data: UserRegister
         path="/"
     )
 
-    user_doc = await db.users.find_one({"user_id": user_id}, {"_id": 0, "password_hash": 0})
+    user_doc = await db.users.find_one({"user_id": user_id}, USER_PROJECTION)
+    cache_session(session_token, user_id, expires_at, 0)
+    await user_data_cache.set(user_cache_key(user_id, 0, "me"), user_doc)
     return user_doc
 
 
@@ -735,12 +1591,20 @@ async def login(request: Request, response: Response, user_data: UserLogin):
             status_code=401, detail="Account needs to be reset. Please register again.")
 
     # Verify password
-    if not bcrypt.checkpw(user_data.password.encode('utf-8'), user_doc["password_hash"].encode('utf-8')):
+    if not await verify_password(user_data.password, user_doc["password_hash"]):
         raise HTTPException(
             status_code=401, detail="Invalid email or password")
 
     user_id = user_doc["user_id"]
 
+    # Upgrade the stored hash when BCRYPT_ROUNDS has changed; matching on
+    # the old hash keeps a concurrent password change from being overwritten
+    if password_needs_rehash(user_doc["password_hash"]):
+        await db.users.update_one(
+            {"user_id": user_id, "password_hash": user_doc["password_hash"]},
+            {"$set": {"password_hash": await hash_password(user_data.password)}}
+        )
+
     # Create session
     session_token = f"session_{uuid.uuid4().hex}"
     expires_at = datetime.now(timezone.utc) + timedelta(days=7)
@@ -764,23 +1628,36 @@ async def login(request: Request, response: Response, user_data: UserLogin):
 
     # Return user without password_hash
     user_doc.pop("password_hash", None)
+    version = user_doc.pop("data_version", 0)
+    cache_session(session_token, user_id, expires_at, user_doc.pop("session_version", 0))
+    await user_data_cache.set(user_cache_key(user_id, version, "me"), user_doc)
     return user_doc
 
 
 @api_router.get("/auth/me")
 async def get_me(request: Request):
     user_id = await get_current_user(request)
-    user_doc = await db.users.find_one({"user_id": user_id}, {"_id": 0, "password_hash": 0})
-    if not user_doc:
-        raise HTTPException(status_code=404, detail="User not found")
+
+    cache_key = user_cache_key(user_id, await user_versions.get(user_id), "me")
+    user_doc = await user_data_cache.get(cache_key)
+    if user_doc is None:
+        user_doc = await db.users.find_one({"user_id": user_id}, USER_PROJECTION)
+        if not user_doc:
+            raise HTTPException(status_code=404, detail="User not found")
+        await user_data_cache.set(cache_key, user_doc)
     return user_doc
 
 
 @api_router.post("/auth/logout")
 async def logout(request: Request, response: Response):
-    session_token = request.cookies.get("session_token")
+    session_token = get_session_token(request)
     if session_token:
-        await db.user_sessions.delete_one({"session_token": session_token})
+        session_cache.pop(session_token)
+        session_doc = await db.user_sessions.find_one_and_delete(
+            {"session_token": session_token}, {"_id": 0, "user_id": 1})
+        if session_doc:
+            # Makes other workers drop their cached copy of the session
+            await session_versions.bump(session_doc["user_id"])
 
     response.delete_cookie(
         "session_token",
@@ -801,37 +1678,335 @@ async def update_currency(request: Request):
         raise HTTPException(status_code=400, detail="Invalid currency")
 
     await db.users.update_one({"user_id": user_id}, {"$set": {"currency": currency}})
+    bet_snapshots.apply(user_id, await user_versions.bump(user_id))
     return {"currency": currency}
 
-# Bet Routes
-
+# Daily Rollups
+#
+# daily_rollups holds one row per (user_id, date, sport) with the bet count,
+# stake, profit/loss and per-status counts for that day. Every bet write
+# applies $inc deltas so the chart, calendar and period views scale with the
+# number of days rather than the number of bets. rebuild_daily_rollups()
+# recomputes the rows from the bets collection to repair any drift, and
+# backfill_daily_rollups() runs it once at startup to seed existing data.
 
-@api_router.get("/bets", response_model=List[Bet])
-async def get_bets(request: Request, date_from: Optional[str] = None, date_to: Optional[str] = None,
-                   bookie: Optional[str] = None, tipster: Optional[str] = None, status: Optional[str] = None):
-    user_id = await get_current_user(request)
+BET_STATUSES = ("won", "lost", "push", "pending")
 
-    query = {"user_id": user_id}
-    if date_from or date_to:
-        query["date"] = {}
-        if date_from:
-            query["date"]["$gte"] = date_from
-        if date_to:
-            query["date"]["$lte"] = date_to
-    if bookie:
-        query["bookie"] = bookie
-    if tipster:
-        query["tipster"] = tipster
-    if status:
-        query["status"] = status
 
-    bets = await db.bets.find(query, {"_id": 0}).sort("date", -1).to_list(10000)
-    return bets
+def _rollup_key(bet: dict) -> tuple:
+    return (bet["user_id"], bet.get("date"), bet.get("sport"))
 
 
-@api_router.post("/bets", response_model=Bet)
-async def create_bet(request: Request, bet_input: BetCreate):
-    user_id = await get_current_user(request)
+def rollup_deltas(old_bet: Optional[dict] = None, new_bet: Optional[dict] = None) -> dict:
+    """
+    $inc deltas that move the rollups from old_bet to new_bet, keyed by
+    (user_id, date, sport). Pass only new_bet for an insert and only
+    old_bet for a delete.
+    """
+    deltas = {}
+    for bet, sign in ((old_bet, -1), (new_bet, 1)):
+        if not bet:
+            continue
+        inc = deltas.setdefault(_rollup_key(bet), {
+            "bets": 0, "stake": 0, "profit_loss": 0,
+            **{status: 0 for status in BET_STATUSES}
+        })
+        inc["bets"] += sign
+        inc["stake"] += sign * (bet.get("stake") or 0)
+        inc["profit_loss"] += sign * (bet.get("result") or 0)
+        if bet.get("status") in BET_STATUSES:
+            inc[bet["status"]] += sign
+    return deltas
+
+
+def merge_rollup_deltas(target: dict, deltas: dict) -> dict:
+    """Fold `deltas` into `target` so many bets can be applied in one write"""
+    for key, inc in deltas.items():
+        if key not in target:
+            target[key] = dict(inc)
+            continue
+        for field, value in inc.items():
+            target[key][field] += value
+    return target
+
+
+async def apply_rollup_deltas(deltas: dict):
+    """Apply accumulated deltas with a single unordered bulk write"""
+    operations = []
+    emptied = []
+    for (user_id, date, sport), inc in deltas.items():
+        if not any(inc.values()):
+            continue
+        key = {"user_id": user_id, "date": date, "sport": sport}
+        operations.append(UpdateOne(key, {"$inc": inc}, upsert=True))
+        if inc.get("bets", 0) < 0:
+            emptied.append(key)
+
+    if not operations:
+        return
+
+    await db.daily_rollups.bulk_write(operations, ordered=False)
+
+    # Drop days that no longer have any bets so they don't show up as
+    # empty points in the chart or calendar
+    if emptied:
+        await db.daily_rollups.delete_many(
+            {"$or": emptied, "bets": {"$lte": 0}})
+
+
+async def rebuild_daily_rollups(user_id: Optional[str] = None) -> int:
+    """
+    Recompute daily_rollups from the bets collection, for one user or for
+    everyone. Returns the number of rollup rows written.
+
+    Rows are overwritten in place with upserts and only then are the days
+    that no longer have bets removed, so the unique (user_id, date, sport)
+    index never sees two rows for a day and the $inc upserts of bet writes
+    landing during the rebuild keep their row.
+    """
+    if user_id:
+        user_ids = [user_id]
+    else:
+        user_ids = await db.bets.distinct("user_id")
+
+    group = {
+        "_id": {"date": "$date", "sport": "$sport"},
+        "bets": {"$sum": 1},
+        "stake": {"$sum": "$stake"},
+        "profit_loss": {"$sum": "$result"},
+    }
+    for status in BET_STATUSES:
+        group[status] = {
+            "$sum": {"$cond": [{"$eq": ["$status", status]}, 1, 0]}}
+
+    written = 0
+    for uid in user_ids:
+        # Read before the bets so a day first written after this point is
+        # never mistaken for a stale one
+        existing = await db.daily_rollups.find(
+            {"user_id": uid}, {"_id": 1, "date": 1, "sport": 1, "bets": 1}
+        ).to_list(None)
+
+        rows = await db.bets.aggregate([
+            {"$match": {"user_id": uid}},
+            {"$group": group}
+        ]).to_list(None)
+
+        operations = []
+        rebuilt = set()
+        for row in rows:
+            key = row.pop("_id")
+            date, sport = key.get("date"), key.get("sport")
+            rebuilt.add((date, sport))
+            operations.append(UpdateOne(
+                {"user_id": uid, "date": date, "sport": sport},
+                {"$set": row}, upsert=True))
+        if operations:
+            await db.daily_rollups.bulk_write(operations, ordered=False)
+
+        # A stale row is only deleted while its bet count is the one read
+        # above; a bet written to that day since then keeps it
+        stale = [DeleteOne({"_id": doc["_id"], "bets": doc.get("bets")})
+                 for doc in existing
+                 if (doc.get("date"), doc.get("sport")) not in rebuilt]
+        if stale:
+            await db.daily_rollups.bulk_write(stale, ordered=False)
+        written += len(operations)
+
+    return written
+
+
+# Marker document in the migrations collection recording that the rollups
+# were seeded from the bets collection
+DAILY_ROLLUPS_MIGRATION = "daily_rollups_backfill"
+
+
+async def backfill_daily_rollups():
+    """
+    Seed daily_rollups from the bets collection once per database. The
+    rebuild is idempotent, so workers starting together or a restart
+    mid-way only repeat work.
+    """
+    await run_migration(DAILY_ROLLUPS_MIGRATION, rebuild_daily_rollups)
+
+
+async def fetch_daily_totals(query: dict) -> List[dict]:
+    """
+    Per-day totals across sports for the rollup rows matching `query`
+    (the same user/date/sport filter used for bets), oldest first.
+    """
+    group = {
+        "_id": "$date",
+        "bets": {"$sum": "$bets"},
+        "stake": {"$sum": "$stake"},
+        "profit_loss": {"$sum": "$profit_loss"},
+    }
+    for status in BET_STATUSES:
+        group[status] = {"$sum": f"${status}"}
+
+    rows = await db.daily_rollups.aggregate([
+        {"$match": {**query, "bets": {"$gt": 0}}},
+        {"$group": group},
+        {"$sort": {"_id": 1}}
+    ]).to_list(None)
+
+    for row in rows:
+        row["date"] = row.pop("_id")
+    return rows
+
+# Bet Routes
+
+
+DEFAULT_BETS_PAGE_SIZE = 100
+MAX_BETS_PAGE_SIZE = 1000
+
+# Newest first; bet_id breaks ties so every bet has a unique position
+BETS_SORT = [("date", -1), ("time", -1), ("bet_id", -1)]
+
+# Always returned because the cursor is built from them
+BETS_CURSOR_FIELDS = ("date", "time", "bet_id")
+
+# Opt-in: with FAST_JSON=1 (and orjson installed) bet responses built from
+# projected documents are encoded with orjson directly instead of being
+# re-validated through Bet/BetPage; the projection guarantees their shape.
+# Off by default, so responses go through the response_model validation.
+FAST_JSON = orjson is not None and os.environ.get('FAST_JSON', '').lower() in ('1', 'true', 'yes')
+BET_PROJECTION = {"_id": 0, **{field: 1 for field in Bet.model_fields}}
+
+
+def bet_response(bet_doc: dict) -> dict:
+    """A projected bet document shaped like the Bet response model"""
+    return {field: bet_doc.get(field) for field in Bet.model_fields}
+
+
+def fast_json_response(content, response: Optional[Response] = None) -> Response:
+    """
+    orjson-encoded response, carrying over the headers (ETag etc.) set on
+    the handler's injected `response`
+    """
+    headers = None
+    if response is not None:
+        headers = {key: value for key, value in response.headers.items()
+                   if key != "content-length"}
+    return ORJSONResponse(content, headers=headers)
+
+
+def encode_bets_cursor(bet: dict) -> str:
+    position = [bet.get(field) for field in BETS_CURSOR_FIELDS]
+    return base64.urlsafe_b64encode(json.dumps(position).encode('utf-8')).decode('ascii')
+
+
+def decode_bets_cursor(cursor: str) -> tuple:
+    try:
+        date, time_, bet_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return date, time_, bet_id
+
+
+def bets_after_cursor(cursor: str) -> dict:
+    """
+    Filter for the bets that come after `cursor` in BETS_SORT order.
+    A null time sorts below every string, so it counts as "before" any
+    real time on the same date.
+    """
+    date, time_, bet_id = decode_bets_cursor(cursor)
+
+    conditions = [
+        {"date": {"$lt": date}},
+        {"date": date, "time": time_, "bet_id": {"$lt": bet_id}},
+    ]
+    if time_ is not None:
+        conditions.append({"date": date, "time": {"$lt": time_}})
+        conditions.append({"date": date, "time": None})
+    return {"$or": conditions}
+
+
+def build_bets_query(
+    user_id: str,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    bookie: Optional[str] = None,
+    tipster: Optional[str] = None,
+    status: Optional[str] = None,
+    sport: Optional[str] = None
+) -> dict:
+    """Build the Mongo filter for the /bets list and export filters"""
+    query = {"user_id": user_id}
+    if date_from or date_to:
+        query["date"] = {}
+        if date_from:
+            query["date"]["$gte"] = date_from
+        if date_to:
+            query["date"]["$lte"] = date_to
+    if bookie:
+        query["bookie"] = bookie
+    if tipster:
+        query["tipster"] = tipster
+    if status:
+        query["status"] = status
+    if sport:
+        query["sport"] = sport
+    return query
+
+
+def bets_projection(fields: Optional[str]) -> dict:
+    """Projection for a comma-separated `fields` list (all fields if empty)"""
+    if not fields:
+        return BET_PROJECTION
+
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - set(BetListItem.model_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    projection = {"_id": 0}
+    for field in requested | set(BETS_CURSOR_FIELDS):
+        projection[field] = 1
+    return projection
+
+
+@api_router.get("/bets", response_model=BetPage, response_model_exclude_unset=True)
+async def get_bets(request: Request, response: Response,
+                   date_from: Optional[str] = None, date_to: Optional[str] = None,
+                   bookie: Optional[str] = None, tipster: Optional[str] = None, status: Optional[str] = None,
+                   sport: Optional[str] = None, limit: int = DEFAULT_BETS_PAGE_SIZE,
+                   cursor: Optional[str] = None, fields: Optional[str] = None):
+    """
+    One page of bets, newest first. Pass the returned `next_cursor` back as
+    `cursor` to get the next page; it is null on the last page. `fields`
+    is an optional comma-separated list of bet fields to return.
+    """
+    user_id = await get_current_user(request)
+    not_modified = await check_data_etag(request, response, user_id)
+    if not_modified:
+        return not_modified
+
+    limit = max(1, min(limit, MAX_BETS_PAGE_SIZE))
+    query = build_bets_query(user_id, date_from=date_from, date_to=date_to,
+                             bookie=bookie, tipster=tipster, status=status, sport=sport)
+    if cursor:
+        query = {"$and": [query, bets_after_cursor(cursor)]}
+
+    # Fetch one extra bet to know whether there is a next page
+    bets = await db.bets.find(query, bets_projection(fields)).sort(
+        BETS_SORT).limit(limit + 1).to_list(limit + 1)
+
+    next_cursor = None
+    if len(bets) > limit:
+        bets = bets[:limit]
+        next_cursor = encode_bets_cursor(bets[-1])
+
+    page = {"bets": bets, "next_cursor": next_cursor, "limit": limit}
+    if FAST_JSON:
+        return fast_json_response(page, response)
+    return page
+
+
+@api_router.post("/bets", response_model=Bet)
+async def create_bet(request: Request, bet_input: BetCreate):
+    user_id = await get_current_user(request)
 
     bet_id = f"bet_{uuid.uuid4().hex[:12]}"
 
@@ -848,8 +2023,12 @@ async def create_bet(request: Request, bet_input: BetCreate):
     bet_dict["created_at"] = datetime.now(timezone.utc)
 
     await db.bets.insert_one(bet_dict)
+    await apply_rollup_deltas(rollup_deltas(new_bet=bet_dict))
+    bet_snapshots.apply(user_id, await user_versions.bump(user_id), new_bet=bet_dict)
 
-    bet_doc = await db.bets.find_one({"bet_id": bet_id}, {"_id": 0})
+    bet_doc = await db.bets.find_one({"bet_id": bet_id}, BET_PROJECTION)
+    if FAST_JSON:
+        return fast_json_response(bet_response(bet_doc))
     return bet_doc
 
 
@@ -881,7 +2060,11 @@ async def update_bet(request: Request, bet_id: str, bet_update: BetUpdate):
         {"$set": update_data}
     )
 
-    updated_bet = await db.bets.find_one({"bet_id": bet_id}, {"_id": 0})
+    updated_bet = await db.bets.find_one({"bet_id": bet_id}, BET_PROJECTION)
+    await apply_rollup_deltas(rollup_deltas(old_bet=bet_doc, new_bet=updated_bet))
+    bet_snapshots.apply(user_id, await user_versions.bump(user_id), old_bet=bet_doc, new_bet=updated_bet)
+    if FAST_JSON:
+        return fast_json_response(bet_response(updated_bet))
     return updated_bet
 
 
@@ -889,26 +2072,51 @@ async def update_bet(request: Request, bet_id: str, bet_update: BetUpdate):
 async def delete_bet(request: Request, bet_id: str):
     user_id = await get_current_user(request)
 
-    result = await db.bets.delete_one({"bet_id": bet_id, "user_id": user_id})
-    if result.deleted_count == 0:
+    deleted_bet = await db.bets.find_one_and_delete({"bet_id": bet_id, "user_id": user_id}, {"_id": 0})
+    if not deleted_bet:
         raise HTTPException(status_code=404, detail="Bet not found")
 
+    await apply_rollup_deltas(rollup_deltas(old_bet=deleted_bet))
+    bet_snapshots.apply(user_id, await user_versions.bump(user_id), old_bet=deleted_bet)
     return {"message": "Bet deleted"}
 
-# Analytics Routes
+# Analytics Engine
 
+# Only the fields the stats scan reads, so it doesn't ship
+# notes/game/bet text over the wire
+ANALYTICS_PROJECTION = {
+    "_id": 0,
+    "stake": 1,
+    "status": 1,
+    "result": 1,
+}
 
-@api_router.get("/analytics/stats")
-async def get_stats(
-    request: Request,
-    days: int = None,
-    start_date: str = None,
-    end_date: str = None,
-    sport: str = None
-):
-    user_id = await get_current_user(request)
+# Sections computed from an ordered scan of the bets in Python
+SCAN_SECTIONS = ("stats",)
+
+# Sections read from the daily_rollups collection
+ROLLUP_SECTIONS = ("chart",)
+
+# Sections grouped server-side by MongoDB aggregation
+GROUP_SECTIONS = ("bookmakers", "tipsters", "sports", "odds_range")
 
-    # Build query with filters
+ANALYTICS_SECTIONS = SCAN_SECTIONS + ROLLUP_SECTIONS + GROUP_SECTIONS
+
+# Odds range buckets are given by their edges: bucket i holds odds in
+# (edges[i-1], edges[i]], the first bucket everything up to edges[0] and
+# the last everything above edges[-1], so every bet lands in exactly one
+ODDS_BUCKET_EDGES = (1.5, 2.0, 3.0, 5.0)
+MAX_ODDS_BUCKETS = 500
+
+
+def build_analytics_query(
+    user_id: str,
+    days: Optional[int] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    sport: Optional[str] = None
+) -> dict:
+    """Build the Mongo filter shared by all analytics endpoints"""
     query = {"user_id": user_id}
 
     # Date filtering
@@ -923,18 +2131,188 @@ async def get_stats(
     if sport and sport != "all":
         query["sport"] = sport
 
-    all_bets = await db.bets.find(query, {"_id": 0}).sort("date", 1).sort("time", 1).to_list(10000)
+    return query
+
+
+async def fetch_analytics_bets(query: dict) -> List[dict]:
+    """Read the filtered bets once, oldest first, for the stats scan"""
+    return await db.bets.find(query, ANALYTICS_PROJECTION).sort(
+        [("date", 1), ("time", 1)]).to_list(None)
 
-    total_bets = len(all_bets)
-    total_stake = sum(bet["stake"] for bet in all_bets)
-    total_profit_loss = sum(bet["result"] for bet in all_bets)
 
-    won_bets = [bet for bet in all_bets if bet["status"] == "won"]
-    lost_bets = [bet for bet in all_bets if bet["status"] == "lost"]
-    push_bets = [bet for bet in all_bets if bet["status"] == "push"]
-    pending_bets = [bet for bet in all_bets if bet["status"] == "pending"]
+def _finalize_group_stats(stats: dict) -> dict:
+    """Attach win rate and ROI to a grouped row"""
+    total_settled = stats["won"] + stats["lost"]
+    stats["win_rate"] = (stats["won"] / total_settled *
+                         100) if total_settled > 0 else 0
+    stats["roi"] = (stats["profit_loss"] / stats["stake"]
+                    * 100) if stats["stake"] > 0 else 0
+    return stats
+
+
+def parse_odds_edges(edges: str) -> List[float]:
+    """Sorted bucket edges from a comma-separated query parameter"""
+    try:
+        values = sorted({float(edge) for edge in edges.split(",") if edge.strip()})
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid odds edges")
+    if (not values or len(values) >= MAX_ODDS_BUCKETS
+            or values[0] < 1 or not math.isfinite(values[-1])):
+        raise HTTPException(status_code=400, detail="Invalid odds edges")
+    return values
+
+
+def quantile_odds_edges(odds, buckets: int) -> List[float]:
+    """Edges splitting sorted `odds` into `buckets` buckets of about equal size"""
+    count = len(odds)
+    edges = {round(float(odds[(count * k - 1) // buckets]), 2) for k in range(1, buckets)} if count else set()
+    # An edge at the highest odds would only leave an empty last bucket
+    return sorted(edge for edge in edges if edge < odds[-1])
+
+
+def odds_buckets(edges) -> List[dict]:
+    """
+    Name and bounds of each bucket: odds_above is exclusive (null for the
+    first bucket) and odds_up_to inclusive (null for the last)
+    """
+    def just_above(edge: float) -> float:
+        # Smallest two-decimal odds above the edge
+        return (math.floor(round(edge * 100, 6)) + 1) / 100
+
+    buckets = []
+    for index in range(len(edges) + 1):
+        low = edges[index - 1] if index > 0 else None
+        high = edges[index] if index < len(edges) else None
+        if low is None:
+            name = f"1.00-{high:.2f}" if high is not None else "All"
+        elif high is None:
+            name = f"{just_above(low):.2f}+"
+        else:
+            name = f"{just_above(low):.2f}-{high:.2f}"
+        buckets.append({"name": name, "odds_above": low, "odds_up_to": high})
+    return buckets
+
+
+# Group key and pre-group filter per section. The keys mirror the old
+# Python grouping: a missing bookie is "Unknown" (an explicit null stays
+# null), empty tipsters are skipped and empty sports become "Unknown".
+GROUP_SECTION_SPECS = {
+    "bookmakers": (
+        {"$cond": [{"$eq": [{"$type": "$bookie"}, "missing"]}, "Unknown", "$bookie"]},
+        None
+    ),
+    "tipsters": ("$tipster", {"tipster": {"$nin": [None, ""]}}),
+    "sports": (
+        {"$cond": [{"$eq": [{"$ifNull": ["$sport", ""]}, ""]}, "Unknown", "$sport"]},
+        None
+    ),
+    # Grouped with $bucket instead, see _group_stats_stages
+    "odds_range": (None, {"odds": {"$ne": None}}),
+}
+
+
+def _odds_bucket_boundaries(edges) -> List[float]:
+    """
+    $bucket boundaries for odds_buckets(edges). $bucket ranges are
+    closed below and odds buckets above, so it groups by the negated
+    odds; the bucket whose lower boundary is boundaries[j] is odds
+    bucket len(edges) - j.
+    """
+    return [float("-inf"), *(-edge for edge in reversed(edges)), float("inf")]
+
 
-    # Calculate streaks
+def _group_stats_stages(section: str, extra_match: Optional[dict] = None,
+                        odds_edges=ODDS_BUCKET_EDGES) -> List[dict]:
+    key_expr, pre_match = GROUP_SECTION_SPECS[section]
+
+    stages = []
+    match = {**(extra_match or {}), **(pre_match or {})}
+    if match:
+        stages.append({"$match": match})
+
+    group = {
+        "_id": key_expr,
+        "bets": {"$sum": 1},
+        "stake": {"$sum": "$stake"},
+        "profit_loss": {"$sum": "$result"},
+    }
+    for status in BET_STATUSES:
+        group[status] = {"$sum": {"$cond": [{"$eq": ["$status", status]}, 1, 0]}}
+
+    if section == "odds_range":
+        # Non-numeric odds go to the "none" bucket and are dropped
+        del group["_id"]
+        stages.append({"$bucket": {
+            "groupBy": {"$multiply": ["$odds", -1]},
+            "boundaries": _odds_bucket_boundaries(odds_edges),
+            "default": "none",
+            "output": group
+        }})
+    else:
+        stages.append({"$group": group})
+
+    return stages
+
+
+async def aggregate_group_sections(
+    query: dict,
+    sections=GROUP_SECTIONS,
+    section_match: Optional[dict] = None,
+    odds_edges=ODDS_BUCKET_EDGES
+) -> dict:
+    """
+    Compute the grouped analytics sections in a single aggregation.
+    Each section is a $facet over the bets matching `query`;
+    `section_match` optionally adds a per-section $match on top of it.
+    Only the grouped rows come back over the wire.
+    """
+    section_match = section_match or {}
+    facets = {
+        section: _group_stats_stages(section, section_match.get(section), odds_edges)
+        for section in sections
+    }
+
+    pipeline = [{"$match": query}, {"$facet": facets}]
+    docs = await db.bets.aggregate(pipeline).to_list(1)
+    facet_rows = docs[0] if docs else {}
+
+    buckets = odds_buckets(odds_edges)
+    boundaries = _odds_bucket_boundaries(odds_edges)
+
+    result = {}
+    for section in sections:
+        rows = []
+        for row in facet_rows.get(section, []):
+            name = row.pop("_id")
+            if section != "odds_range":
+                rows.append({"name": name, **row})
+            elif name != "none":
+                rows.append({**buckets[len(odds_edges) - boundaries.index(name)], **row})
+        result[section] = order_group_rows(section, rows)
+
+    return result
+
+
+def order_group_rows(section: str, rows: List[dict]) -> List[dict]:
+    """Finalize grouped rows and put them in the section's display order"""
+    rows = [_finalize_group_stats(row) for row in rows]
+    if section == "odds_range":
+        # Lowest odds first; empty buckets are left out
+        return sorted(rows, key=lambda x: -math.inf if x["odds_above"] is None else x["odds_above"])
+    return sorted(rows, key=lambda x: x["profit_loss"], reverse=True)
+
+
+def compute_stats(bets: List[dict]) -> dict:
+    """
+    Totals, status counts and streaks in a single pass over the bets.
+    Bets must be sorted oldest first (as returned by fetch_analytics_bets)
+    so that streaks are correct.
+    """
+    total_stake = 0
+    total_profit_loss = 0
+    counts = {status: 0 for status in BET_STATUSES}
+
+    # Streaks
     current_streak = 0
     current_streak_type = None
     best_win_streak = 0
@@ -942,39 +2320,53 @@ async def get_stats(
     temp_win_streak = 0
     temp_loss_streak = 0
 
-    for bet in all_bets:
-        if bet["status"] == "won":
+    for bet in bets:
+        status = bet["status"]
+        total_stake += bet["stake"]
+        total_profit_loss += bet["result"]
+        if status in counts:
+            counts[status] += 1
+
+        if status == "won":
             temp_win_streak += 1
             temp_loss_streak = 0
             if current_streak_type == "won" or current_streak_type is None:
                 current_streak += 1
-                current_streak_type = "won"
             else:
                 current_streak = 1
-                current_streak_type = "won"
+            current_streak_type = "won"
             best_win_streak = max(best_win_streak, temp_win_streak)
-        elif bet["status"] == "lost":
+        elif status == "lost":
             temp_loss_streak += 1
             temp_win_streak = 0
             if current_streak_type == "lost" or current_streak_type is None:
                 current_streak += 1
-                current_streak_type = "lost"
             else:
                 current_streak = 1
-                current_streak_type = "lost"
+            current_streak_type = "lost"
             worst_loss_streak = max(worst_loss_streak, temp_loss_streak)
         # Push doesn't break streak but doesn't count toward it
 
+    return stats_response(
+        len(bets), total_stake, total_profit_loss, counts,
+        current_streak, current_streak_type, best_win_streak, worst_loss_streak)
+
+
+def stats_response(total_bets: int, total_stake: float, total_profit_loss: float, counts: dict,
+                   current_streak: int, current_streak_type: Optional[str],
+                   best_win_streak: int, worst_loss_streak: int) -> dict:
+    won_count = counts["won"]
+    lost_count = counts["lost"]
     return {
         "total_bets": total_bets,
         "total_stake": total_stake,
         "total_profit_loss": total_profit_loss,
         "roi": (total_profit_loss / total_stake * 100) if total_stake > 0 else 0,
-        "won_count": len(won_bets),
-        "lost_count": len(lost_bets),
-        "push_count": len(push_bets),
-        "pending_count": len(pending_bets),
-        "win_rate": (len(won_bets) / (len(won_bets) + len(lost_bets)) * 100) if (len(won_bets) + len(lost_bets)) > 0 else 0,
+        "won_count": won_count,
+        "lost_count": lost_count,
+        "push_count": counts["push"],
+        "pending_count": counts["pending"],
+        "win_rate": (won_count / (won_count + lost_count) * 100) if (won_count + lost_count) > 0 else 0,
         "current_streak": current_streak,
         "current_streak_type": current_streak_type,
         "best_win_streak": best_win_streak,
@@ -982,60 +2374,570 @@ async def get_stats(
     }
 
 
-@api_router.get("/analytics/chart")
-async def get_chart_data(
+def build_chart(daily_totals: List[dict]) -> List[dict]:
+    """Daily and cumulative P/L and stake from fetch_daily_totals rows"""
+    chart_data = []
+    cumulative_pl = 0
+    cumulative_stake = 0
+    for day in daily_totals:
+        cumulative_pl += day["profit_loss"]
+        cumulative_stake += day["stake"]
+        chart_data.append({
+            "date": day["date"],
+            "daily_pl": day["profit_loss"],
+            "daily_stake": day["stake"],
+            "cumulative_pl": cumulative_pl,
+            "cumulative_stake": cumulative_stake,
+            "bets": day["bets"]
+        })
+    return chart_data
+
+
+# Bet Snapshots
+#
+# A per-user columnar copy of the fields analytics read: NumPy arrays for
+# stake, odds, result and a status code, plus dictionary-encoded date,
+# time, bookie, tipster and sport. The date and time dictionaries are kept
+# sorted so codes compare like the strings, and rows are kept in (date,
+# time) order, so a date filter is a slice and streaks read rows in order.
+# Snapshots are built from Mongo on first use, patched in place by the bet
+# routes and rebuilt whenever the user's data version moved without a
+# patch from this process (imports, other workers).
+
+# Rows held across all snapshots in this process before least recently
+# used users are evicted. 0 turns snapshots off.
+BET_SNAPSHOT_MAX_ROWS = int(os.environ.get('BET_SNAPSHOT_MAX_ROWS', '2000000'))
+BET_SNAPSHOTS = np is not None and BET_SNAPSHOT_MAX_ROWS > 0
+
+SNAPSHOT_PROJECTION = {
+    "_id": 0,
+    "bet_id": 1,
+    "date": 1,
+    "time": 1,
+    "stake": 1,
+    "odds": 1,
+    "result": 1,
+    "status": 1,
+    "bookie": 1,
+    "tipster": 1,
+    "sport": 1,
+}
+
+# Status codes index BET_STATUSES; anything else is OTHER_STATUS
+STATUS_CODES = {status: code for code, status in enumerate(BET_STATUSES)}
+OTHER_STATUS = len(BET_STATUSES)
+
+# Dictionary-encoded column behind each grouped section
+GROUP_COLUMNS = {"bookmakers": "bookie", "tipsters": "tipster", "sports": "sport"}
+
+
+class BetSnapshot:
+    """Columnar copy of one user's bets as of data version `version`"""
+
+    def __init__(self, version: int, bets: List[dict]):
+        self.version = version
+        self.dates = sorted({bet["date"] for bet in bets if bet.get("date") is not None})
+        self.times = sorted({bet["time"] for bet in bets if bet.get("time") is not None})
+        self.labels = {column: [] for column in GROUP_COLUMNS.values()}
+        self.label_codes = {column: {} for column in GROUP_COLUMNS.values()}
+
+        columns = self._encode(bets)
+        order = np.argsort(self._sort_keys(columns), kind="stable")
+        self.columns = {name: values[order] for name, values in columns.items()}
+        self.bet_ids = set(self.columns["bet_id"].tolist())
+
+    def __len__(self) -> int:
+        return len(self.columns["bet_id"])
+
+    def _label(self, column: str, value) -> int:
+        codes = self.label_codes[column]
+        if value not in codes:
+            codes[value] = len(self.labels[column])
+            self.labels[column].append(value)
+        return codes[value]
+
+    def _encode(self, bets: List[dict]) -> dict:
+        def sorted_code(values: List[str], value) -> int:
+            # Missing dates and times sort before every string, as in Mongo
+            return -1 if value is None else bisect_left(values, value)
+
+        return {
+            "bet_id": np.array([bet["bet_id"] for bet in bets], dtype=object),
+            "date": np.array([sorted_code(self.dates, bet.get("date")) for bet in bets], dtype=np.int32),
+            "time": np.array([sorted_code(self.times, bet.get("time")) for bet in bets], dtype=np.int32),
+            "stake": np.array([bet.get("stake") or 0 for bet in bets], dtype=np.float64),
+            # Missing odds become NaN and fall outside every odds bucket
+            "odds": np.array([bet.get("odds") for bet in bets], dtype=np.float64),
+            "result": np.array([bet.get("result") or 0 for bet in bets], dtype=np.float64),
+            "status": np.array([STATUS_CODES.get(bet.get("status"), OTHER_STATUS) for bet in bets], dtype=np.int8),
+            # A missing bookie groups as "Unknown"; an explicit null stays null
+            "bookie": np.array([self._label("bookie", bet.get("bookie", "Unknown")) for bet in bets], dtype=np.int32),
+            "tipster": np.array([self._label("tipster", bet.get("tipster")) for bet in bets], dtype=np.int32),
+            "sport": np.array([self._label("sport", bet.get("sport")) for bet in bets], dtype=np.int32),
+        }
+
+    @staticmethod
+    def _sort_keys(columns: dict):
+        return (columns["date"].astype(np.int64) << 32) + columns["time"] + 1
+
+    def _find(self, bet: dict) -> Optional[int]:
+        """Row holding bet["bet_id"], looked up among rows with the bet's date and time first"""
+        bet_id = bet["bet_id"]
+        if bet_id not in self.bet_ids:
+            return None
+
+        ids = self.columns["bet_id"]
+        codes = []
+        for column, values in (("date", self.dates), ("time", self.times)):
+            value = bet.get(column)
+            code = -1 if value is None else bisect_left(values, value)
+            codes.append(code if value is None or (code < len(values) and values[code] == value) else None)
+        if None not in codes:
+            keys = self._sort_keys(self.columns)
+            key = (codes[0] << 32) + codes[1] + 1
+            for row in range(np.searchsorted(keys, key, side="left"), np.searchsorted(keys, key, side="right")):
+                if ids[row] == bet_id:
+                    return row
+        # The snapshot holds a different version of the bet
+        return int(np.flatnonzero(ids == bet_id)[0])
+
+    def remove(self, bet: dict):
+        row = self._find(bet)
+        if row is not None:
+            self.columns = {name: np.delete(values, row) for name, values in self.columns.items()}
+            self.bet_ids.discard(bet["bet_id"])
+
+    def add(self, bet: dict):
+        """Insert or replace `bet`, keeping rows in (date, time) order"""
+        self.remove(bet)
+        for column, values in (("date", self.dates), ("time", self.times)):
+            value = bet.get(column)
+            if value is None:
+                continue
+            code = bisect_left(values, value)
+            if code == len(values) or values[code] != value:
+                values.insert(code, value)
+                codes = self.columns[column]
+                codes[codes >= code] += 1
+
+        row = self._encode([bet])
+        position = np.searchsorted(self._sort_keys(self.columns), self._sort_keys(row)[0], side="right")
+        self.columns = {name: np.insert(values, position, row[name]) for name, values in self.columns.items()}
+        self.bet_ids.add(bet["bet_id"])
+
+    def select(self, query: dict):
+        """Rows matching a build_analytics_query filter, as a slice or index array"""
+        date_range = query.get("date", {})
+        if "$gte" in date_range:
+            low = bisect_left(self.dates, date_range["$gte"])
+        else:
+            # A date bound excludes bets without a date
+            low = 0 if date_range else -1
+        if "$lte" in date_range:
+            high = bisect_right(self.dates, date_range["$lte"])
+        elif "$lt" in date_range:
+            high = bisect_left(self.dates, date_range["$lt"])
+        else:
+            high = len(self.dates)
+
+        dates = self.columns["date"]
+        start = int(np.searchsorted(dates, low, side="left"))
+        end = max(start, int(np.searchsorted(dates, high, side="left")))
+        if "sport" not in query:
+            return slice(start, end)
+
+        code = self.label_codes["sport"].get(query["sport"])
+        if code is None:
+            return np.empty(0, dtype=np.intp)
+        return start + np.flatnonzero(self.columns["sport"][start:end] == code)
+
+    def stats(self, rows) -> dict:
+        """compute_stats over the selected rows"""
+        status = self.columns["status"][rows]
+        counts = np.bincount(status, minlength=OTHER_STATUS + 1)
+
+        # Streaks are runs in the won/lost sequence; push and pending are skipped
+        won, lost = STATUS_CODES["won"], STATUS_CODES["lost"]
+        settled = np.compress((status == won) | (status == lost), status)
+        current_streak, current_streak_type = 0, None
+        best_win_streak = worst_loss_streak = 0
+        if len(settled):
+            starts = np.flatnonzero(np.concatenate(([True], settled[1:] != settled[:-1])))
+            lengths = np.diff(np.append(starts, len(settled)))
+            kinds = settled[starts]
+            current_streak = int(lengths[-1])
+            current_streak_type = BET_STATUSES[kinds[-1]]
+            best_win_streak = int(lengths[kinds == won].max(initial=0))
+            worst_loss_streak = int(lengths[kinds == lost].max(initial=0))
+
+        return stats_response(
+            len(status),
+            float(self.columns["stake"][rows].sum()),
+            float(self.columns["result"][rows].sum()),
+            {name: int(counts[code]) for name, code in STATUS_CODES.items()},
+            current_streak, current_streak_type, best_win_streak, worst_loss_streak)
+
+    def chart(self, rows) -> List[dict]:
+        """build_chart over the selected rows, one point per day"""
+        dates = self.columns["date"][rows]
+        if not len(dates):
+            return []
+
+        # Rows are in date order, so each day is a contiguous run
+        starts = np.flatnonzero(np.concatenate(([True], dates[1:] != dates[:-1])))
+        daily_pl = np.add.reduceat(self.columns["result"][rows], starts)
+        daily_stake = np.add.reduceat(self.columns["stake"][rows], starts)
+        bets = np.diff(np.append(starts, len(dates)))
+
+        return [
+            {
+                "date": self.dates[code] if code >= 0 else None,
+                "daily_pl": pl,
+                "daily_stake": stake,
+                "cumulative_pl": cumulative_pl,
+                "cumulative_stake": cumulative_stake,
+                "bets": count
+            }
+            for code, pl, stake, cumulative_pl, cumulative_stake, count in zip(
+                dates[starts].tolist(), daily_pl.tolist(), daily_stake.tolist(),
+                np.cumsum(daily_pl).tolist(), np.cumsum(daily_stake).tolist(), bets.tolist())
+        ]
+
+    def group(self, section: str, rows, odds_edges=ODDS_BUCKET_EDGES) -> List[dict]:
+        """One GROUP_SECTIONS section over the selected rows"""
+        stake = self.columns["stake"][rows]
+        result = self.columns["result"][rows]
+        status = self.columns["status"][rows]
+
+        if section == "odds_range":
+            odds = self.columns["odds"][rows]
+            buckets = odds_buckets(odds_edges)
+            names = [bucket["name"] for bucket in buckets]
+            # Bucket index = number of edges below the odds, so odds equal
+            # to an edge stay in the bucket below it. A few whole-array
+            # comparisons beat a binary search per bet for short edge lists.
+            if len(odds_edges) <= 16:
+                codes = np.zeros(len(odds), dtype=np.intp)
+                for edge in odds_edges:
+                    codes += odds > edge
+            else:
+                codes = np.searchsorted(np.asarray(odds_edges, dtype=np.float64), odds, side="left")
+            priced = ~np.isnan(odds)
+            if not priced.all():
+                codes, stake, result, status = (
+                    np.compress(priced, values) for values in (codes, stake, result, status))
+        else:
+            column = GROUP_COLUMNS[section]
+            names = self.labels[column]
+            codes = self.columns[column][rows]
+
+        size = len(names)
+        bets = np.bincount(codes, minlength=size)
+        stakes = np.bincount(codes, weights=stake, minlength=size)
+        profit_loss = np.bincount(codes, weights=result, minlength=size)
+        by_status = np.bincount(
+            codes * (OTHER_STATUS + 1) + status, minlength=size * (OTHER_STATUS + 1)
+        ).reshape(size, OTHER_STATUS + 1)
+
+        # Plain lists; indexing NumPy arrays per group is slow for fine buckets
+        bets, stakes, profit_loss, by_status = (
+            values.tolist() for values in (bets, stakes, profit_loss, by_status))
+
+        grouped = {}
+        for code in [code for code, count in enumerate(bets) if count]:
+            if section == "odds_range":
+                row = grouped[code] = {**buckets[code], "bets": 0, "stake": 0.0, "profit_loss": 0.0,
+                                       **{status_name: 0 for status_name in BET_STATUSES}}
+            else:
+                name = names[code]
+                if section == "tipsters" and name in (None, ""):
+                    continue
+                if section == "sports" and name in (None, ""):
+                    name = "Unknown"
+                row = grouped.setdefault(name, {
+                    "name": name, "bets": 0, "stake": 0.0, "profit_loss": 0.0,
+                    **{status_name: 0 for status_name in BET_STATUSES}
+                })
+            row["bets"] += bets[code]
+            row["stake"] += stakes[code]
+            row["profit_loss"] += profit_loss[code]
+            for status_name, status_code in STATUS_CODES.items():
+                row[status_name] += by_status[code][status_code]
+
+        return order_group_rows(section, list(grouped.values()))
+
+    def section(self, section: str, rows, odds_edges=ODDS_BUCKET_EDGES):
+        if section in GROUP_SECTIONS:
+            return self.group(section, rows, odds_edges)
+        if section == "chart":
+            return self.chart(rows)
+        return self.stats(rows)
+
+
+class BetSnapshots:
+    """
+    BetSnapshot per user, least recently used evicted once the total row
+    count passes `max_rows`. get() rebuilds a snapshot whose version is not
+    the user's current data version; apply() patches one after a write.
+    """
+
+    def __init__(self, max_rows: int):
+        self.max_rows = max_rows
+        self.snapshots = OrderedDict()
+        self.rows = 0
+        self.flights = SingleFlight()
+        self.hits = 0
+        self.builds = 0
+        self.patches = 0
+
+    async def get(self, user_id: str) -> BetSnapshot:
+        version = await user_versions.get(user_id)
+        snapshot = self.snapshots.get(user_id)
+        if snapshot is not None and snapshot.version == version:
+            self.snapshots.move_to_end(user_id)
+            self.hits += 1
+            return snapshot
+        return await self.flights.do((user_id, version), lambda: self._build(user_id, version))
+
+    async def _build(self, user_id: str, version: int) -> BetSnapshot:
+        bets = await db.bets.find({"user_id": user_id}, SNAPSHOT_PROJECTION).to_list(None)
+        snapshot = BetSnapshot(version, bets)
+        self.builds += 1
+
+        current = self.snapshots.get(user_id)
+        if current is not None and current.version > version:
+            return snapshot
+        self._drop(user_id)
+        self.snapshots[user_id] = snapshot
+        self.rows += len(snapshot)
+        while self.rows > self.max_rows and len(self.snapshots) > 1:
+            _, evicted = self.snapshots.popitem(last=False)
+            self.rows -= len(evicted)
+        return snapshot
+
+    def _drop(self, user_id: str):
+        snapshot = self.snapshots.pop(user_id, None)
+        if snapshot is not None:
+            self.rows -= len(snapshot)
+
+    def apply(self, user_id: str, version: int,
+              old_bet: Optional[dict] = None, new_bet: Optional[dict] = None):
+        """
+        Move the user's snapshot to `version`, the data version returned by
+        the bump for this write, replacing old_bet with new_bet. If another
+        write got in between, the snapshot is dropped and rebuilt on the
+        next read. Patches are keyed by bet_id, so applying a write the
+        snapshot already contains is harmless.
+        """
+        snapshot = self.snapshots.get(user_id)
+        if snapshot is None:
+            return
+        if snapshot.version != version - 1:
+            self._drop(user_id)
+            return
+
+        before = len(snapshot)
+        if old_bet:
+            snapshot.remove(old_bet)
+        if new_bet:
+            snapshot.add(new_bet)
+        snapshot.version = version
+        self.rows += len(snapshot) - before
+        self.patches += 1
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self.snapshots),
+            "rows": self.rows,
+            "max_rows": self.max_rows,
+            "hits": self.hits,
+            "builds": self.builds,
+            "patches": self.patches
+        }
+
+
+bet_snapshots = BetSnapshots(BET_SNAPSHOT_MAX_ROWS)
+
+
+async def analytics_section(section: str, user_id: str, odds_edges=ODDS_BUCKET_EDGES,
+                            odds_quantiles: Optional[int] = None, **filters):
+    """
+    One analytics section for the bets matching `filters`. odds_range
+    groups by `odds_edges`, or into `odds_quantiles` buckets of about equal
+    size when given.
+    """
+    query = build_analytics_query(user_id, **filters)
+    if BET_SNAPSHOTS:
+        snapshot = await bet_snapshots.get(user_id)
+        rows = snapshot.select(query)
+        if section == "odds_range" and odds_quantiles:
+            odds = snapshot.columns["odds"][rows]
+            odds_edges = quantile_odds_edges(np.sort(odds[~np.isnan(odds)]), odds_quantiles)
+        return snapshot.section(section, rows, odds_edges)
+    if section in GROUP_SECTIONS:
+        if section == "odds_range" and odds_quantiles:
+            bets = await db.bets.find(query, {"_id": 0, "odds": 1}).to_list(None)
+            odds_edges = quantile_odds_edges(
+                sorted(bet["odds"] for bet in bets if bet.get("odds") is not None), odds_quantiles)
+        sections = await aggregate_group_sections(query, sections=(section,), odds_edges=odds_edges)
+        return sections[section]
+    if section == "chart":
+        return build_chart(await fetch_daily_totals(query))
+    return compute_stats(await fetch_analytics_bets(query))
+
+# Analytics Routes
+
+
+@api_router.get("/analytics/summary")
+async def get_analytics_summary(
     request: Request,
-    days: int = 30,
+    response: Response,
+    days: int = None,
     start_date: str = None,
     end_date: str = None,
     sport: str = None
 ):
+    """
+    All analytics sections for the Analytics page, computed from the user's
+    bet snapshot. Without NumPy: stats from one ordered scan of the filtered
+    bets, the chart from daily_rollups, and bookmakers, tipsters, sports and
+    odds_range from one $facet aggregation.
+    """
     user_id = await get_current_user(request)
+    not_modified = await check_data_etag(request, response, user_id)
+    if not_modified:
+        return not_modified
+
+    query = build_analytics_query(
+        user_id, days=days, start_date=start_date, end_date=end_date, sport=sport)
+
+    # The query pins the date range, so "last N days" rolls over at midnight
+    cache_key = user_cache_key(
+        user_id, await user_versions.get(user_id), "summary", json.dumps(query, sort_keys=True))
+    summary = await user_data_cache.get(cache_key)
+    if summary is not None:
+        return summary
+
+    # The sports breakdown ignores the sport filter (it feeds the sport
+    # picker), so the aggregation matches without it and the other
+    # groupings re-apply it per facet
+    group_query = build_analytics_query(
+        user_id, days=days, start_date=start_date, end_date=end_date)
+    section_match = {}
+    if "sport" in query:
+        section_match = {section: {"sport": query["sport"]}
+                         for section in GROUP_SECTIONS if section != "sports"}
+
+    if BET_SNAPSHOTS:
+        snapshot = await bet_snapshots.get(user_id)
+        rows = snapshot.select(query)
+        group_rows = snapshot.select(group_query)
+        summary = {
+            "stats": snapshot.stats(rows),
+            "chart": snapshot.chart(rows),
+            **{section: snapshot.group(section, group_rows if section == "sports" else rows)
+               for section in GROUP_SECTIONS}
+        }
+    else:
+        bets, daily_totals, groups = await asyncio.gather(
+            fetch_analytics_bets(query),
+            fetch_daily_totals(query),
+            aggregate_group_sections(group_query, section_match=section_match)
+        )
+        summary = {
+            "stats": compute_stats(bets),
+            "chart": build_chart(daily_totals),
+            **groups
+        }
+    await user_data_cache.set(cache_key, summary)
+    return summary
 
-    # Build query
-    query = {"user_id": user_id}
-
-    # Date filtering
-    if days and days != -1:
-        end = datetime.now(timezone.utc)
-        start = end - timedelta(days=days)
-        query["date"] = {"$gte": start.strftime("%Y-%m-%d")}
-    elif start_date and end_date:
-        query["date"] = {"$gte": start_date, "$lte": end_date}
 
-    # Sport filtering
-    if sport and sport != "all":
-        query["sport"] = sport
+@api_router.get("/analytics/dashboard")
+async def get_dashboard_summary(request: Request, response: Response, chart_days: int = 30, recent_limit: int = 10):
+    """
+    Dashboard bundle: all-time stats, the last `chart_days` of chart data
+    (from the bet snapshot, or daily_rollups without NumPy) and the most
+    recent bets, read concurrently.
+    """
+    user_id = await get_current_user(request)
+    not_modified = await check_data_etag(request, response, user_id)
+    if not_modified:
+        return not_modified
+    chart_query = build_analytics_query(user_id, days=chart_days)
+
+    cache_key = user_cache_key(
+        user_id, await user_versions.get(user_id), "dashboard",
+        json.dumps(chart_query, sort_keys=True), recent_limit)
+    dashboard = await user_data_cache.get(cache_key)
+    if dashboard is not None:
+        return dashboard
+
+    if BET_SNAPSHOTS:
+        snapshot, recent_bets = await asyncio.gather(
+            bet_snapshots.get(user_id),
+            _fetch_recent_bets(user_id, recent_limit)
+        )
+        dashboard = {
+            "stats": snapshot.stats(snapshot.select(build_analytics_query(user_id))),
+            "chart": snapshot.chart(snapshot.select(chart_query)),
+            "recent_bets": recent_bets
+        }
+    else:
+        all_bets, daily_totals, recent_bets = await asyncio.gather(
+            fetch_analytics_bets(build_analytics_query(user_id)),
+            fetch_daily_totals(chart_query),
+            _fetch_recent_bets(user_id, recent_limit)
+        )
+        dashboard = {
+            "stats": compute_stats(all_bets),
+            "chart": build_chart(daily_totals),
+            "recent_bets": recent_bets
+        }
+    await user_data_cache.set(cache_key, dashboard)
+    return dashboard
 
-    # Fetch bets
-    bets = await db.bets.find(query, {"_id": 0}).sort("date", 1).to_list(10000)
 
-    daily_data = {}
-    chart_data = []
-    cumulative_pl = 0
-    cumulative_stake = 0
+@api_router.get("/analytics/stats")
+async def get_stats(
+    request: Request,
+    response: Response,
+    days: int = None,
+    start_date: str = None,
+    end_date: str = None,
+    sport: str = None
+):
+    user_id = await get_current_user(request)
+    not_modified = await check_data_etag(request, response, user_id)
+    if not_modified:
+        return not_modified
+    return await analytics_section(
+        "stats", user_id, days=days, start_date=start_date, end_date=end_date, sport=sport)
 
-    for bet in bets:
-        date = bet["date"]
-        if date not in daily_data:
-            daily_data[date] = {"date": date,
-                                "daily_pl": 0, "daily_stake": 0, "cumulative_pl": 0, "cumulative_stake": 0, "bets": 0}
-
-        daily_data[date]["daily_pl"] += bet["result"]
-        daily_data[date]["daily_stake"] += bet["stake"]
-    for date in sorted(daily_data.keys()):
-        cumulative_pl += daily_data[date]["daily_pl"]
-        cumulative_stake += daily_data[date]["daily_stake"]
-        daily_data[date]["cumulative_pl"] = cumulative_pl
-        daily_data[date]["cumulative_stake"] = cumulative_stake
-        chart_data.append(daily_data[date])
 
-    return chart_data
+@api_router.get("/analytics/chart")
+async def get_chart_data(
+    request: Request,
+    response: Response,
+    days: int = 30,
+    start_date: str = None,
+    end_date: str = None,
+    sport: str = None
+):
+    user_id = await get_current_user(request)
+    not_modified = await check_data_etag(request, response, user_id)
+    if not_modified:
+        return not_modified
+    return await analytics_section(
+        "chart", user_id, days=days, start_date=start_date, end_date=end_date, sport=sport)
 
 
 @api_router.get("/analytics/calendar")
-async def get_calendar_data(request: Request, year: int, month: int):
+async def get_calendar_data(request: Request, response: Response, year: int, month: int):
     user_id = await get_current_user(request)
+    not_modified = await check_data_etag(request, response, user_id)
+    if not_modified:
+        return not_modified
 
     start_date = f"{year}-{month:02d}-01"
     if month == 12:
@@ -1043,320 +2945,183 @@ async def get_calendar_data(request: Request, year: int, month: int):
     else:
         end_date = f"{year}-{month + 1:02d}-01"
 
-    bets = await db.bets.find({
+    daily_totals = await fetch_daily_totals({
         "user_id": user_id,
         "date": {"$gte": start_date, "$lt": end_date}
-    }, {"_id": 0}).to_list(10000)
-
-    daily_data = {}
-    for bet in bets:
-        date = bet["date"]
-        if date not in daily_data:
-            daily_data[date] = {"profit_loss": 0,
-                                "bets": 0, "won": 0, "lost": 0}
-
-        daily_data[date]["profit_loss"] += bet["result"]
-        daily_data[date]["bets"] += 1
-        if bet["status"] == "won":
-            daily_data[date]["won"] += 1
-        elif bet["status"] == "lost":
-            daily_data[date]["lost"] += 1
+    })
 
-    return [{"date": date, **data} for date, data in sorted(daily_data.items())]
+    return [
+        {
+            "date": day["date"],
+            "profit_loss": day["profit_loss"],
+            "bets": day["bets"],
+            "won": day["won"],
+            "lost": day["lost"]
+        }
+        for day in daily_totals
+    ]
 
 
-@api_router.get("/analytics/bookmakers")
-async def get_bookmaker_analytics(
+@api_router.get("/analytics/periods")
+async def get_period_analytics(
     request: Request,
+    response: Response,
+    period: str = "week",
     days: int = None,
     start_date: str = None,
     end_date: str = None,
     sport: str = None
 ):
+    """
+    P/L, stake and win rate grouped by ISO week, month or year,
+    aggregated from daily_rollups.
+    """
     user_id = await get_current_user(request)
+    not_modified = await check_data_etag(request, response, user_id)
+    if not_modified:
+        return not_modified
 
-    # Build query
-    query = {"user_id": user_id}
-    if days and days != -1:
-        end = datetime.now(timezone.utc)
-        start = end - timedelta(days=days)
-        query["date"] = {"$gte": start.strftime("%Y-%m-%d")}
-    elif start_date and end_date:
-        query["date"] = {"$gte": start_date, "$lte": end_date}
-    if sport and sport != "all":
-        query["sport"] = sport
+    if period not in ("week", "month", "year"):
+        raise HTTPException(status_code=400, detail="Invalid period")
 
-    bets = await db.bets.find(query, {"_id": 0}).to_list(10000)
+    query = build_analytics_query(
+        user_id, days=days, start_date=start_date, end_date=end_date, sport=sport)
+    daily_totals = await fetch_daily_totals(query)
 
-    bookie_stats = {}
-    for bet in bets:
-        bookie = bet.get("bookie", "Unknown")
-        if bookie not in bookie_stats:
-            bookie_stats[bookie] = {
-                "name": bookie,
+    period_stats = {}
+    for day in daily_totals:
+        date = day["date"] or ""
+        if period == "week":
+            try:
+                iso_year, iso_week, _ = datetime.strptime(
+                    date, "%Y-%m-%d").isocalendar()
+            except ValueError:
+                continue
+            key = f"{iso_year}-W{iso_week:02d}"
+        elif period == "month":
+            key = date[:7]
+        else:
+            key = date[:4]
+
+        if key not in period_stats:
+            period_stats[key] = {
+                "name": key,
                 "bets": 0,
                 "stake": 0,
                 "profit_loss": 0,
-                "won": 0,
-                "lost": 0,
-                "push": 0,
-                "pending": 0
+                **{status: 0 for status in BET_STATUSES}
             }
+        for field in ("bets", "stake", "profit_loss") + BET_STATUSES:
+            period_stats[key][field] += day[field]
 
-        bookie_stats[bookie]["bets"] += 1
-        bookie_stats[bookie]["stake"] += bet["stake"]
-        bookie_stats[bookie]["profit_loss"] += bet["result"]
+    return [_finalize_group_stats(period_stats[key]) for key in sorted(period_stats)]
 
-        status = bet["status"]
-        if status == "won":
-            bookie_stats[bookie]["won"] += 1
-        elif status == "lost":
-            bookie_stats[bookie]["lost"] += 1
-        elif status == "push":
-            bookie_stats[bookie]["push"] += 1
-        elif status == "pending":
-            bookie_stats[bookie]["pending"] += 1
 
-    # Calculate win rate and ROI for each bookie
-    result = []
-    for bookie, stats in bookie_stats.items():
-        total_settled = stats["won"] + stats["lost"]
-        stats["win_rate"] = (stats["won"] / total_settled *
-                             100) if total_settled > 0 else 0
-        stats["roi"] = (stats["profit_loss"] / stats["stake"]
-                        * 100) if stats["stake"] > 0 else 0
-        result.append(stats)
-
-    return sorted(result, key=lambda x: x["profit_loss"], reverse=True)
+@api_router.get("/analytics/bookmakers")
+async def get_bookmaker_analytics(
+    request: Request,
+    response: Response,
+    days: int = None,
+    start_date: str = None,
+    end_date: str = None,
+    sport: str = None
+):
+    user_id = await get_current_user(request)
+    not_modified = await check_data_etag(request, response, user_id)
+    if not_modified:
+        return not_modified
+    return await analytics_section(
+        "bookmakers", user_id, days=days, start_date=start_date, end_date=end_date, sport=sport)
 
 
 @api_router.get("/analytics/tipsters")
 async def get_tipster_analytics(
     request: Request,
+    response: Response,
     days: int = None,
     start_date: str = None,
     end_date: str = None,
     sport: str = None
 ):
     user_id = await get_current_user(request)
-
-    # Build query
-    query = {"user_id": user_id}
-    if days and days != -1:
-        end = datetime.now(timezone.utc)
-        start = end - timedelta(days=days)
-        query["date"] = {"$gte": start.strftime("%Y-%m-%d")}
-    elif start_date and end_date:
-        query["date"] = {"$gte": start_date, "$lte": end_date}
-    if sport and sport != "all":
-        query["sport"] = sport
-
-    bets = await db.bets.find(query, {"_id": 0}).to_list(10000)
-
-    tipster_stats = {}
-    for bet in bets:
-        tipster = bet.get("tipster", "")
-        if not tipster:
-            continue
-
-        if tipster not in tipster_stats:
-            tipster_stats[tipster] = {
-                "name": tipster,
-                "bets": 0,
-                "stake": 0,
-                "profit_loss": 0,
-                "won": 0,
-                "lost": 0,
-                "push": 0,
-                "pending": 0
-            }
-
-        tipster_stats[tipster]["bets"] += 1
-        tipster_stats[tipster]["stake"] += bet["stake"]
-        tipster_stats[tipster]["profit_loss"] += bet["result"]
-
-        status = bet["status"]
-        if status == "won":
-            tipster_stats[tipster]["won"] += 1
-        elif status == "lost":
-            tipster_stats[tipster]["lost"] += 1
-        elif status == "push":
-            tipster_stats[tipster]["push"] += 1
-        elif status == "pending":
-            tipster_stats[tipster]["pending"] += 1
-
-    # Calculate win rate and ROI for each tipster
-    result = []
-    for tipster, stats in tipster_stats.items():
-        total_settled = stats["won"] + stats["lost"]
-        stats["win_rate"] = (stats["won"] / total_settled *
-                             100) if total_settled > 0 else 0
-        stats["roi"] = (stats["profit_loss"] / stats["stake"]
-                        * 100) if stats["stake"] > 0 else 0
-        result.append(stats)
-
-    return sorted(result, key=lambda x: x["profit_loss"], reverse=True)
+    not_modified = await check_data_etag(request, response, user_id)
+    if not_modified:
+        return not_modified
+    return await analytics_section(
+        "tipsters", user_id, days=days, start_date=start_date, end_date=end_date, sport=sport)
 
 
 @api_router.get("/analytics/sports")
 async def get_sport_analytics(
     request: Request,
+    response: Response,
     days: int = None,
     start_date: str = None,
     end_date: str = None
 ):
     user_id = await get_current_user(request)
-
-    # Build query
-    query = {"user_id": user_id}
-    if days and days != -1:
-        end = datetime.now(timezone.utc)
-        start = end - timedelta(days=days)
-        query["date"] = {"$gte": start.strftime("%Y-%m-%d")}
-    elif start_date and end_date:
-        query["date"] = {"$gte": start_date, "$lte": end_date}
-
-    bets = await db.bets.find(query, {"_id": 0}).to_list(10000)
-
-    sport_stats = {}
-    for bet in bets:
-        sport = bet.get("sport", "Unknown")
-        if not sport:
-            sport = "Unknown"
-
-        if sport not in sport_stats:
-            sport_stats[sport] = {
-                "name": sport,
-                "bets": 0,
-                "stake": 0,
-                "profit_loss": 0,
-                "won": 0,
-                "lost": 0,
-                "push": 0,
-                "pending": 0
-            }
-
-        sport_stats[sport]["bets"] += 1
-        sport_stats[sport]["stake"] += bet["stake"]
-        sport_stats[sport]["profit_loss"] += bet["result"]
-
-        status = bet["status"]
-        if status == "won":
-            sport_stats[sport]["won"] += 1
-        elif status == "lost":
-            sport_stats[sport]["lost"] += 1
-        elif status == "push":
-            sport_stats[sport]["push"] += 1
-        elif status == "pending":
-            sport_stats[sport]["pending"] += 1
-
-    result = []
-    for sport, stats in sport_stats.items():
-        total_settled = stats["won"] + stats["lost"]
-        stats["win_rate"] = (stats["won"] / total_settled *
-                             100) if total_settled > 0 else 0
-        stats["roi"] = (stats["profit_loss"] / stats["stake"]
-                        * 100) if stats["stake"] > 0 else 0
-        result.append(stats)
-
-    return sorted(result, key=lambda x: x["profit_loss"], reverse=True)
+    not_modified = await check_data_etag(request, response, user_id)
+    if not_modified:
+        return not_modified
+    return await analytics_section(
+        "sports", user_id, days=days, start_date=start_date, end_date=end_date)
 
 
 @api_router.get("/analytics/odds-range")
 async def get_odds_range_analytics(
     request: Request,
+    response: Response,
     days: int = None,
     start_date: str = None,
     end_date: str = None,
-    sport: str = None
+    sport: str = None,
+    edges: str = None,
+    buckets: int = None
 ):
+    """
+    Stats per odds bucket. `edges` is a comma-separated list of bucket
+    edges (default 1.5,2,3,5); `buckets` instead splits the bets into that
+    many buckets of about equal size at odds quantiles.
+    """
     user_id = await get_current_user(request)
+    not_modified = await check_data_etag(request, response, user_id)
+    if not_modified:
+        return not_modified
 
-    # Build query
-    query = {"user_id": user_id}
-    if days and days != -1:
-        end = datetime.now(timezone.utc)
-        start = end - timedelta(days=days)
-        query["date"] = {"$gte": start.strftime("%Y-%m-%d")}
-    elif start_date and end_date:
-        query["date"] = {"$gte": start_date, "$lte": end_date}
-    if sport and sport != "all":
-        query["sport"] = sport
+    if buckets is not None and not 1 <= buckets <= MAX_ODDS_BUCKETS:
+        raise HTTPException(status_code=400, detail="Invalid number of buckets")
+    odds_edges = parse_odds_edges(edges) if edges else ODDS_BUCKET_EDGES
 
-    bets = await db.bets.find(query, {"_id": 0}).to_list(10000)
+    return await analytics_section(
+        "odds_range", user_id, odds_edges=odds_edges, odds_quantiles=buckets,
+        days=days, start_date=start_date, end_date=end_date, sport=sport)
 
-    ranges = [
-        {"name": "1.00-1.50", "min": 1.0, "max": 1.5},
-        {"name": "1.51-2.00", "min": 1.51, "max": 2.0},
-        {"name": "2.01-3.00", "min": 2.01, "max": 3.0},
-        {"name": "3.01-5.00", "min": 3.01, "max": 5.0},
-        {"name": "5.01+", "min": 5.01, "max": float('inf')}
-    ]
 
-    odds_stats = {}
-    for range_info in ranges:
-        odds_stats[range_info["name"]] = {
-            "name": range_info["name"],
-            "bets": 0,
-            "stake": 0,
-            "profit_loss": 0,
-            "won": 0,
-            "lost": 0,
-            "push": 0,
-            "pending": 0
-        }
-
-    for bet in bets:
-        odds = bet["odds"]
-        for range_info in ranges:
-            if range_info["min"] <= odds <= range_info["max"]:
-                range_name = range_info["name"]
-                odds_stats[range_name]["bets"] += 1
-                odds_stats[range_name]["stake"] += bet["stake"]
-                odds_stats[range_name]["profit_loss"] += bet["result"]
-
-                status = bet["status"]
-                if status == "won":
-                    odds_stats[range_name]["won"] += 1
-                elif status == "lost":
-                    odds_stats[range_name]["lost"] += 1
-                elif status == "push":
-                    odds_stats[range_name]["push"] += 1
-                elif status == "pending":
-                    odds_stats[range_name]["pending"] += 1
-                break
-
-    result = []
-    for range_name, stats in odds_stats.items():
-        if stats["bets"] > 0:  # Only include ranges with bets
-            total_settled = stats["won"] + stats["lost"]
-            stats["win_rate"] = (
-                stats["won"] / total_settled * 100) if total_settled > 0 else 0
-            stats["roi"] = (stats["profit_loss"] / stats["stake"]
-                            * 100) if stats["stake"] > 0 else 0
-            result.append(stats)
-
-    return result
-
-
-@api_router.get("/bets/recent")
-async def get_recent_bets(request: Request, limit: int = 10):
-    user_id = await get_current_user(request)
-
-    bets = await db.bets.find(
+async def _fetch_recent_bets(user_id: str, limit: int) -> List[dict]:
+    return await db.bets.find(
         {"user_id": user_id},
         {"_id": 0}
     ).sort([("date", -1), ("time", -1)]).limit(limit).to_list(limit)
 
-    return bets
+
+@api_router.get("/bets/recent")
+async def get_recent_bets(request: Request, response: Response, limit: int = 10):
+    user_id = await get_current_user(request)
+    not_modified = await check_data_etag(request, response, user_id)
+    if not_modified:
+        return not_modified
+    return await _fetch_recent_bets(user_id, limit)
 
 
 # Bookmaker Routes
 
 
 @api_router.get("/bookmakers", response_model=List[Bookmaker])
-async def get_bookmakers(request: Request):
+async def get_bookmakers(request: Request, response: Response):
     user_id = await get_current_user(request)
+    not_modified = await check_data_etag(request, response, user_id)
+    if not_modified:
+        return not_modified
     bookmakers = await db.bookmakers.find({"user_id": user_id}, {"_id": 0}).to_list(1000)
     return bookmakers
 
@@ -1378,6 +3143,7 @@ async def create_bookmaker(request: Request, bookmaker_input: BookmakerCreate):
     }
 
     await db.bookmakers.insert_one(bookmaker_dict)
+    bet_snapshots.apply(user_id, await user_versions.bump(user_id))
 
     bookmaker_doc = await db.bookmakers.find_one({"bookmaker_id": bookmaker_id}, {"_id": 0})
     return bookmaker_doc
@@ -1390,6 +3156,7 @@ async def delete_bookmaker(request: Request, bookmaker_id: str):
     result = await db.bookmakers.delete_one({"bookmaker_id": bookmaker_id, "user_id": user_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Bookmaker not found")
+    bet_snapshots.apply(user_id, await user_versions.bump(user_id))
 
     return {"message": "Bookmaker deleted"}
 
@@ -1397,8 +3164,11 @@ async def delete_bookmaker(request: Request, bookmaker_id: str):
 
 
 @api_router.get("/tipsters", response_model=List[Tipster])
-async def get_tipsters(request: Request):
+async def get_tipsters(request: Request, response: Response):
     user_id = await get_current_user(request)
+    not_modified = await check_data_etag(request, response, user_id)
+    if not_modified:
+        return not_modified
     tipsters = await db.tipsters.find({"user_id": user_id}, {"_id": 0}).to_list(1000)
     return tipsters
 
@@ -1415,32 +3185,130 @@ async def create_tipster(request: Request, tipster_input: TipsterCreate):
     tipster_dict = {
         "tipster_id": tipster_id,
         "user_id": user_id,
-        "name": tipster_input.name,
+        "name": tipster_input.name,
+        "created_at": datetime.now(timezone.utc)
+    }
+
+    await db.tipsters.insert_one(tipster_dict)
+    bet_snapshots.apply(user_id, await user_versions.bump(user_id))
+
+    tipster_doc = await db.tipsters.find_one({"tipster_id": tipster_id}, {"_id": 0})
+    return tipster_doc
+
+
+@api_router.delete("/tipsters/{tipster_id}")
+async def delete_tipster(request: Request, tipster_id: str):
+    user_id = await get_current_user(request)
+
+    result = await db.tipsters.delete_one({"tipster_id": tipster_id, "user_id": user_id})
+    if result.deleted_count == 0:
+        raise HTTPException(status_code=404, detail="Tipster not found")
+    bet_snapshots.apply(user_id, await user_versions.bump(user_id))
+
+    return {"message": "Tipster deleted"}
+
+# Import/Export Routes
+
+
+# Rows inserted per insert_many call during CSV import
+IMPORT_BATCH_SIZE = 500
+
+# Concurrent TheSportsDB lookups while detecting sports for an import batch
+IMPORT_SPORT_CONCURRENCY = 8
+
+# Per-row errors returned in the import report (the count is always exact)
+IMPORT_MAX_REPORTED_ERRORS = 1000
+
+
+def parse_import_row(user_id: str, row: dict) -> dict:
+    """Build a bet document (without sport) from one CSV row"""
+    bet_id = f"bet_{uuid.uuid4().hex[:12]}"
+    stake = float(row.get("STAKE", "0").strip('"'))
+    odds = float(row.get("ODDS", "1").strip('"'))
+    raw_status = row.get("STATUS", "pending").strip('"').lower()
+    result_value = float(row.get("RESULT", "0").strip('"'))
+
+    # Map status values
+    if raw_status == "pushed":
+        status = "push"
+    elif raw_status == "cashed out":
+        status = "lost"  # Treat cashed out as lost since result is negative
+    else:
+        status = raw_status
+
+    return {
+        "bet_id": bet_id,
+        "user_id": user_id,
+        "date": row.get("DATE", "").strip('"'),
+        "time": row.get("TIME", "").strip('"'),
+        "game": row.get("GAME", "").strip('"'),
+        "bet": row.get("BET", "").strip('"'),
+        "stake": stake,
+        "odds": odds,
+        "status": status,
+        "result": result_value,
+        "bookie": row.get("BOOKIE", "").strip('"') or None,
+        "tipster": row.get("TIPSTER", "").strip('"') or None,
+        "sport": None,
         "created_at": datetime.now(timezone.utc)
     }
 
-    await db.tipsters.insert_one(tipster_dict)
 
-    tipster_doc = await db.tipsters.find_one({"tipster_id": tipster_id}, {"_id": 0})
-    return tipster_doc
+async def detect_sports_concurrently(games: List[str]) -> dict:
+    """Detect the sport of each distinct game name with bounded concurrency"""
+    semaphore = asyncio.Semaphore(IMPORT_SPORT_CONCURRENCY)
 
+    async def detect(game: str) -> str:
+        async with semaphore:
+            return await detect_sport_from_game_async(game)
 
-@api_router.delete("/tipsters/{tipster_id}")
-async def delete_tipster(request: Request, tipster_id: str):
-    user_id = await get_current_user(request)
+    distinct_games = list(dict.fromkeys(games))
+    sports = await asyncio.gather(*(detect(game) for game in distinct_games))
+    return dict(zip(distinct_games, sports))
 
-    result = await db.tipsters.delete_one({"tipster_id": tipster_id, "user_id": user_id})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Tipster not found")
 
-    return {"message": "Tipster deleted"}
+async def write_import_batch(batch: List[tuple], errors: List[dict], deltas: dict) -> int:
+    """
+    Detect sports for a batch of (line, bet) pairs and insert it with one
+    unordered insert_many. Failed rows are added to `errors`; returns the
+    number of bets inserted.
+    """
+    sports = await detect_sports_concurrently([bet["game"] for _, bet in batch])
+    for _, bet in batch:
+        bet["sport"] = sports[bet["game"]]
 
-# Import/Export Routes
+    failed = set()
+    try:
+        await db.bets.insert_many([bet for _, bet in batch], ordered=False)
+    except BulkWriteError as e:
+        for write_error in e.details.get("writeErrors", []):
+            index = write_error["index"]
+            failed.add(index)
+            errors.append(
+                {"line": batch[index][0], "error": write_error.get("errmsg", "Write failed")})
+
+    inserted = 0
+    for index, (_, bet) in enumerate(batch):
+        if index in failed:
+            continue
+        merge_rollup_deltas(deltas, rollup_deltas(new_bet=bet))
+        inserted += 1
+    return inserted
 
 
-@api_router.post("/bets/import")
-async def import_bets(request: Request):
-    user_id = await get_current_user(request)
+async def open_import_csv(request: Request):
+    """
+    Text stream for the uploaded CSV. Accepts a multipart upload in the
+    `file` field (read lazily from Starlette's spooled temp file) or the
+    legacy JSON body {"csv_data": "..."}.
+    """
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=400, detail="file required")
+        return io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
 
     body = await request.json()
     csv_data = body.get("csv_data")
@@ -1448,53 +3316,149 @@ async def import_bets(request: Request):
     if not csv_data:
         raise HTTPException(status_code=400, detail="csv_data required")
 
-    csv_reader = csv.DictReader(io.StringIO(csv_data), delimiter=';')
+    return io.StringIO(csv_data)
+
+
+@api_router.post("/bets/import")
+async def import_bets(request: Request):
+    """
+    Import bets from a semicolon-separated CSV export.
+
+    Rows are parsed as a stream and written in batches of IMPORT_BATCH_SIZE;
+    sports are detected concurrently per batch. Returns the number of bets
+    imported plus a per-row error report keyed by CSV line number.
+    """
+    user_id = await get_current_user(request)
+
+    csv_stream = await open_import_csv(request)
+    csv_reader = csv.DictReader(csv_stream, delimiter=';')
+
     imported_count = 0
+    errors = []
+    deltas = {}
+    batch = []
 
-    for row in csv_reader:
-        try:
-            bet_id = f"bet_{uuid.uuid4().hex[:12]}"
-            stake = float(row.get("STAKE", "0").strip('"'))
-            odds = float(row.get("ODDS", "1").strip('"'))
-            raw_status = row.get("STATUS", "pending").strip('"').lower()
-            result_value = float(row.get("RESULT", "0").strip('"'))
-
-            # Map status values
-            if raw_status == "pushed":
-                status = "push"
-            elif raw_status == "cashed out":
-                status = "lost"  # Treat cashed out as lost since result is negative
-            else:
-                status = raw_status
+    try:
+        for row in csv_reader:
+            try:
+                batch.append((csv_reader.line_num, parse_import_row(user_id, row)))
+            except Exception as e:
+                errors.append({"line": csv_reader.line_num, "error": str(e)})
+                continue
 
-            # Auto-detect sport from game name using TheSportsDB API + local patterns
-            game_name = row.get("GAME", "").strip('"')
-            detected_sport = await detect_sport_from_game_async(game_name)
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                imported_count += await write_import_batch(batch, errors, deltas)
+                batch = []
 
-            bet_dict = {
-                "bet_id": bet_id,
-                "user_id": user_id,
-                "date": row.get("DATE", "").strip('"'),
-                "time": row.get("TIME", "").strip('"'),
-                "game": game_name,
-                "bet": row.get("BET", "").strip('"'),
-                "stake": stake,
-                "odds": odds,
-                "status": status,
-                "result": result_value,
-                "bookie": row.get("BOOKIE", "").strip('"') or None,
-                "tipster": row.get("TIPSTER", "").strip('"') or None,
-                "sport": detected_sport,
-                "created_at": datetime.now(timezone.utc)
-            }
+        if batch:
+            imported_count += await write_import_batch(batch, errors, deltas)
+    except (csv.Error, UnicodeDecodeError) as e:
+        errors.append({"line": csv_reader.line_num, "error": f"Unreadable CSV: {e}"})
+    finally:
+        await apply_rollup_deltas(deltas)
+        await user_versions.bump(user_id)
 
-            await db.bets.insert_one(bet_dict)
-            imported_count += 1
-        except Exception as e:
-            logging.error(f"Error importing row: {e}")
+    if errors:
+        logging.warning(
+            f"CSV import for {user_id}: {len(errors)} rows failed, {imported_count} imported")
+
+    errors.sort(key=lambda error: error["line"])
+    return {
+        "imported": imported_count,
+        "failed": len(errors),
+        "errors": errors[:IMPORT_MAX_REPORTED_ERRORS]
+    }
+
+
+def normalize_coolbet_status(raw_status: str) -> Optional[str]:
+    """
+    Normalize a Coolbet status to strictly "won" | "lost" | "pending".
+    Returns None for unknown values.
+    """
+    status = raw_status.strip().lower()
+
+    # Map common Coolbet variants to normalized values
+    if status in ["won", "win", "w", "vunnet"]:
+        return "won"
+    if status in ["lost", "lose", "l", "tapt", "cashed out", "void"]:
+        return "lost"
+    if status in ["open", "live", "pending", "active", "åpen"]:
+        return "pending"
+    return None
+
+
+def coolbet_result_value(status: str, stake: float, odds: float) -> float:
+    if status == "won":
+        return stake * (odds - 1)  # Profit
+    if status == "lost":
+        return -stake  # Loss
+    return 0.0  # Pending
+
+
+# imported_bets statuses that mean the bet is still open. Only used to
+# narrow the resync lookup; normalize_coolbet_status has the final say.
+COOLBET_PENDING_STATUSES = ["open", "live", "pending", "active", "åpen"]
+
+
+def external_id_from_notes(notes: Optional[str]) -> Optional[str]:
+    """Parse the Coolbet ID out of "Imported from Coolbet (ID: coolbet-1430)" """
+    if notes and "ID:" in notes:
+        return notes.split("ID:")[1].strip().rstrip(")") or None
+    return None
+
+
+async def backfill_coolbet_external_ids(user_id: Optional[str] = None) -> int:
+    """
+    Copy the Coolbet ID from `notes` into the external_id/source fields for
+    bets imported before those fields existed. Returns the number of bets
+    linked; bets whose notes carry no ID are left alone. Runs once at
+    startup (COOLBET_IDS_MIGRATION) and from backfill_coolbet_ids.py.
+    """
+    query = {"bookie": "Coolbet", "external_id": {"$exists": False}}
+    if user_id:
+        query["user_id"] = user_id
+
+    linked = 0
+    operations = []
+    async for bet in db.bets.find(query, {"_id": 0, "bet_id": 1, "notes": 1}):
+        external_id = external_id_from_notes(bet.get("notes"))
+        if not external_id:
+            logging.warning(
+                f"Could not extract external_id from bet {bet.get('bet_id')}, skipping"
+            )
             continue
+        operations.append(UpdateOne(
+            {"bet_id": bet["bet_id"]},
+            {"$set": {"external_id": external_id, "source": "coolbet"}}
+        ))
+        if len(operations) >= 1000:
+            await db.bets.bulk_write(operations, ordered=False)
+            linked += len(operations)
+            operations = []
+
+    if operations:
+        await db.bets.bulk_write(operations, ordered=False)
+        linked += len(operations)
 
-    return {"imported": imported_count}
+    return linked
+
+
+async def insert_many_unordered(collection, docs: List[dict]) -> set:
+    """
+    insert_many(ordered=False) that returns the indexes of the documents
+    that failed (e.g. duplicate keys) instead of raising.
+    """
+    try:
+        await collection.insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        failed = set()
+        for write_error in e.details.get("writeErrors", []):
+            if write_error.get("code") != 11000:
+                logging.error(
+                    f"Bulk insert into {collection.name} failed: {write_error.get('errmsg')}")
+            failed.add(write_error["index"])
+        return failed
+    return set()
 
 
 @api_router.post("/bets/import/coolbet", response_model=CoolbetImportResponse)
@@ -1530,30 +3494,41 @@ async def import_coolbet_bets(request: Request, import_data: CoolbetImportReques
     skipped_count = 0
     total_count = len(import_data.bets)
 
-    # Create a compound index for efficient duplicate detection (if not exists)
-    try:
-        await db.imported_bets.create_index(
-            [("user_id", 1), ("external_id", 1), ("source", 1)],
-            unique=True,
-            name="user_external_source_unique"
-        )
-    except Exception:
-        pass  # Index may already exist
+    # One query for every external_id in the payload that is already imported
+    external_ids = list({bet.externalId for bet in import_data.bets})
+    existing_cursor = db.imported_bets.find(
+        {"user_id": user_id, "source": "coolbet",
+            "external_id": {"$in": external_ids}},
+        {"_id": 0, "external_id": 1}
+    )
+    seen_ids = {doc["external_id"] async for doc in existing_cursor}
 
+    new_bets = []
     for bet in import_data.bets:
+        if bet.externalId in seen_ids:
+            # Already imported, or repeated within this payload
+            skipped_count += 1
+            logging.info(
+                f"Skipping duplicate bet: user={user_id}, "
+                f"externalId={bet.externalId}"
+            )
+            continue
+        seen_ids.add(bet.externalId)
+        new_bets.append(bet)
+
+    # Detect sports only for new bets the bookmarklet couldn't classify;
+    # prefer the sport from the bookmarklet (from SVG icon) if available
+    sports = await detect_sports_concurrently([
+        bet.event for bet in new_bets
+        if not (bet.sport and bet.sport != 'unknown')
+    ])
+
+    imported_docs = []
+    bet_docs = []
+    for bet in new_bets:
         try:
-            # ===== STRICT STATUS NORMALIZATION =====
-            # Normalize incoming status to strictly "won" | "lost" | "pending"
-            result_raw = bet.result.strip().lower()
-
-            # Map common Coolbet variants to normalized values
-            if result_raw in ["won", "win", "w", "vunnet"]:
-                result_lower = "won"
-            elif result_raw in ["lost", "lose", "l", "tapt", "cashed out", "void"]:
-                result_lower = "lost"
-            elif result_raw in ["open", "live", "pending", "active", "åpen"]:
-                result_lower = "pending"
-            else:
+            result_lower = normalize_coolbet_status(bet.result)
+            if result_lower is None:
                 # Unknown status - log warning and default to pending
                 logging.warning(
                     f"Unknown result status '{bet.result}' for bet {bet.externalId}, "
@@ -1574,23 +3549,16 @@ async def import_coolbet_bets(request: Request, import_data: CoolbetImportReques
             if placed_at.tzinfo is None:
                 placed_at = placed_at.replace(tzinfo=timezone.utc)
 
-            # Auto-detect sport from event name if not provided
-            # Prefer the sport from bookmarklet (from SVG icon) if available
             if bet.sport and bet.sport != 'unknown':
                 detected_sport = bet.sport
             else:
-                detected_sport = await detect_sport_from_game_async(bet.event)
+                detected_sport = sports[bet.event]
 
-            # Calculate result value based on status
-            if result_lower == "won":
-                result_value = bet.stake * (bet.odds - 1)  # Profit
-            elif result_lower == "lost":
-                result_value = -bet.stake  # Loss
-            else:
-                result_value = 0.0  # Pending
+            result_value = coolbet_result_value(
+                result_lower, bet.stake, bet.odds)
 
             # Prepare bet document for imported_bets collection
-            imported_bet_doc = {
+            imported_docs.append({
                 "user_id": user_id,
                 "source": "coolbet",
                 "external_id": bet.externalId,
@@ -1606,56 +3574,61 @@ async def import_coolbet_bets(request: Request, import_data: CoolbetImportReques
                 "outcome": bet.outcome,
                 "placed_at": placed_at,
                 "imported_at": datetime.now(timezone.utc)
-            }
-
-            # Try to insert into imported_bets (will fail if duplicate)
-            try:
-                await db.imported_bets.insert_one(imported_bet_doc)
-
-                # Also insert into main bets collection for analytics
-                bet_id = f"bet_{uuid.uuid4().hex[:12]}"
-                bet_doc = {
-                    "bet_id": bet_id,
-                    "user_id": user_id,
-                    "date": placed_at.strftime("%Y-%m-%d"),
-                    "time": placed_at.strftime("%H:%M:%S"),
-                    "game": bet.event,
-                    "bet": bet.selection or bet.event,
-                    "stake": bet.stake,
-                    "odds": bet.odds,
-                    "status": result_lower,
-                    "result": result_value,
-                    "bookie": "Coolbet",
-                    "tipster": None,
-                    "sport": detected_sport,
-                    "notes": f"Imported from Coolbet (ID: {bet.externalId})",
-                    "created_at": datetime.now(timezone.utc)
-                }
+            })
 
-                await db.bets.insert_one(bet_doc)
-                imported_count += 1
-
-            except Exception as e:
-                # Check if it's a duplicate key error
-                if "duplicate" in str(e).lower() or "E11000" in str(e):
-                    skipped_count += 1
-                    logging.info(
-                        f"Skipping duplicate bet: user={user_id}, "
-                        f"externalId={bet.externalId}"
-                    )
-                else:
-                    # Re-raise unexpected errors
-                    raise
-
-        except HTTPException:
-            raise
+            # Matching document for the main bets collection (analytics)
+            bet_docs.append({
+                "bet_id": f"bet_{uuid.uuid4().hex[:12]}",
+                "user_id": user_id,
+                "date": placed_at.strftime("%Y-%m-%d"),
+                "time": placed_at.strftime("%H:%M:%S"),
+                "game": bet.event,
+                "bet": bet.selection or bet.event,
+                "stake": bet.stake,
+                "odds": bet.odds,
+                "status": result_lower,
+                "result": result_value,
+                "bookie": "Coolbet",
+                "tipster": None,
+                "sport": detected_sport,
+                "notes": f"Imported from Coolbet (ID: {bet.externalId})",
+                "source": "coolbet",
+                "external_id": bet.externalId,
+                "created_at": datetime.now(timezone.utc)
+            })
         except Exception as e:
             logging.error(
                 f"Error importing Coolbet bet {bet.externalId}: {e}",
                 exc_info=True
             )
             skipped_count += 1
-            continue
+
+    if imported_docs:
+        # imported_bets first: its unique index still rejects bets imported
+        # concurrently since the lookup above
+        failed = await insert_many_unordered(db.imported_bets, imported_docs)
+        for index in failed:
+            logging.info(
+                f"Skipping duplicate bet: user={user_id}, "
+                f"externalId={imported_docs[index]['external_id']}"
+            )
+        bet_docs = [doc for index, doc in enumerate(bet_docs)
+                    if index not in failed]
+        skipped_count += len(failed)
+
+    if bet_docs:
+        failed = await insert_many_unordered(db.bets, bet_docs)
+        skipped_count += len(failed)
+        bet_docs = [doc for index, doc in enumerate(bet_docs)
+                    if index not in failed]
+
+        deltas = {}
+        for bet_doc in bet_docs:
+            merge_rollup_deltas(deltas, rollup_deltas(new_bet=bet_doc))
+        await apply_rollup_deltas(deltas)
+        imported_count = len(bet_docs)
+        if imported_count:
+            await user_versions.bump(user_id)
 
     return CoolbetImportResponse(
         imported=imported_count,
@@ -1691,20 +3664,9 @@ async def resync_coolbet_bets(request: Request):
     """
     user_id = await get_current_user(request)
 
-    updated_count = 0
-    skipped_count = 0
-
     try:
-        # Find all pending Coolbet bets for this user
-        pending_bets_cursor = db.bets.find({
-            "user_id": user_id,
-            "bookie": "Coolbet",
-            "status": "pending"
-        })
-
-        pending_bets = await pending_bets_cursor.to_list(length=None)
-        total_count = len(pending_bets)
-
+        pending_query = {"user_id": user_id, "bookie": "Coolbet", "status": "pending"}
+        total_count = await db.bets.count_documents(pending_query)
         if total_count == 0:
             return CoolbetResyncResponse(
                 updated=0,
@@ -1712,108 +3674,77 @@ async def resync_coolbet_bets(request: Request):
                 total=0
             )
 
-        for bet in pending_bets:
-            try:
-                # Extract external_id from notes field
-                # Format: "Imported from Coolbet (ID: coolbet-1430)"
-                notes = bet.get("notes", "")
-                external_id = None
-
-                if "ID:" in notes:
-                    external_id = notes.split("ID:")[1].strip().rstrip(")")
-
-                if not external_id:
-                    logging.warning(
-                        f"Could not extract external_id from bet {bet.get('bet_id')}, skipping"
-                    )
-                    skipped_count += 1
-                    continue
-
-                # Find corresponding imported_bet
-                imported_bet = await db.imported_bets.find_one({
-                    "user_id": user_id,
-                    "external_id": external_id,
-                    "source": "coolbet"
-                })
-
-                if not imported_bet:
-                    logging.warning(
-                        f"No imported_bet found for external_id {external_id}, skipping"
-                    )
-                    skipped_count += 1
-                    continue
-
-                # Get status from imported_bet
-                new_status = imported_bet.get("result", "pending").lower()
-
-                # Normalize status (in case imported_bets has variants)
-                if new_status in ["won", "win", "w", "vunnet"]:
-                    new_status = "won"
-                elif new_status in ["lost", "lose", "l", "tapt", "cashed out", "void"]:
-                    new_status = "lost"
-                elif new_status in ["open", "live", "pending", "active", "åpen"]:
-                    new_status = "pending"
-                else:
-                    new_status = "pending"
-
-                # If still pending, skip (no update needed)
-                if new_status == "pending":
-                    skipped_count += 1
-                    continue
-
-                # Recalculate result value
-                stake = bet.get("stake", 0)
-                odds = bet.get("odds", 1.0)
-
-                if new_status == "won":
-                    result_value = stake * (odds - 1)  # Profit
-                elif new_status == "lost":
-                    result_value = -stake  # Loss
-                else:
-                    result_value = 0.0  # Pending
-
-                # Update bets collection
-                await db.bets.update_one(
-                    {"bet_id": bet["bet_id"]},
-                    {
-                        "$set": {
-                            "status": new_status,
-                            "result": result_value
-                        }
-                    }
-                )
-
-                # Also update imported_bets to ensure consistency
-                await db.imported_bets.update_one(
-                    {
-                        "user_id": user_id,
-                        "external_id": external_id,
-                        "source": "coolbet"
-                    },
-                    {
-                        "$set": {
-                            "result": new_status
-                        }
-                    }
-                )
+        # Only pending bets whose imported_bets row has settled come back;
+        # bets without an external_id are linked by backfill_coolbet_ids.py
+        # (run once at startup), not here
+        changed_bets = await db.bets.aggregate([
+            {"$match": {**pending_query, "external_id": {"$exists": True}}},
+            {"$lookup": {
+                "from": "imported_bets",
+                "localField": "external_id",
+                "foreignField": "external_id",
+                "as": "imported"
+            }},
+            {"$unwind": "$imported"},
+            {"$match": {
+                "imported.user_id": user_id,
+                "imported.source": "coolbet",
+                "imported.result": {"$nin": COOLBET_PENDING_STATUSES}
+            }},
+            {"$project": {
+                "_id": 0, "bet_id": 1, "user_id": 1, "external_id": 1, "date": 1,
+                "sport": 1, "stake": 1, "odds": 1, "status": 1, "result": 1,
+                "imported_result": "$imported.result"
+            }}
+        ]).to_list(None)
+
+        bet_updates = []
+        imported_updates = []
+        deltas = {}
+        for bet in changed_bets:
+            external_id = bet["external_id"]
+            raw_status = bet.pop("imported_result")
+
+            # Normalize status (in case imported_bets has variants)
+            new_status = normalize_coolbet_status(raw_status) or "pending"
+            if new_status == "pending":
+                continue
 
-                updated_count += 1
-                logging.info(
-                    f"Updated bet {bet['bet_id']} (external_id: {external_id}) "
-                    f"from pending to {new_status}"
-                )
+            result_value = coolbet_result_value(
+                new_status, bet.get("stake", 0), bet.get("odds", 1.0))
+
+            bet_updates.append(UpdateOne(
+                {"bet_id": bet["bet_id"]},
+                {"$set": {"status": new_status, "result": result_value}}
+            ))
+            if raw_status != new_status:
+                # Also store the normalized status on imported_bets
+                imported_updates.append(UpdateOne(
+                    {"user_id": user_id, "external_id": external_id,
+                        "source": "coolbet"},
+                    {"$set": {"result": new_status}}
+                ))
+            merge_rollup_deltas(deltas, rollup_deltas(
+                old_bet=bet,
+                new_bet={**bet, "status": new_status, "result": result_value}
+            ))
+            logging.info(
+                f"Updating bet {bet['bet_id']} (external_id: {external_id}) "
+                f"from pending to {new_status}"
+            )
 
-            except Exception as e:
-                logging.error(
-                    f"Error resyncing bet {bet.get('bet_id')}: {e}",
-                    exc_info=True
-                )
-                skipped_count += 1
-                continue
+        if bet_updates:
+            await db.bets.bulk_write(bet_updates, ordered=False)
+        if imported_updates:
+            await db.imported_bets.bulk_write(imported_updates, ordered=False)
+        await apply_rollup_deltas(deltas)
+        if bet_updates:
+            await user_versions.bump(user_id)
 
+        updated_count = len(bet_updates)
         return CoolbetResyncResponse(
             updated=updated_count,
-            skipped=skipped_count,
+            skipped=total_count - updated_count,
             total=total_count
         )
 
@@ -1825,19 +3756,34 @@ async def resync_coolbet_bets(request: Request):
         )
 
 
-@api_router.get("/bets/export")
-async def export_bets(request: Request):
-    user_id = await get_current_user(request)
+EXPORT_FIELDNAMES = ["DATE", "TIME", "GAME", "BET", "ODDS", "STAKE",
+                     "STATUS", "RESULT", "TIPSTER", "SPORT", "BOOKIE"]
+
+# Rows written per streamed chunk
+EXPORT_CHUNK_ROWS = 500
+
+
+async def stream_bets_csv(query: dict, compress: bool = False):
+    """
+    Yield the export CSV in chunks straight from the Motor cursor, so
+    memory stays flat however many bets the user has.
+    """
+    gzip_stream = zlib.compressobj(wbits=31) if compress else None
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDNAMES, delimiter=';')
 
-    bets = await db.bets.find({"user_id": user_id}, {"_id": 0}).sort("date", 1).to_list(10000)
+    def flush() -> bytes:
+        data = buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate(0)
+        return gzip_stream.compress(data) if gzip_stream else data
 
-    output = io.StringIO()
-    fieldnames = ["DATE", "TIME", "GAME", "BET", "ODDS", "STAKE",
-                  "STATUS", "RESULT", "TIPSTER", "SPORT", "BOOKIE"]
-    writer = csv.DictWriter(output, fieldnames=fieldnames, delimiter=';')
     writer.writeheader()
+    rows = 0
 
-    for bet in bets:
+    cursor = db.bets.find(query, {"_id": 0}).sort(
+        [("date", 1), ("time", 1), ("bet_id", 1)]).batch_size(1000)
+    async for bet in cursor:
         writer.writerow({
             "DATE": bet.get("date", ""),
             "TIME": bet.get("time", ""),
@@ -1851,10 +3797,42 @@ async def export_bets(request: Request):
             "SPORT": bet.get("sport", ""),
             "BOOKIE": bet.get("bookie", "")
         })
+        rows += 1
+        if rows % EXPORT_CHUNK_ROWS == 0:
+            chunk = flush()
+            if chunk:
+                yield chunk
+
+    chunk = flush()
+    if gzip_stream:
+        chunk += gzip_stream.flush()
+    if chunk:
+        yield chunk
+
+
+@api_router.get("/bets/export")
+async def export_bets(request: Request, date_from: Optional[str] = None, date_to: Optional[str] = None,
+                      bookie: Optional[str] = None, tipster: Optional[str] = None, status: Optional[str] = None,
+                      sport: Optional[str] = None, compress: bool = False):
+    """
+    Stream the user's bets as a semicolon-separated CSV, oldest first.
+    Accepts the same filters as GET /bets; `compress=true` returns a
+    gzipped file instead.
+    """
+    user_id = await get_current_user(request)
 
-    csv_content = output.getvalue()
-    return Response(content=csv_content, media_type="text/csv", headers={
-        "Content-Disposition": "attachment; filename=bets_export.csv"
+    query = build_bets_query(user_id, date_from=date_from, date_to=date_to,
+                             bookie=bookie, tipster=tipster, status=status, sport=sport)
+
+    if compress:
+        media_type = "application/gzip"
+        filename = "bets_export.csv.gz"
+    else:
+        media_type = "text/csv"
+        filename = "bets_export.csv"
+
+    return StreamingResponse(stream_bets_csv(query, compress=compress), media_type=media_type, headers={
+        "Content-Disposition": f"attachment; filename={filename}"
     })
 
 
@@ -1889,6 +3867,13 @@ async def add_favorite_team(
     }
 
     await db.favorite_teams.insert_one(favorite)
+    team_index.add(favorite)
+
+    # Start caching the league's fixtures if nobody followed it yet
+    league_id = LEAGUE_ID_MAP.get(team_input.league)
+    if league_id:
+        schedule_fixture_refresh([league_id])
+
     return {"message": "Team added to favorites", "team": favorite}
 
 
@@ -1922,6 +3907,54 @@ async def get_favorite_teams(request: Request):
     return teams
 
 
+# Upcoming fixtures are refreshed per league in the background and the
+# endpoint only reads cached_fixtures. A fixture_leagues row per league
+# records when it was last refreshed and when it is next due; claiming a
+# due league is atomic, so each league is fetched once per interval no
+# matter how many users follow it or how many workers are running.
+
+# Map common league names to their TheSportsDB IDs
+LEAGUE_ID_MAP = {
+    "English Premier League": "4328",
+    "English League Championship": "4329",
+    "English League 1": "4330",
+    "English League 2": "4331",
+    "Spanish La Liga": "4335",
+    "Italian Serie A": "4332",
+    "German Bundesliga": "4331",
+    "French Ligue 1": "4334",
+    "UEFA Champions League": "4480",
+}
+
+# How often each followed league is refreshed; cached fixtures outlive it
+# so stale data can still be served while a refresh runs
+FIXTURE_REFRESH_INTERVAL = float(os.environ.get('FIXTURE_REFRESH_INTERVAL', '1800'))
+FIXTURE_CACHE_TTL = 6 * 3600
+# Retry delay after a failed league refresh
+FIXTURE_RETRY_DELAY = 300
+# How often the scheduler looks for due leagues
+FIXTURE_SCHEDULER_TICK = 60
+# Concurrent eventsnextleague.php requests per refresh
+FIXTURE_FETCH_CONCURRENCY = 4
+
+# Running refresh tasks, referenced so they aren't garbage collected
+fixture_refresh_tasks = set()
+fixture_scheduler_task: Optional[asyncio.Task] = None
+
+
+def fixture_involves(fixture: dict, team_names: List[str]) -> bool:
+    """Whether a fixture involves any of the given teams"""
+    home_team = (fixture.get("home_team_name") or "").lower()
+    away_team = (fixture.get("away_team_name") or "").lower()
+    for team_name in team_names:
+        team_name = team_name.lower()
+        # Flexible matching - check if team name is in the match
+        if (team_name in home_team or team_name in away_team or
+                home_team in team_name or away_team in team_name):
+            return True
+    return False
+
+
 @api_router.get("/favorites/upcoming-matches")
 async def get_upcoming_matches(request: Request, days: int = 7):
     """Get upcoming matches for user's favorite teams"""
@@ -1930,44 +3963,61 @@ async def get_upcoming_matches(request: Request, days: int = 7):
     # Get user's favorite teams
     favorite_teams = await db.favorite_teams.find(
         {"user_id": user_id},
-        {"team_id": 1, "team_name": 1}
+        {"team_name": 1, "league": 1}
     ).to_list(100)
 
     if not favorite_teams:
         return {}
 
-    team_ids = [team["team_id"] for team in favorite_teams]
+    # Team names per league (free API has team ID issues, so fixtures are
+    # fetched per league and matched by team name)
+    team_names_by_league = {}
+    for team in favorite_teams:
+        league_id = LEAGUE_ID_MAP.get(team.get("league"))
+        if league_id:
+            team_names_by_league.setdefault(league_id, []).append(
+                team.get("team_name", ""))
 
-    # Clear old cache to force fresh fetch with new logic
-    now = datetime.now(timezone.utc)
-    await db.cached_fixtures.delete_many({
-        "expires_at": {"$lt": now}
-    })
+    if not team_names_by_league:
+        return {}
 
-    # Check cache first
+    league_ids = list(team_names_by_league)
+    now = datetime.now(timezone.utc)
     end_date = now + timedelta(days=days)
 
+    # Serve whatever is cached and refresh stale leagues in the background
+    refreshed = await db.fixture_leagues.find(
+        {"league_id": {"$in": league_ids}},
+        {"_id": 0, "league_id": 1, "refreshed_at": 1}
+    ).to_list(len(league_ids))
+    fresh_after = now - timedelta(seconds=FIXTURE_REFRESH_INTERVAL)
+    fresh = set()
+    for league in refreshed:
+        refreshed_at = league.get("refreshed_at")
+        if refreshed_at and refreshed_at.tzinfo is None:
+            refreshed_at = refreshed_at.replace(tzinfo=timezone.utc)
+        if refreshed_at and refreshed_at > fresh_after:
+            fresh.add(league["league_id"])
+    stale = [league_id for league_id in league_ids if league_id not in fresh]
+    if stale:
+        schedule_fixture_refresh(stale)
+
+    # Expired fixtures are removed by the TTL index on expires_at;
+    # the query below still filters them until the TTL monitor runs
     cached_fixtures = await db.cached_fixtures.find({
-        "$or": [
-            {"home_team_id": {"$in": team_ids}},
-            {"away_team_id": {"$in": team_ids}}
-        ],
+        "league_id": {"$in": league_ids},
         "event_date": {
             "$gte": now.strftime("%Y-%m-%d"),
             "$lte": end_date.strftime("%Y-%m-%d")
         },
         "expires_at": {"$gt": now}
-    }, {"_id": 0}).to_list(1000)
-
-    # Always fetch fresh data (free API has team ID issues, so we use league-based fetching)
-    fresh_fixtures = await fetch_and_cache_fixtures(team_ids, days)
-
-    # Use fresh fixtures if available, otherwise use cached
-    fixtures_to_use = fresh_fixtures if fresh_fixtures else cached_fixtures
+    }, {"_id": 0}).sort([("event_date", 1), ("event_time", 1)]).to_list(1000)
 
     # Group by date
     grouped = {}
-    for fixture in fixtures_to_use:
+    for fixture in cached_fixtures:
+        if not fixture_involves(fixture, team_names_by_league[fixture["league_id"]]):
+            continue
         date = fixture["event_date"]
         if date not in grouped:
             grouped[date] = []
@@ -1976,136 +4026,270 @@ async def get_upcoming_matches(request: Request, days: int = 7):
     return grouped
 
 
-async def fetch_and_cache_fixtures(team_ids: List[str], days: int) -> List[dict]:
+async def claim_league_refresh(league_id: str) -> bool:
     """
-    Fetch fixtures from TheSportsDB and cache them.
-    Note: Free API has issues with team ID lookups, so we use team names for filtering.
+    Atomically take the next refresh of a league if it is due. Returns
+    False when it isn't due yet or another request/worker claimed it.
     """
-    fixtures = []
     now = datetime.now(timezone.utc)
-    expires_at = now + timedelta(hours=6)  # 6 hour cache
+    try:
+        await db.fixture_leagues.update_one(
+            {"league_id": league_id, "next_refresh_at": {"$lte": now}},
+            {"$set": {"next_refresh_at": now + timedelta(seconds=FIXTURE_REFRESH_INTERVAL)}},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        # The row exists but isn't due, so the upsert tried to insert
+        return False
+    return True
 
-    # Get team names and leagues from our database
-    favorite_teams_data = await db.favorite_teams.find(
-        {"team_id": {"$in": team_ids}},
-        {"team_id": 1, "team_name": 1, "league": 1, "_id": 0}
-    ).to_list(100)
 
-    if not favorite_teams_data:
-        return []
+async def refresh_due_leagues(league_ids: List[str]) -> int:
+    """Refresh the given leagues that are due; returns how many were refreshed"""
+    due = [league_id for league_id in league_ids
+           if await claim_league_refresh(league_id)]
+    if due:
+        await fetch_and_cache_fixtures(due)
+    return len(due)
 
-    # Group teams by league to minimize API calls
-    leagues_map = {}
-    for team in favorite_teams_data:
-        league = team.get("league", "Unknown")
-        if league not in leagues_map:
-            leagues_map[league] = []
-        leagues_map[league].append(team.get("team_name", ""))
-
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        # For each league, get upcoming events and filter by team name
-        for league_name, team_names in leagues_map.items():
-            try:
-                # Map common league names to their IDs
-                league_id_map = {
-                    "English Premier League": "4328",
-                    "English League Championship": "4329",
-                    "English League 1": "4330",
-                    "English League 2": "4331",
-                    "Spanish La Liga": "4335",
-                    "Italian Serie A": "4332",
-                    "German Bundesliga": "4331",
-                    "French Ligue 1": "4334",
-                    "UEFA Champions League": "4480",
-                }
 
-                league_id = league_id_map.get(league_name)
+def schedule_fixture_refresh(league_ids: List[str]):
+    """Refresh leagues in the background without making the caller wait"""
+    task = asyncio.create_task(refresh_due_leagues(league_ids))
+    fixture_refresh_tasks.add(task)
+    task.add_done_callback(fixture_refresh_tasks.discard)
 
-                if not league_id:
-                    # Skip unknown leagues for now
-                    logging.warning(f"No league ID mapping for: {league_name}")
-                    continue
 
-                # Get next events for this league
-                response = await client.get(
-                    f"{SPORTSDB_BASE_URL}/{SPORTSDB_API_KEY}/eventsnextleague.php?id={league_id}"
-                )
+async def refresh_followed_leagues() -> int:
+    """Refresh every league that at least one user follows, once per interval"""
+    league_names = await db.favorite_teams.distinct("league")
+    league_ids = sorted({LEAGUE_ID_MAP[name]
+                         for name in league_names if name in LEAGUE_ID_MAP})
+    return await refresh_due_leagues(league_ids)
 
-                if response.status_code != 200:
-                    continue
 
-                data = response.json()
-                events = data.get("events") or []
-
-                # Filter events for our favorite teams by name matching
-                for event in events:
-                    if not event:
-                        continue
-
-                    home_team = event.get("strHomeTeam", "")
-                    away_team = event.get("strAwayTeam", "")
-
-                    # Check if this match involves any of our favorite teams
-                    is_relevant = False
-                    for team_name in team_names:
-                        # Flexible matching - check if team name is in the match
-                        if (team_name.lower() in home_team.lower() or
-                            team_name.lower() in away_team.lower() or
-                            home_team.lower() in team_name.lower() or
-                                away_team.lower() in team_name.lower()):
-                            is_relevant = True
-                            break
-
-                    if not is_relevant:
-                        continue
-
-                    # Check date range
-                    event_date_str = event.get("dateEvent")
-                    if not event_date_str:
-                        continue
-
-                    try:
-                        event_date = datetime.strptime(
-                            event_date_str, "%Y-%m-%d").date()
-                        end_date = (now + timedelta(days=days)).date()
-                        if event_date < now.date() or event_date > end_date:
-                            continue
-                    except Exception:
-                        continue
-
-                    fixture = {
-                        "fixture_id": event.get("idEvent"),
-                        "home_team_id": event.get("idHomeTeam"),
-                        "away_team_id": event.get("idAwayTeam"),
-                        "home_team_name": home_team,
-                        "away_team_name": away_team,
-                        "home_team_badge": event.get("strHomeTeamBadge"),
-                        "away_team_badge": event.get("strAwayTeamBadge"),
-                        "event_date": event_date_str,
-                        "event_time": event.get("strTime"),
-                        "venue": event.get("strVenue"),
-                        "league": event.get("strLeague"),
-                        "sport": event.get("strSport"),
-                        "status": event.get("strStatus", "scheduled").lower(),
-                        "cached_at": now,
-                        "expires_at": expires_at
-                    }
-
-                    # Upsert to cache
-                    await db.cached_fixtures.update_one(
-                        {"fixture_id": fixture["fixture_id"]},
-                        {"$set": fixture},
-                        upsert=True
-                    )
-
-                    fixtures.append(fixture)
+async def fixture_refresh_loop():
+    """Background scheduler started with the app"""
+    while True:
+        try:
+            refreshed = await refresh_followed_leagues()
+            if refreshed:
+                logging.info(f"Refreshed fixtures for {refreshed} leagues")
+        except Exception as e:
+            logging.error(f"Fixture refresh failed: {e}")
+        await asyncio.sleep(FIXTURE_SCHEDULER_TICK)
+
+
+async def start_fixture_scheduler():
+    global fixture_scheduler_task
+    if fixture_scheduler_task is None:
+        fixture_scheduler_task = asyncio.create_task(fixture_refresh_loop())
+
+
+async def stop_fixture_scheduler():
+    global fixture_scheduler_task
+    tasks = list(fixture_refresh_tasks)
+    if fixture_scheduler_task is not None:
+        tasks.append(fixture_scheduler_task)
+        fixture_scheduler_task = None
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def fixture_from_event(event: dict, league_id: str, now: datetime) -> dict:
+    """cached_fixtures document for a TheSportsDB event"""
+    return {
+        "fixture_id": event.get("idEvent"),
+        "league_id": league_id,
+        "home_team_id": event.get("idHomeTeam"),
+        "away_team_id": event.get("idAwayTeam"),
+        "home_team_name": event.get("strHomeTeam") or "",
+        "away_team_name": event.get("strAwayTeam") or "",
+        "home_team_badge": event.get("strHomeTeamBadge"),
+        "away_team_badge": event.get("strAwayTeamBadge"),
+        "event_date": event.get("dateEvent"),
+        "event_time": event.get("strTime"),
+        "venue": event.get("strVenue"),
+        "league": event.get("strLeague"),
+        "sport": event.get("strSport"),
+        "status": (event.get("strStatus") or "scheduled").lower(),
+        "cached_at": now,
+        "expires_at": now + timedelta(seconds=FIXTURE_CACHE_TTL)
+    }
+
+
+async def fetch_league_events(league_id: str, semaphore: asyncio.Semaphore) -> List[dict]:
+    """Next events of a league; raises when TheSportsDB doesn't answer"""
+    async with semaphore:
+        response = await sportsdb_get(
+            "eventsnextleague.php", {"id": league_id}, timeout=10.0)
+
+    if response.status_code != 200:
+        raise ValueError(f"HTTP {response.status_code}")
+
+    data = response.json()
+    return [event for event in data.get("events") or []
+            if event and event.get("idEvent") and event.get("dateEvent")]
+
+
+async def fetch_and_cache_fixtures(league_ids: List[str]) -> int:
+    """
+    Fetch the upcoming fixtures of each league from TheSportsDB and cache
+    them all; requests filter them by team. Leagues are fetched
+    concurrently and written with one bulk upsert. Returns the number cached.
+    """
+    league_ids = list(dict.fromkeys(league_ids))
+    semaphore = asyncio.Semaphore(FIXTURE_FETCH_CONCURRENCY)
+    results = await asyncio.gather(
+        *(fetch_league_events(league_id, semaphore) for league_id in league_ids),
+        return_exceptions=True
+    )
+
+    now = datetime.now(timezone.utc)
+    operations = []
+    refreshed = []
+    failed = []
+    for league_id, events in zip(league_ids, results):
+        if isinstance(events, Exception):
+            logging.error(
+                f"Error fetching fixtures for league {league_id}: {events}")
+            failed.append(league_id)
+            continue
+
+        refreshed.append(league_id)
+        for event in events:
+            fixture = fixture_from_event(event, league_id, now)
+            operations.append(UpdateOne(
+                {"fixture_id": fixture["fixture_id"]},
+                {"$set": fixture},
+                upsert=True
+            ))
+
+    cached = len(operations)
+    if operations:
+        try:
+            await db.cached_fixtures.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            cached -= len(e.details.get("writeErrors", []))
+            logging.error(f"Error caching fixtures: {e.details.get('writeErrors', [])[:3]}")
+
+    if refreshed:
+        await db.fixture_leagues.update_many(
+            {"league_id": {"$in": refreshed}},
+            {"$set": {"refreshed_at": now}}
+        )
+    if failed:
+        # Try again sooner than the regular interval
+        await db.fixture_leagues.update_many(
+            {"league_id": {"$in": failed}},
+            {"$set": {"next_refresh_at": now + timedelta(seconds=FIXTURE_RETRY_DELAY)}}
+        )
+
+    return cached
 
-            except Exception as e:
-                logging.error(
-                    f"Error fetching fixtures for league {league_name}: {e}")
-                continue
 
-    return fixtures
+# Team search
+#
+# teams_cache holds the unfiltered TheSportsDB results per query and
+# team_index is a trie over every team seen there or in favorite_teams, so
+# autocomplete prefixes are answered locally and the network is only used
+# when the index has too few matches for a query not searched recently.
+
+# Local matches needed to skip the TheSportsDB search
+TEAM_SEARCH_LOCAL_MIN = int(os.environ.get('TEAM_SEARCH_LOCAL_MIN', '5'))
+TEAM_SEARCH_LIMIT = 50
+# How often team_index picks up teams cached by other workers
+TEAM_INDEX_REFRESH = 300
+
+
+def normalize_team_query(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class TeamPrefixIndex:
+    """
+    Trie over team names. Every word start of a name is inserted (so
+    "united" finds "Manchester United") and each node keeps the ids of
+    all teams below it, so a lookup is one walk down the query.
+    """
+
+    def __init__(self):
+        # char -> child node; the "" key holds the team ids at that node
+        self.root = {}
+        self.teams = {}
+        self.loaded_at = None
+
+    def add(self, team: dict):
+        team_id = team.get("team_id")
+        name = team.get("team_name")
+        if not team_id or not name:
+            return
+
+        is_new = team_id not in self.teams
+        self.teams[team_id] = {**team, "sport": (team.get("sport") or "").lower()}
+        if not is_new:
+            return
+
+        words = normalize_team_query(name).split()
+        for start in range(len(words)):
+            node = self.root
+            for char in " ".join(words[start:]):
+                node = node.setdefault(char, {})
+                node.setdefault("", set()).add(team_id)
+
+    def search(self, query: str, sport: Optional[str] = None, limit: int = TEAM_SEARCH_LIMIT) -> List[dict]:
+        node = self.root
+        for char in normalize_team_query(query):
+            node = node.get(char)
+            if node is None:
+                return []
+
+        teams = [self.teams[team_id] for team_id in node.get("", ())]
+        if sport:
+            teams = [team for team in teams if team["sport"] == sport.lower()]
+
+        # Names starting with the query first, then alphabetical
+        prefix = normalize_team_query(query)
+        teams.sort(key=lambda team: (
+            not team["team_name"].lower().startswith(prefix), team["team_name"].lower()))
+        return [dict(team) for team in teams[:limit]]
+
+
+team_index = TeamPrefixIndex()
+team_index_lock = asyncio.Lock()
+
+
+async def refresh_team_index():
+    """Load teams cached or favorited since the last load into team_index"""
+    now = datetime.now(timezone.utc)
+    if team_index.loaded_at and (now - team_index.loaded_at).total_seconds() < TEAM_INDEX_REFRESH:
+        return
+
+    async with team_index_lock:
+        since = team_index.loaded_at
+        if since and (now - since).total_seconds() < TEAM_INDEX_REFRESH:
+            return
+
+        cache_query = {"cached_at": {"$gte": since}} if since else {}
+        async for doc in db.teams_cache.find(cache_query, {"_id": 0, "teams": 1}):
+            for team in doc.get("teams") or []:
+                team_index.add(team)
+
+        favorite_query = {"added_at": {"$gte": since}} if since else {}
+        async for team in db.favorite_teams.find(
+            favorite_query,
+            {"_id": 0, "team_id": 1, "team_name": 1, "team_badge": 1, "sport": 1, "league": 1}
+        ):
+            team_index.add(team)
+
+        team_index.loaded_at = now
+
+
+def filter_teams_by_sport(teams: List[dict], sport: Optional[str]) -> List[dict]:
+    if not sport:
+        return teams
+    return [team for team in teams if (team.get("sport") or "").lower() == sport.lower()]
 
 
 @api_router.get("/teams/search")
@@ -2117,67 +4301,226 @@ async def search_teams(request: Request, query: str, sport: Optional[str] = None
     if len(query) < 2:
         return []
 
-    # Check cache first
-    cache_key = f"{sport}:{query.lower()}" if sport else query.lower()
-    cached = await db.teams_cache.find_one(
-        {"search_key": cache_key},
-        {"_id": 0}
-    )
+    # Prefix matches from every team seen so far
+    try:
+        await refresh_team_index()
+    except Exception as e:
+        logging.error(f"Error loading team index: {e}")
+    local_teams = team_index.search(query, sport)
+    if len(local_teams) >= TEAM_SEARCH_LOCAL_MIN:
+        return local_teams
+
+    # Recent unfiltered results for this query and its shorter prefixes
+    cache_key = normalize_team_query(query)
+    prefixes = [cache_key[:end] for end in range(2, len(cache_key) + 1)]
+    now = datetime.now(timezone.utc)
+    cached_searches = await db.teams_cache.find(
+        {"search_key": {"$in": prefixes}, "expires_at": {"$gt": now}},
+        {"_id": 0, "search_key": 1, "teams": 1}
+    ).to_list(len(prefixes))
+    cached = next(
+        (doc for doc in cached_searches if doc["search_key"] == cache_key), None)
+
+    # Still typing after a prefix that found teams: those teams are in the
+    # index already, so narrowing them down doesn't need another request
+    if cached is None and local_teams and any(doc.get("teams") for doc in cached_searches):
+        return local_teams
+
+    if cached:
+        upstream_teams = cached.get("teams") or []
+    else:
+        # Identical searches in flight at the same time share one request
+        upstream_teams = await sportsdb_flights.do(
+            ("search", cache_key),
+            lambda: fetch_team_search(query, cache_key)
+        )
+
+    # TheSportsDB's own matches first, then local ones it didn't return
+    teams = list(filter_teams_by_sport(upstream_teams, sport))
+    seen = {team.get("team_id") for team in teams}
+    teams.extend(team for team in local_teams if team["team_id"] not in seen)
+    return teams[:TEAM_SEARCH_LIMIT]
 
+
+async def fetch_team_search(query: str, cache_key: str) -> List[dict]:
+    """
+    Search TheSportsDB for teams, cache the unfiltered results in
+    teams_cache and add them to team_index
+    """
     now = datetime.now(timezone.utc)
-    if cached and cached.get("expires_at") > now:
-        return cached.get("teams", [])
+    try:
+        response = await sportsdb_get("searchteams.php", {"t": query}, timeout=5.0)
 
-    # Fetch from API
-    async with httpx.AsyncClient(timeout=5.0) as client:
-        try:
-            response = await client.get(
-                f"{SPORTSDB_BASE_URL}/{SPORTSDB_API_KEY}/searchteams.php?t={query}"
-            )
+        if response.status_code != 200:
+            return []
 
-            if response.status_code != 200:
-                return []
+        data = response.json()
+        teams_data = data.get("teams") or []
 
-            data = response.json()
-            teams_data = data.get("teams") or []
+        teams = []
+        for team in teams_data:
+            if not team:
+                continue
 
-            teams = []
-            for team in teams_data:
-                if not team:
-                    continue
+            teams.append({
+                "team_id": team.get("idTeam"),
+                "team_name": team.get("strTeam"),
+                "team_badge": team.get("strTeamBadge"),
+                "sport": team.get("strSport", "").lower(),
+                "league": team.get("strLeague"),
+                "country": team.get("strCountry")
+            })
+
+        # Cache results
+        await db.teams_cache.update_one(
+            {"search_key": cache_key},
+            {
+                "$set": {
+                    "search_key": cache_key,
+                    "teams": teams,
+                    "cached_at": now,
+                    "expires_at": now + timedelta(hours=24)
+                }
+            },
+            upsert=True
+        )
 
-                team_sport = team.get("strSport", "").lower()
-                if sport and team_sport != sport.lower():
-                    continue
+        for team in teams:
+            team_index.add(team)
 
-                teams.append({
-                    "team_id": team.get("idTeam"),
-                    "team_name": team.get("strTeam"),
-                    "team_badge": team.get("strTeamBadge"),
-                    "sport": team_sport,
-                    "league": team.get("strLeague"),
-                    "country": team.get("strCountry")
-                })
+        return teams
+
+    except Exception as e:
+        logging.error(f"Error searching teams: {e}")
+        return []
+
+
+# Monitoring Routes
+
+# Bearer token for scrapers without a user session; when unset only
+# signed-in users can read /api/metrics
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+
+async def require_metrics_access(request: Request):
+    if METRICS_TOKEN:
+        auth_header = request.headers.get("Authorization", "")
+        if hmac.compare_digest(auth_header.encode(), f"Bearer {METRICS_TOKEN}".encode()):
+            return
+    await get_current_user(request)
 
-            # Cache results
-            await db.teams_cache.update_one(
-                {"search_key": cache_key},
-                {
-                    "$set": {
-                        "search_key": cache_key,
-                        "teams": teams,
-                        "cached_at": now,
-                        "expires_at": now + timedelta(hours=24)
-                    }
-                },
-                upsert=True
-            )
 
-            return teams
+@api_router.get("/metrics")
+async def get_metrics(request: Request):
+    """Counters for the in-process caches, for monitoring"""
+    await require_metrics_access(request)
+    return {
+        "session_cache": session_cache.stats(),
+        "sportsdb_cache": sportsdb_cache.stats(),
+        "user_data_cache": user_data_cache.stats(),
+        "bet_snapshots": bet_snapshots.stats(),
+        "sportsdb_requests": sportsdb_flights.stats(),
+        "sportsdb_rate_limit": sportsdb_limiter.stats(),
+        "sportsdb_breaker": sportsdb_breaker.stats()
+    }
 
+
+# Startup
+
+# (collection, keys, options) for every index the handlers rely on.
+# TTL indexes (expireAfterSeconds=0) delete documents once expires_at passes.
+INDEXES = [
+    ("users", [("user_id", 1)], {"unique": True, "name": "user_id_unique"}),
+    ("users", [("email", 1)], {"unique": True, "name": "email_unique"}),
+    ("user_sessions", [("session_token", 1)],
+     {"unique": True, "name": "session_token_unique"}),
+    ("user_sessions", [("expires_at", 1)],
+     {"expireAfterSeconds": 0, "name": "expires_at_ttl"}),
+    ("bets", [("bet_id", 1)], {"unique": True, "name": "bet_id_unique"}),
+    # (user_id[, filter], date, time, bet_id) serve the /bets keyset pages
+    ("bets", [("user_id", 1), ("date", 1), ("time", 1), ("bet_id", 1)],
+     {"name": "user_date_time_bet"}),
+    ("bets", [("user_id", 1), ("sport", 1), ("date", 1), ("time", 1), ("bet_id", 1)],
+     {"name": "user_sport_date_time_bet"}),
+    ("bets", [("user_id", 1), ("bookie", 1), ("date", 1), ("time", 1), ("bet_id", 1)],
+     {"name": "user_bookie_date_time_bet"}),
+    ("bets", [("user_id", 1), ("tipster", 1), ("date", 1), ("time", 1), ("bet_id", 1)],
+     {"name": "user_tipster_date_time_bet"}),
+    ("bets", [("user_id", 1), ("status", 1), ("date", 1), ("time", 1), ("bet_id", 1)],
+     {"name": "user_status_date_time_bet"}),
+    ("bets", [("user_id", 1), ("bookie", 1), ("status", 1)],
+     {"name": "user_bookie_status"}),
+    ("bets", [("user_id", 1), ("source", 1), ("external_id", 1)],
+     {"name": "user_source_external_id",
+      "partialFilterExpression": {"source": {"$exists": True}}}),
+    ("daily_rollups", [("user_id", 1), ("date", 1), ("sport", 1)],
+     {"unique": True, "name": "user_date_sport_unique"}),
+    ("imported_bets", [("user_id", 1), ("external_id", 1), ("source", 1)],
+     {"unique": True, "name": "user_external_source_unique"}),
+    # Coolbet resync joins pending bets to their imported row by external_id
+    ("imported_bets", [("external_id", 1)], {"name": "external_id"}),
+    ("bookmakers", [("user_id", 1), ("name", 1)], {"name": "user_name"}),
+    ("bookmakers", [("bookmaker_id", 1)], {"name": "bookmaker_id"}),
+    ("tipsters", [("user_id", 1), ("name", 1)], {"name": "user_name"}),
+    ("tipsters", [("tipster_id", 1)], {"name": "tipster_id"}),
+    ("favorite_teams", [("user_id", 1), ("team_id", 1)],
+     {"name": "user_team"}),
+    ("teams_cache", [("search_key", 1)],
+     {"unique": True, "name": "search_key_unique"}),
+    ("teams_cache", [("expires_at", 1)],
+     {"expireAfterSeconds": 0, "name": "expires_at_ttl"}),
+    ("teams_cache", [("cached_at", 1)], {"name": "cached_at"}),
+    ("cached_fixtures", [("fixture_id", 1)],
+     {"unique": True, "name": "fixture_id_unique"}),
+    ("cached_fixtures", [("league_id", 1), ("event_date", 1)],
+     {"name": "league_event_date"}),
+    ("cached_fixtures", [("expires_at", 1)],
+     {"expireAfterSeconds": 0, "name": "expires_at_ttl"}),
+    ("fixture_leagues", [("league_id", 1)],
+     {"unique": True, "name": "league_id_unique"}),
+    ("sportsdb_cache", [("key", 1)], {"unique": True, "name": "key_unique"}),
+    ("sportsdb_cache", [("expires_at", 1)],
+     {"expireAfterSeconds": 0, "name": "expires_at_ttl"}),
+    ("user_data_cache", [("key", 1)], {"unique": True, "name": "key_unique"}),
+    ("user_data_cache", [("expires_at", 1)],
+     {"expireAfterSeconds": 0, "name": "expires_at_ttl"}),
+]
+
+
+# Migrations
+#
+# One-off data migrations run at startup until their marker document exists
+# in the migrations collection. Each must be idempotent: workers starting
+# together, or a restart before the marker is written, run it again.
+
+# Links Coolbet bets imported before external_id was stored on bets
+COOLBET_IDS_MIGRATION = "coolbet_external_ids_backfill"
+
+
+async def run_migration(name: str, migrate) -> bool:
+    """Run `migrate()` unless the migration `name` is recorded as done"""
+    if await db.migrations.find_one({"_id": name}, {"_id": 1}):
+        return False
+
+    logging.info(f"Running migration {name}")
+    result = await migrate()
+    await db.migrations.update_one(
+        {"_id": name},
+        {"$set": {"completed_at": datetime.now(timezone.utc), "result": result}},
+        upsert=True)
+    logging.info(f"Migration {name} done: {result}")
+    return True
+
+
+async def ensure_indexes():
+    """Create every index in INDEXES; existing indexes are left untouched"""
+    for collection, keys, options in INDEXES:
+        try:
+            await db[collection].create_index(keys, **options)
         except Exception as e:
-            logging.error(f"Error searching teams: {e}")
-            return []
+            # e.g. duplicates blocking a unique index - keep serving
+            logging.error(
+                f"Could not create index {options.get('name')} on {collection}: {e}")
 
 
 # CORS configuration
@@ -2207,6 +4550,16 @@ logger = logging.getLogger(__name__)
 app.include_router(api_router)
 
 
-@app.on_event("shutdown")
+async def startup_db_client():
+    await ensure_indexes()
+    await backfill_daily_rollups()
+    await run_migration(COOLBET_IDS_MIGRATION, backfill_coolbet_external_ids)
+    get_sportsdb_client()
+    await start_fixture_scheduler()
+
+
 async def shutdown_db_client():
+    await stop_fixture_scheduler()
+    await close_sportsdb_client()
+    password_hash_executor.shutdown(wait=False)
     client.close()
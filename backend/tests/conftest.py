@@ -0,0 +1,42 @@
+"""
+Setup for the backend tests. server reads its settings at import time;
+tests that need a database get the `server` fixture, which swaps in an
+in-memory mongomock-motor database (tests/requirements.txt).
+"""
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "tests")
+# Nothing shared outside the process, and cheap password hashes
+os.environ["CACHE_BACKEND"] = "memory"
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def server():
+    """The server module on an empty database, with its process caches cleared"""
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+
+    import server
+
+    original_db = server.db
+    server.db = mongomock_motor.AsyncMongoMockClient()[os.environ["DB_NAME"]]
+    server.session_cache.clear()
+    for versions in (server.user_versions, server.session_versions):
+        if versions.local is not None:
+            versions.local.clear()
+    yield server
+    server.db = original_db
+
+
+@pytest.fixture
+def run():
+    """Run a coroutine to completion on a fresh event loop"""
+    return asyncio.run
@@ -0,0 +1,93 @@
+"""
+Session resolution through session_cache: login and register cache the
+new session, and later requests are answered without user_sessions reads.
+"""
+import httpx
+
+PASSWORD = "correct horse battery"
+
+
+async def create_user(server, user_id: str, **fields) -> str:
+    email = f"{user_id}@example.com"
+    await server.db.users.insert_one({
+        "user_id": user_id, "email": email, "name": user_id,
+        "password_hash": await server.hash_password(PASSWORD),
+        "currency": "USD", "data_version": 0, **fields})
+    return email
+
+
+def api_client(server) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url="http://test")
+
+
+def test_login_session_served_from_cache(server, run):
+    async def scenario():
+        email = await create_user(server, "user_login", data_version=5, session_version=3)
+        async with api_client(server) as client:
+            response = await client.post("/api/auth/login", json={"email": email, "password": PASSWORD})
+            assert response.status_code == 200
+            assert "session_version" not in response.json()
+            token = response.cookies["session_token"]
+            assert server.session_cache.get(token)["version"] == 3
+
+            hits = server.session_cache.hits
+            misses = server.session_cache.misses
+            response = await client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"})
+            assert response.status_code == 200
+            assert response.json()["user_id"] == "user_login"
+            assert server.session_cache.hits == hits + 1
+            assert server.session_cache.misses == misses
+
+    run(scenario())
+
+
+def test_logout_rejects_session(server, run):
+    async def scenario():
+        email = await create_user(server, "user_logout")
+        async with api_client(server) as client:
+            response = await client.post("/api/auth/login", json={"email": email, "password": PASSWORD})
+            headers = {"Authorization": f"Bearer {response.cookies['session_token']}"}
+            assert (await client.post("/api/auth/logout", headers=headers)).status_code == 200
+            assert (await client.get("/api/auth/me", headers=headers)).status_code == 401
+
+        # Other workers learn about the logout from session_version alone
+        user = await server.db.users.find_one({"user_id": "user_logout"})
+        assert user.get("session_version") == 1
+        assert user["data_version"] == 0
+
+    run(scenario())
+
+
+def test_data_write_keeps_cached_session(server, run):
+    async def scenario():
+        email = await create_user(server, "user_writes")
+        async with api_client(server) as client:
+            response = await client.post("/api/auth/login", json={"email": email, "password": PASSWORD})
+            headers = {"Authorization": f"Bearer {response.cookies['session_token']}"}
+            await server.user_versions.bump("user_writes")
+
+            misses = server.session_cache.misses
+            assert (await client.get("/api/auth/me", headers=headers)).status_code == 200
+            assert server.session_cache.misses == misses
+
+    run(scenario())
+
+
+def test_logout_on_another_worker_revokes_cached_session(server, run):
+    async def scenario():
+        email = await create_user(server, "user_elsewhere")
+        async with api_client(server) as client:
+            response = await client.post("/api/auth/login", json={"email": email, "password": PASSWORD})
+            token = response.cookies["session_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+            assert (await client.get("/api/auth/me", headers=headers)).status_code == 200
+
+            # What another worker's logout leaves behind, once this worker's
+            # session version has expired
+            await server.db.user_sessions.delete_one({"session_token": token})
+            await server.db.users.update_one({"user_id": "user_elsewhere"}, {"$inc": {"session_version": 1}})
+            assert (await client.get("/api/auth/me", headers=headers)).status_code == 200
+            server.session_versions.local.clear()
+            assert (await client.get("/api/auth/me", headers=headers)).status_code == 401
+
+    run(scenario())
@@ -0,0 +1,43 @@
+"""
+Golden corpus for sport detection.
+
+fixtures/sport_corpus.json maps game names to the sport the original
+group-by-group pattern loop returned for them. It covers every pattern
+of every list in SPORT_PATTERN_GROUPS, pairs of patterns from every two
+groups in both orders, patterns shared by several sports or contained in
+longer words, the tennis separator fallback and names that match
+nothing. A change to the pattern lists or to SportClassifier that moves
+any label fails here; when the move is intended, update the fixture in
+the same change.
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+import server
+
+CORPUS = json.loads(
+    (Path(__file__).parent / "fixtures" / "sport_corpus.json").read_text(encoding="utf-8"))
+
+
+@pytest.mark.parametrize("game, sport", CORPUS.items(), ids=range(len(CORPUS)))
+def test_detect_sport_from_game(game, sport):
+    assert server.detect_sport_from_game(game) == sport
+
+
+def test_classify_many():
+    games = list(CORPUS)
+    expected = list(CORPUS.values())
+    assert server.classify_many(games) == expected
+    # Repeated names are classified once but answered at every position
+    assert server.classify_many(games + games[::-1]) == expected + expected[::-1]
+
+
+def test_corpus_covers_every_pattern():
+    names = [game.lower() for game in CORPUS]
+    missing = [(sport, pattern)
+               for sport, patterns in server.SPORT_PATTERN_GROUPS
+               for pattern in patterns
+               if not any(pattern in name for name in names)]
+    assert not missing, f"add names with these patterns to the corpus: {missing}"
@@ -102,33 +102,17 @@ export default function AnalyticsPage() {
 
         const queryString = params.toString();
 
-        const [statsRes, chartRes, bookieRes, tipsterRes, sportRes, oddsRes] = await Promise.all([
-          fetch(`${BACKEND_URL}/api/analytics/stats?${queryString}`, {
-            credentials: 'include',
-          }),
-          fetch(`${BACKEND_URL}/api/analytics/chart?${queryString}`, {
-            credentials: 'include',
-          }),
-          fetch(`${BACKEND_URL}/api/analytics/bookmakers?${queryString}`, {
-            credentials: 'include',
-          }),
-          fetch(`${BACKEND_URL}/api/analytics/tipsters?${queryString}`, {
-            credentials: 'include',
-          }),
-          fetch(`${BACKEND_URL}/api/analytics/sports?${queryString}`, {
-            credentials: 'include',
-          }),
-          fetch(`${BACKEND_URL}/api/analytics/odds-range?${queryString}`, {
-            credentials: 'include',
-          }),
-        ]);
-
-        const statsData = statsRes.ok ? await statsRes.json() : null;
-        const chartDataRes = chartRes.ok ? await chartRes.json() : null;
-        const bookieData = bookieRes.ok ? await bookieRes.json() : null;
-        const tipsterData = tipsterRes.ok ? await tipsterRes.json() : null;
-        const sportData = sportRes.ok ? await sportRes.json() : null;
-        const oddsData = oddsRes.ok ? await oddsRes.json() : null;
+        const summaryRes = await fetch(`${BACKEND_URL}/api/analytics/summary?${queryString}`, {
+          credentials: 'include',
+        });
+        const summary = summaryRes.ok ? await summaryRes.json() : {};
+
+        const statsData = summary.stats || null;
+        const chartDataRes = summary.chart;
+        const bookieData = summary.bookmakers;
+        const tipsterData = summary.tipsters;
+        const sportData = summary.sports;
+        const oddsData = summary.odds_range;
 
         setStats(statsData);
         setChartData(Array.isArray(chartDataRes) ? chartDataRes : []);
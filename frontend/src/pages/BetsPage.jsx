@@ -1,5 +1,5 @@
 import { ChevronLeft, ChevronRight, Filter, Pencil, Plus, Trash2 } from 'lucide-react';
-import { useEffect, useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 import { useOutletContext } from 'react-router-dom';
 import { toast } from 'sonner';
 import { Button } from '../components/ui/button';
@@ -16,10 +16,18 @@ const formatCurrency = (value, currency) => {
   return `$${value.toFixed(2)}`;
 };
 
+// Bets are fetched from the server in keyset-paginated chunks of this size
+const BETS_FETCH_SIZE = 200;
+const BET_LIST_FIELDS = 'game,bet,stake,odds,status,result,bookie,tipster,sport,notes';
+
 export default function BetsPage() {
   const { user } = useOutletContext();
   const [bets, setBets] = useState([]);
-  const [filteredBets, setFilteredBets] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  // Each reload of the bet list starts a new generation; responses from an
+  // older one (superseded filters, a chunk requested before an edit) are dropped
+  const betsRequest = useRef({ generation: 0, controller: null });
   const [bookmakers, setBookmakers] = useState([]);
   const [tipsters, setTipsters] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -55,60 +63,79 @@ export default function BetsPage() {
   });
 
   useEffect(() => {
-    fetchData();
+    fetchSources();
   }, []);
 
   useEffect(() => {
-    applyFilters();
-    setCurrentPage(1); // Reset to first page when filters change
-  }, [bets, filters]); // eslint-disable-line react-hooks/exhaustive-deps
+    fetchBets();
+  }, [filters]); // eslint-disable-line react-hooks/exhaustive-deps
 
-  const fetchData = async () => {
+  const fetchSources = async () => {
     try {
-      const [betsRes, bookmakersRes, tipstersRes] = await Promise.all([
-        fetch(`${BACKEND_URL}/api/bets`, { credentials: 'include' }),
+      const [bookmakersRes, tipstersRes] = await Promise.all([
         fetch(`${BACKEND_URL}/api/bookmakers`, { credentials: 'include' }),
         fetch(`${BACKEND_URL}/api/tipsters`, { credentials: 'include' }),
       ]);
 
-      const betsData = betsRes.ok ? await betsRes.json() : null;
       const bookmakersData = bookmakersRes.ok ? await bookmakersRes.json() : null;
       const tipstersData = tipstersRes.ok ? await tipstersRes.json() : null;
 
-      setBets(Array.isArray(betsData) ? betsData : []);
       setBookmakers(Array.isArray(bookmakersData) ? bookmakersData : []);
       setTipsters(Array.isArray(tipstersData) ? tipstersData : []);
     } catch (error) {
       console.error('Error fetching data:', error);
-      toast.error('Failed to load bets');
-    } finally {
-      setLoading(false);
+      toast.error('Failed to load bookmakers and tipsters');
     }
   };
 
-  const applyFilters = () => {
-    let filtered = [...bets];
-
-    if (filters.dateFrom) {
-      filtered = filtered.filter((bet) => bet.date >= filters.dateFrom);
-    }
-    if (filters.dateTo) {
-      filtered = filtered.filter((bet) => bet.date <= filters.dateTo);
-    }
-    if (filters.status) {
-      filtered = filtered.filter((bet) => bet.status === filters.status);
-    }
-    if (filters.bookie) {
-      filtered = filtered.filter((bet) => bet.bookie === filters.bookie);
-    }
-    if (filters.tipster) {
-      filtered = filtered.filter((bet) => bet.tipster === filters.tipster);
-    }
-    if (filters.sport) {
-      filtered = filtered.filter((bet) => bet.sport === filters.sport);
+  // Filters are applied by the server; `cursor` continues from the last loaded bet.
+  // Without a cursor the list is reloaded from the first chunk and page 1.
+  // Resolves to false when the response was dropped for a newer reload.
+  const fetchBets = async (cursor = null) => {
+    const request = betsRequest.current;
+    if (!cursor) {
+      request.generation += 1;
+      request.controller?.abort();
+      request.controller = new AbortController();
+      setNextCursor(null);
     }
+    const { generation, controller } = request;
+
+    try {
+      if (cursor) setLoadingMore(true);
+
+      const params = new URLSearchParams({ limit: BETS_FETCH_SIZE, fields: BET_LIST_FIELDS });
+      if (filters.dateFrom) params.append('date_from', filters.dateFrom);
+      if (filters.dateTo) params.append('date_to', filters.dateTo);
+      if (filters.status) params.append('status', filters.status);
+      if (filters.bookie) params.append('bookie', filters.bookie);
+      if (filters.tipster) params.append('tipster', filters.tipster);
+      if (filters.sport) params.append('sport', filters.sport);
+      if (cursor) params.append('cursor', cursor);
+
+      const betsRes = await fetch(`${BACKEND_URL}/api/bets?${params.toString()}`, {
+        credentials: 'include',
+        signal: controller.signal,
+      });
+      const betsData = betsRes.ok ? await betsRes.json() : null;
+      if (generation !== request.generation) return false;
+      const page = Array.isArray(betsData?.bets) ? betsData.bets : [];
 
-    setFilteredBets(filtered);
+      setBets((prev) => (cursor ? [...prev, ...page] : page));
+      setNextCursor(betsData?.next_cursor || null);
+      if (!cursor) setCurrentPage(1);
+      return true;
+    } catch (error) {
+      if (generation !== request.generation) return false;
+      console.error('Error fetching data:', error);
+      toast.error('Failed to load bets');
+      return false;
+    } finally {
+      if (generation === request.generation) {
+        setLoading(false);
+        setLoadingMore(false);
+      }
+    }
   };
 
   const handleDatePreset = (preset) => {
@@ -192,7 +219,7 @@ export default function BetsPage() {
 
       setIsDialogOpen(false);
       resetForm();
-      fetchData();
+      fetchBets();
     } catch (error) {
       console.error('Error saving bet:', error);
       toast.error(error.message || 'Failed to save bet');
@@ -236,7 +263,7 @@ export default function BetsPage() {
         throw new Error(errorData.detail || 'Failed to delete bet');
       }
       toast.success('Bet deleted successfully');
-      fetchData();
+      fetchBets();
     } catch (error) {
       console.error('Error deleting bet:', error);
       toast.error('Failed to delete bet');
@@ -260,13 +287,18 @@ export default function BetsPage() {
     });
   };
 
-  // Pagination calculations
+  // Pagination calculations (over the bets loaded so far; filters are applied server-side)
+  const filteredBets = bets;
   const totalPages = Math.ceil(filteredBets.length / itemsPerPage);
   const startIndex = (currentPage - 1) * itemsPerPage;
   const endIndex = startIndex + itemsPerPage;
   const currentBets = filteredBets.slice(startIndex, endIndex);
 
-  const handlePageChange = (page) => {
+  const handlePageChange = async (page) => {
+    // Moving past the loaded bets pulls the next chunk from the server
+    if (page > totalPages && nextCursor) {
+      if (!(await fetchBets(nextCursor))) return;
+    }
     setCurrentPage(page);
     window.scrollTo({ top: 0, behavior: 'smooth' });
   };
@@ -780,7 +812,11 @@ export default function BetsPage() {
               <div className="text-sm text-text-secondary">
                 Showing <span className="font-medium text-white">{startIndex + 1}</span> to{' '}
                 <span className="font-medium text-white">{Math.min(endIndex, filteredBets.length)}</span> of{' '}
-                <span className="font-medium text-white">{filteredBets.length}</span> bets
+                <span className="font-medium text-white">
+                  {filteredBets.length}
+                  {nextCursor ? '+' : ''}
+                </span>{' '}
+                bets
               </div>
 
               <div className="flex items-center space-x-2">
@@ -836,7 +872,7 @@ export default function BetsPage() {
                   variant="outline"
                   size="sm"
                   onClick={() => handlePageChange(currentPage + 1)}
-                  disabled={currentPage === totalPages}
+                  disabled={(currentPage === totalPages && !nextCursor) || loadingMore}
                   className="bg-black/20 border-white/10 hover:bg-white/10 disabled:opacity-30 disabled:cursor-not-allowed"
                 >
                   Next
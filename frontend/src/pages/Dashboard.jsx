@@ -36,19 +36,14 @@ export default function Dashboard() {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const [statsRes, chartRes, recentBetsRes] = await Promise.all([
-          fetch(`${BACKEND_URL}/api/analytics/stats`, {
-            credentials: 'include',
-          }),
-          fetch(`${BACKEND_URL}/api/analytics/chart?days=30`, {
-            credentials: 'include',
-          }),
-          fetch(`${BACKEND_URL}/api/bets/recent?limit=10`, { credentials: 'include' }),
-        ]);
+        const dashboardRes = await fetch(`${BACKEND_URL}/api/analytics/dashboard?chart_days=30&recent_limit=10`, {
+          credentials: 'include',
+        });
+        const dashboard = dashboardRes.ok ? await dashboardRes.json() : {};
 
-        const statsData = statsRes.ok ? await statsRes.json() : null;
-        const chartDataRes = chartRes.ok ? await chartRes.json() : null;
-        const recentBetsData = recentBetsRes.ok ? await recentBetsRes.json() : null;
+        const statsData = dashboard.stats || null;
+        const chartDataRes = dashboard.chart;
+        const recentBetsData = dashboard.recent_bets;
 
         setStats(statsData);
         setChartData(Array.isArray(chartDataRes) ? chartDataRes : []);
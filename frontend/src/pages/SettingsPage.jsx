@@ -42,8 +42,8 @@ export default function SettingsPage() {
 
       if (!response.ok) throw new Error('Failed to export bets');
 
-      const data = await response.json();
-      const blob = new Blob([data.csv_data], { type: 'text/csv' });
+      // The export is streamed as raw CSV
+      const blob = await response.blob();
       const url = window.URL.createObjectURL(blob);
       const a = document.createElement('a');
       a.href = url;
@@ -60,53 +60,47 @@ export default function SettingsPage() {
     }
   };
 
-  const handleImport = (event) => {
+  const handleImport = async (event) => {
     const file = event.target.files[0];
     if (!file) return;
 
     setImporting(true);
 
-    // Read file as text to preserve original format
-    const reader = new FileReader();
-    reader.onload = async (e) => {
-      try {
-        const csvData = e.target.result;
-
-        const response = await fetch(`${BACKEND_URL}/api/bets/import`, {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json' },
-          credentials: 'include',
-          body: JSON.stringify({ csv_data: csvData }),
-        });
-
-        if (!response.ok) {
-          if (response.status === 401) {
-            toast.error('Du er ikke innlogget. Vennligst logg inn igjen.');
-            window.location.href = '/login';
-            return;
-          }
-          const errorData = await response.json().catch(() => ({}));
-          throw new Error(errorData.detail || 'Failed to import bets');
+    try {
+      // Upload the file as-is; the server parses it as a stream
+      const formData = new FormData();
+      formData.append('file', file);
+
+      const response = await fetch(`${BACKEND_URL}/api/bets/import`, {
+        method: 'POST',
+        credentials: 'include',
+        body: formData,
+      });
+
+      if (!response.ok) {
+        if (response.status === 401) {
+          toast.error('Du er ikke innlogget. Vennligst logg inn igjen.');
+          window.location.href = '/login';
+          return;
         }
+        const errorData = await response.json().catch(() => ({}));
+        throw new Error(errorData.detail || 'Failed to import bets');
+      }
 
-        const result = await response.json();
+      const result = await response.json();
+      if (result.failed > 0) {
+        console.warn('Rows that failed to import:', result.errors);
+        toast.warning(`Imported ${result.imported} bets, ${result.failed} rows failed (see console)`);
+      } else {
         toast.success(`Successfully imported ${result.imported} bets`);
-        window.location.reload();
-      } catch (error) {
-        console.error('Error importing bets:', error);
-        toast.error('Failed to import bets');
-      } finally {
-        setImporting(false);
       }
-    };
-
-    reader.onerror = () => {
-      console.error('Error reading file');
-      toast.error('Failed to read CSV file');
+      window.location.reload();
+    } catch (error) {
+      console.error('Error importing bets:', error);
+      toast.error('Failed to import bets');
+    } finally {
       setImporting(false);
-    };
-
-    reader.readAsText(file);
+    }
   };
 
   return (
@@ -24,6 +24,9 @@ fi
 source venv/bin/activate
 pip install -q -r requirements.txt
 
+# The first start seeds the daily_rollups collection from existing bets
+# (see README); run `python rebuild_rollups.py` to recompute it later
+
 uvicorn server:app --reload --port 8000 &
 BACKEND_PID=$!
 echo "✅ Backend started on http://localhost:8000 (PID: $BACKEND_PID)"